@@ -0,0 +1,239 @@
+# By: Johanna Olivera y Ailin Ferrari
+
+"""
+- Actitud arbitraria (serie de cuaterniones o giro a velocidad constante) y
+  cosenos de incidencia Sol/planeta por cara para muchos instantes a la vez.
+- La terna orbital coincide con la terna cuerpo en la actitud nominal (Z+ a nadir):
+  Sol = (-sin θ, 0, -cos θ), nadir = (0, 0, 1); así la actitud identidad
+  reproduce las leyes de flujos.py (cos_Z+ = -cos θ, Y± nunca iluminadas).
+- Las cargas por cara se agregan a la red térmica como bases de t.
+"""
+
+from __future__ import annotations
+import numpy as np
+from abc import ABC, abstractmethod
+from dataclasses import replace
+from typing import Dict, List, Sequence
+from constants import (
+    ORBITAL_PERIOD, SIGMA, SCV, GAMMA, T_VENUS,
+    F_PLANET_ZPLUS, F_PLANET_LATERAL, F_PLANET_ZMINUS,
+    THETA_C1, THETA_C2, THETA_C3, THETA_C4
+)
+from red_termica import (
+    Base, RedTermica, AREAS_NODOS, N_EXTERNOS,
+    bordes_angulares, construir_red, opticas_externas, theta_de_t
+)
+
+CARAS = ("Z+", "Z-", "X+", "X-", "Y+", "Y-")
+
+# Normales salientes en terna cuerpo (6, 3)
+NORMALES = np.array([
+    [0.0, 0.0, 1.0], [0.0, 0.0, -1.0],
+    [1.0, 0.0, 0.0], [-1.0, 0.0, 0.0],
+    [0.0, 1.0, 0.0], [0.0, -1.0, 0.0],
+])
+
+# Cara de cada nodo externo 1..10 (como en los comentarios de ecNodales_Frio)
+NODO_CARA: Dict[int, str] = {1: "Z+", 2: "Z+", 3: "X-", 4: "X-", 5: "Z-", 6: "Z-",
+                             7: "X+", 8: "X+", 9: "Y+", 10: "Y-"}
+
+# ----------------------------
+# Cuaterniones (w, x, y, z), vectorizados sobre el primer eje
+# ----------------------------
+def q_mult(p: np.ndarray, q: np.ndarray) -> np.ndarray:
+    """Producto de Hamilton p ⊗ q (broadcast sobre (..., 4))."""
+    pw, px, py, pz = np.moveaxis(p, -1, 0)
+    qw, qx, qy, qz = np.moveaxis(q, -1, 0)
+    return np.stack([
+        pw * qw - px * qx - py * qy - pz * qz,
+        pw * qx + px * qw + py * qz - pz * qy,
+        pw * qy - px * qz + py * qw + pz * qx,
+        pw * qz + px * qy - py * qx + pz * qw,
+    ], axis=-1)
+
+def q_conj(q: np.ndarray) -> np.ndarray:
+    return q * np.array([1.0, -1.0, -1.0, -1.0])
+
+def q_normalizar(q: np.ndarray) -> np.ndarray:
+    return q / np.linalg.norm(q, axis=-1, keepdims=True)
+
+def q_rotar(q: np.ndarray, v: np.ndarray) -> np.ndarray:
+    """Rota v (..., 3) por q (..., 4): v + 2w(u×v) + 2u×(u×v)."""
+    w = q[..., :1]
+    u = q[..., 1:]
+    uv = np.cross(u, v)
+    return v + 2.0 * w * uv + 2.0 * np.cross(u, uv)
+
+def q_eje_angulo(eje: np.ndarray, angulo: np.ndarray) -> np.ndarray:
+    """Cuaternión de rotación `angulo` [rad] (...,) alrededor de `eje` (3,)."""
+    eje = np.asarray(eje, dtype=float)
+    eje = eje / np.linalg.norm(eje)
+    medio = 0.5 * np.asarray(angulo, dtype=float)[..., None]
+    return np.concatenate([np.cos(medio), np.sin(medio) * eje], axis=-1)
+
+def q_slerp(q0: np.ndarray, q1: np.ndarray, s: np.ndarray) -> np.ndarray:
+    """Interpolación esférica vectorizada entre pares q0[k], q1[k] con s[k] ∈ [0,1]."""
+    d = np.sum(q0 * q1, axis=-1)
+    q1 = np.where((d < 0)[..., None], -q1, q1)
+    d = np.abs(d)
+    ang = np.arccos(np.clip(d, -1.0, 1.0))
+    sen = np.sin(ang)
+    cerca = sen < 1e-9
+    sen = np.where(cerca, 1.0, sen)
+    a = np.where(cerca, 1.0 - s, np.sin((1.0 - s) * ang) / sen)
+    b = np.where(cerca, s, np.sin(s * ang) / sen)
+    return q_normalizar(a[..., None] * q0 + b[..., None] * q1)
+
+# ----------------------------
+# Actitudes
+# ----------------------------
+class Actitud(ABC):
+    """
+    q(t): ejes del cuerpo expresados en la terna orbital = q ⊗ e_i ⊗ q*.
+    Sin estado mutable: una misma actitud puede compartirse entre redes e hilos.
+    """
+
+    def __init__(self, periodo: float = ORBITAL_PERIOD):
+        self.periodo = periodo
+
+    @abstractmethod
+    def cuaterniones(self, t: np.ndarray) -> np.ndarray:
+        """q(t) (..., 4) en (w, x, y, z) para t (...)."""
+
+    def incidencias(self, t, caras: Sequence[int] = range(len(CARAS))) -> Dict[str, np.ndarray]:
+        """
+        'sol'   (len(caras), ...) cos entre normal y Sol (sin recortar ni enmascarar eclipse)
+        'nadir' (len(caras), ...) cos entre normal y nadir
+        'iluminado' (...) False en eclipse (θ_c2 < θ < θ_c3)
+        'albedo' (...)   max(cos θ, 0): iluminación del disco visto (fuera de eclipse)
+        """
+        t = np.asarray(t, dtype=float)
+        normales = NORMALES[list(caras)]
+        th = theta_de_t(t, self.periodo)
+        rad = np.radians(th)
+        sol_o = np.stack([-np.sin(rad), np.zeros_like(rad), -np.cos(rad)], axis=-1)
+        qc = q_conj(self.cuaterniones(t))
+        sol_b = q_rotar(qc, sol_o)
+        nadir_b = q_rotar(qc, np.broadcast_to([0.0, 0.0, 1.0], sol_b.shape))
+        return {
+            "sol": np.moveaxis(sol_b @ normales.T, -1, 0),
+            "nadir": np.moveaxis(nadir_b @ normales.T, -1, 0),
+            "iluminado": ~((THETA_C2 < th) & (th < THETA_C3)),
+            "albedo": np.where((THETA_C1 < th) & (th < THETA_C4), 0.0, np.maximum(np.cos(rad), 0.0)),
+        }
+
+class ActitudNominal(Actitud):
+    """Apuntamiento a nadir fijo (la actitud de ecNodales/flujos)."""
+
+    def cuaterniones(self, t: np.ndarray) -> np.ndarray:
+        return np.broadcast_to([1.0, 0.0, 0.0, 0.0], np.shape(t) + (4,))
+
+class ActitudGiro(Actitud):
+    """
+    Giro a velocidad angular constante ω [rad/s] en terna cuerpo desde q0 en t=0.
+    marco='orbital': ω relativa a la terna orbital (p.ej. rolido en apuntamiento nadir).
+    marco='inercial': ω relativa a las estrellas (tumbling/detumble); se compone con
+    la rotación de la terna orbital alrededor de Y (θ).
+    """
+
+    def __init__(self, omega: Sequence[float], q0: Sequence[float] = (1.0, 0.0, 0.0, 0.0),
+                 marco: str = "orbital", periodo: float = ORBITAL_PERIOD):
+        super().__init__(periodo)
+        if marco not in ("orbital", "inercial"):
+            raise ValueError(f"marco inválido: {marco}")
+        self.omega = np.asarray(omega, dtype=float)
+        self.q0 = q_normalizar(np.asarray(q0, dtype=float))
+        self.marco = marco
+
+    def cuaterniones(self, t: np.ndarray) -> np.ndarray:
+        t = np.asarray(t, dtype=float)
+        w = np.linalg.norm(self.omega)
+        if w == 0.0:
+            q = np.broadcast_to(self.q0, t.shape + (4,))
+        else:
+            q = q_mult(self.q0, q_eje_angulo(self.omega, w * t))
+        if self.marco == "inercial":
+            q = q_mult(q_eje_angulo([0.0, 1.0, 0.0], np.radians(theta_de_t(t, self.periodo))), q)
+        return q
+
+class ActitudSerie(Actitud):
+    """Serie de cuaterniones q_k en t_k (p.ej. telemetría o salida de AOCS), con slerp."""
+
+    def __init__(self, t_q: Sequence[float], q: np.ndarray, periodo: float = ORBITAL_PERIOD):
+        super().__init__(periodo)
+        self.t_q = np.asarray(t_q, dtype=float)
+        self.q = q_normalizar(np.asarray(q, dtype=float))
+        if self.q.shape != (self.t_q.size, 4) or np.any(np.diff(self.t_q) <= 0):
+            raise ValueError("Se esperan t_q crecientes y q de forma (len(t_q), 4)")
+
+    def cuaterniones(self, t: np.ndarray) -> np.ndarray:
+        t = np.clip(np.asarray(t, dtype=float), self.t_q[0], self.t_q[-1])
+        k = np.clip(np.searchsorted(self.t_q, t, side="right") - 1, 0, self.t_q.size - 2)
+        s = (t - self.t_q[k]) / (self.t_q[k + 1] - self.t_q[k])
+        return q_slerp(self.q[k], self.q[k + 1], s)
+
+# ----------------------------
+# Flujos por cara
+# ----------------------------
+def factor_planeta(cos_nadir: np.ndarray) -> np.ndarray:
+    """
+    Factor de vista con Venus según el ángulo normal–nadir; pasa por los valores
+    del modelo: F(0°) = F_PLANET_ZPLUS, F(90°) = F_PLANET_LATERAL, F(180°) = F_PLANET_ZMINUS.
+    """
+    return np.interp(cos_nadir, [-1.0, 0.0, 1.0], [F_PLANET_ZMINUS, F_PLANET_LATERAL, F_PLANET_ZPLUS])
+
+def flujos_incidentes(actitud: Actitud, t: np.ndarray,
+                      caras: Sequence[int] = range(len(CARAS))) -> Dict[str, np.ndarray]:
+    """Flujos incidentes (len(caras), ...) [W/m²] 'solar', 'albedo', 'ir' por cara para la actitud."""
+    inc = actitud.incidencias(t, caras)
+    F = factor_planeta(inc["nadir"])
+    return {
+        "solar": SCV * np.maximum(inc["sol"], 0.0) * inc["iluminado"],
+        "albedo": GAMMA * SCV * F * inc["albedo"],
+        "ir": F * SIGMA * T_VENUS ** 4,
+    }
+
+class BaseCara(Base):
+    """Flujo incidente [W/m²] de un tipo sobre una cara, como base de carga."""
+
+    def __init__(self, actitud: Actitud, cara: str, tipo: str):
+        self.nombre = f"{tipo}_{cara}"
+        self.actitud = actitud
+        self.k = CARAS.index(cara)
+        self.tipo = tipo
+        # Bordes de eclipse (saltos) y del albedo (quiebres) se repiten cada órbita
+        self.bordes_deg = np.array((THETA_C2, THETA_C3) if tipo == "solar" else
+                                   (THETA_C1, THETA_C4) if tipo == "albedo" else ())
+
+    def evaluar(self, t: np.ndarray) -> np.ndarray:
+        return flujos_incidentes(self.actitud, t, (self.k,))[self.tipo][0]
+
+    def bordes(self, t0: float, t1: float) -> np.ndarray:
+        return bordes_angulares(self.bordes_deg, t0, t1, self.actitud.periodo)
+
+def aplicar_actitud(red: RedTermica, actitud: Actitud, caso: str = "caliente") -> RedTermica:
+    """
+    Reemplaza solar/albedo/IR de los nodos 1..10 por cargas por cara según la actitud.
+    Nota: ecNodales usa cosφ = -cos θ para todos los paneles; con actitud cada
+    cara recibe su propia incidencia (X± y Y± incluidas).
+    """
+    eps, k_ir, k_abs = opticas_externas(caso)
+    areas = AREAS_NODOS[:N_EXTERNOS]
+    quitar = {"solar", "albedo", "ir"}   # el IR planetario pasa a depender de la actitud
+    keep = [k for k, b in enumerate(red.bases) if b.nombre not in quitar]
+    bases: List[Base] = [red.bases[k] for k in keep]
+    columnas = [red.A[:, keep]]
+    for tipo in ("solar", "albedo", "ir"):
+        for cara in CARAS:
+            col = np.zeros((red.n, 1))
+            for nodo, c in NODO_CARA.items():
+                if c == cara:
+                    i = nodo - 1
+                    col[i, 0] = areas[i] * (eps[i] * k_ir[i] if tipo == "ir" else k_abs[i])
+            bases.append(BaseCara(actitud, cara, tipo))
+            columnas.append(col)
+    return replace(red, A=np.hstack(columnas), bases=bases)
+
+def construir_red_actitud(caso: str, actitud: Actitud) -> RedTermica:
+    """Red de 13 nodos con cargas externas según la actitud dada."""
+    return aplicar_actitud(construir_red(caso), actitud, caso)
@@ -0,0 +1,70 @@
+# By: Johanna Olivera y Ailin Ferrari
+
+"""
+- Barridos de casos (paramétricos o Monte Carlo) con progreso en checkpoint.
+- Cada caso llama a funcion(caso, rng) → {nombre: escalar o array}; los
+  resultados se apilan en arrays (n_casos, ...).
+- Si el barrido se corta, al relanzarlo con el mismo Checkpoint retoma desde
+  el primer caso pendiente con el RNG en el mismo estado (resultados idénticos).
+- Con checkpoint cada resultado es una historia del Checkpoint (.npy mapeado):
+  cada caso escribe sólo su fila y el .npz guarda k, el RNG y las formas.
+"""
+
+from __future__ import annotations
+import hashlib
+import json
+import numpy as np
+from typing import Callable, Dict, Mapping, Sequence
+from checkpoint import Checkpoint, estado_rng, restaurar_rng, verificar_firma
+
+FuncionCaso = Callable[[Mapping, np.random.Generator], Mapping[str, object]]
+
+def _firma(casos: Sequence[Mapping], semilla: int) -> np.ndarray:
+    texto = json.dumps(list(casos), sort_keys=True, default=str)
+    return np.array([hashlib.sha1(texto.encode()).hexdigest(), str(len(casos)), str(semilla)])
+
+def ejecutar_barrido(casos: Sequence[Mapping], funcion: FuncionCaso,
+                     checkpoint: Checkpoint = None, semilla: int = 0) -> Dict[str, np.ndarray]:
+    """
+    Corre funcion sobre cada caso en orden y devuelve {nombre: array (n_casos, ...)}.
+    El RNG es uno solo para todo el barrido (semilla fija), así el caso k ve
+    siempre la misma secuencia aleatoria haya o no reanudación.
+    """
+    n = len(casos)
+    firma = _firma(casos, semilla)
+    rng = np.random.default_rng(semilla)
+    resultados: Dict[str, np.ndarray] = {}
+    k0 = 0
+
+    if checkpoint is not None:
+        previo = checkpoint.cargar()
+        if previo is not None:
+            verificar_firma(previo, "barrido", firma)
+            k0 = int(previo["k"])
+            rng = restaurar_rng(previo["rng"])
+            for clave, forma in json.loads(str(previo["formas"])).items():
+                resultados[clave] = checkpoint.historia(f"res_{clave}", (n,) + tuple(forma))
+
+    for k in range(k0, n):
+        salida = funcion(casos[k], rng)
+        for clave, valor in salida.items():
+            valor = np.asarray(valor, dtype=float)
+            if clave not in resultados:
+                if checkpoint is None:
+                    resultados[clave] = np.full((n,) + valor.shape, np.nan)
+                else:
+                    resultados[clave] = checkpoint.historia(f"res_{clave}", (n,) + valor.shape)
+                    resultados[clave][:] = np.nan
+            if checkpoint is None:
+                resultados[clave][k] = valor
+            else:
+                checkpoint.escribir(f"res_{clave}", k, valor[None])
+        if checkpoint is not None and checkpoint.toca():
+            formas = {c: v.shape[1:] for c, v in resultados.items()}
+            checkpoint.guardar(metodo="barrido", firma=firma, k=k + 1, rng=estado_rng(rng),
+                               formas=np.array(json.dumps(formas)))
+
+    if checkpoint is not None:
+        resultados = {c: np.array(v) for c, v in resultados.items()}
+        checkpoint.terminar()
+    return resultados
@@ -0,0 +1,55 @@
+# By: Johanna Olivera y Ailin Ferrari
+
+"""
+- Funciones base de carga b(t) de la red térmica y sus discontinuidades.
+- Módulo aparte para que red_termica y perfiles_potencia (los perfiles de
+  potencia son bases) dependan de él sin importarse entre sí.
+"""
+
+from __future__ import annotations
+import numpy as np
+from abc import ABC, abstractmethod
+from typing import Callable, Sequence
+from constants import ORBITAL_PERIOD
+
+def theta_de_t(t, periodo: float = ORBITAL_PERIOD):
+    """Ángulo orbital [grados] en [0,360) para t [s] (escalar o array)."""
+    return np.mod((360.0 / periodo) * np.asarray(t, dtype=float), 360.0)
+
+def bordes_angulares(bordes_deg: np.ndarray, t0: float, t1: float,
+                     periodo: float = ORBITAL_PERIOD) -> np.ndarray:
+    """Instantes t0 < t < t1 en que θ(t) pasa por los ángulos bordes_deg [grados]."""
+    bordes_deg = np.unique(np.mod(np.asarray(bordes_deg, dtype=float), 360.0))
+    if bordes_deg.size == 0:
+        return np.empty(0)
+    k = np.arange(np.floor(t0 / periodo), np.floor(t1 / periodo) + 1.0)
+    t = ((k[:, None] + bordes_deg[None, :] / 360.0) * periodo).ravel()
+    return t[(t > t0) & (t < t1)]
+
+class Base(ABC):
+    """Función base de carga b(t) (adimensional o en W) con sus discontinuidades."""
+    nombre: str = ""
+
+    @abstractmethod
+    def evaluar(self, t: np.ndarray) -> np.ndarray:
+        """b(t) con la forma de t."""
+
+    def bordes(self, t0: float, t1: float) -> np.ndarray:
+        """Instantes t0 < t < t1 donde b(t) (o su derivada) salta."""
+        return np.empty(0)
+
+class BaseAngular(Base):
+    """Base periódica en la órbita: b(t) = fn(θ(t)), con saltos en `bordes_deg`."""
+
+    def __init__(self, nombre: str, fn: Callable[[np.ndarray], np.ndarray],
+                 bordes_deg: Sequence[float] = (), periodo: float = ORBITAL_PERIOD):
+        self.nombre = nombre
+        self.fn = fn
+        self.bordes_deg = np.unique(np.mod(np.asarray(bordes_deg, dtype=float), 360.0))
+        self.periodo = periodo
+
+    def evaluar(self, t: np.ndarray) -> np.ndarray:
+        return self.fn(theta_de_t(t, self.periodo))
+
+    def bordes(self, t0: float, t1: float) -> np.ndarray:
+        return bordes_angulares(self.bordes_deg, t0, t1, self.periodo)
@@ -10,14 +10,8 @@
 from __future__ import annotations
 import numpy as np
 import matplotlib.pyplot as plt
-from typing import Dict, Tuple
-from constants import (
-    SIGMA, T_VENUS,
-    F_PLANET_ZPLUS, F_PLANET_LATERAL,
-    EPS_SA_BOL, EPS_SA_EOL, EPS_WTC_BOL, EPS_WTC_EOL,
-    AREA_CARA_Y,
-    THETA_C1, THETA_C2, THETA_C3, THETA_C4
-)
+from typing import Dict
+from flujos import flujos_caras
 
 """
 Configuración “de escenario”
@@ -36,61 +30,38 @@ th = np.linspace(0.0, 2.0 * np.pi, 1000)
 # ----------------------------
 # Parámetros por STATE
 # ----------------------------
-def get_params(state: str):
+def get_params(state: str) -> str:
     """
-    Devuelve:
-      - funciones de emisividad por material (sa, wtc) o 1.0 si 'INC'
-      - Ai (área efectiva de plot)
-      - título del gráfico
+    Devuelve el título según el modo (siempre por unidad de área); la
+    emisividad por material la aplica flujos_caras.
     """
     st = state.upper().strip()
     if st == "INC":
-        # Incidente: sin emisividad/área (por unidad de área)
-        eps_sa = lambda: 1.0
-        eps_wtc = lambda: 1.0
-        Ai = 1.0
-        title = "Flujo infrarrojo incidente"
+        return "Flujo infrarrojo incidente"
     elif st == "BOL":
-        eps_sa = lambda: EPS_SA_BOL
-        eps_wtc = lambda: EPS_WTC_BOL
-        Ai = 1.0
-        title = "Flujo infrarrojo absorbido en BOL"
+        return "Flujo infrarrojo absorbido en BOL"
     elif st == "EOL":
-        eps_sa = lambda: EPS_SA_EOL
-        eps_wtc = lambda: EPS_WTC_EOL
-        Ai = 1.0
-        title = "Flujo infrarrojo absorbido en EOL"
+        return "Flujo infrarrojo absorbido en EOL"
     else:
         raise ValueError(f"STATE inválido: {state}")
-    return eps_sa, eps_wtc, Ai, title
 
 # ----------------------------
-# Ley general IR por grupo
+# Grupos → cara representativa
 # ----------------------------
-def ir_power(F_i: float, eps_i: float, Ai: float, npts: int) -> np.ndarray:
-    """
-    q = ε_i * F_i * σ T_V^4  (flujo, W/m², constante en θ)
-    Devuelve array constante para graficar vs. θ.
-    """
-    value = eps_i * F_i * SIGMA * (T_VENUS ** 4)
-    return np.full(npts, value, dtype=float)
-
-# ----------------------------
-# Grupos y factores de vista
-# ----------------------------
-# Nota: Z- no ve planeta --> F = 0
-GROUPS: Dict[str, Tuple[float, str]] = {
-    "Cara Z+": (F_PLANET_ZPLUS, "sa"),
-    "Cara Z-": (0.0,             "sa"),   # Material irrelevante (F=0), mantenemos consistencia
-    "Cara X±": (F_PLANET_LATERAL, "sa"),
-    "Cara Y±": (F_PLANET_LATERAL, "wtc"),
+# Nota: Z- no ve planeta --> F = 0; Y± con white coating
+GROUPS: Dict[str, str] = {
+    "Cara Z+": "Z+",
+    "Cara Z-": "Z-",
+    "Cara X±": "X+",
+    "Cara Y±": "Y+",
 }
 
 # ----------------------------
 # Plot
 # ----------------------------
 def main() -> None:
-    eps_sa_fn, eps_wtc_fn, Ai, title = get_params(STATE)
+    title = get_params(STATE)
+    flujos = flujos_caras(th, (STATE,))
 
     plt.figure(figsize=(10, 6), dpi=96)
     ax = plt.gca()
@@ -109,11 +80,9 @@ def main() -> None:
     ax.set_title(title)
     ax.set_ylabel("Flujo de calor [W/m²]")
 
-    # Dibujar cada grupo con su emisividad correspondiente
-    for label, (F_i, mat) in GROUPS.items():
-        eps = eps_sa_fn() if mat == "sa" else eps_wtc_fn()
-        Q = ir_power(F_i=F_i, eps_i=eps, Ai=Ai, npts=th.size)
-        ax.plot(th, Q, label=label)
+    # Dibujar cada grupo (emisividad según material de la cara)
+    for label, cara in GROUPS.items():
+        ax.plot(th, flujos.sel("ir", cara, STATE), label=label)
 
     ax.legend(loc="best")
     plt.tight_layout()
@@ -0,0 +1,129 @@
+# By: Johanna Olivera y Ailin Ferrari
+
+"""
+- Checkpoints periódicos de corridas largas y barridos en un .npz.
+- Escritura atómica (archivo temporal + os.replace): un corte a mitad de
+  guardado deja el checkpoint anterior intacto.
+- Incluye helpers para guardar/restaurar el estado del RNG de numpy, así
+  una corrida reanudada sigue bit a bit igual que si no se hubiera cortado.
+- Las historias largas van a un .npy de tamaño fijo al lado del checkpoint
+  (mmap): cada guardado escribe sólo las filas nuevas y el .npz guarda el
+  estado y hasta dónde es válida la historia, así guardar no crece con la corrida.
+- La firma identifica la corrida (método, pasos, tolerancias) y la huella las
+  entradas físicas (red, estado inicial, cargas): un checkpoint de otro caso
+  o de otra red se rechaza.
+"""
+
+from __future__ import annotations
+import hashlib
+import json
+import os
+import time
+import numpy as np
+from typing import Dict, Optional, Tuple
+
+class Checkpoint:
+    """
+    Archivo de checkpoint + política de cuándo guardar.
+
+    cada_s    : guarda si pasaron al menos cada_s segundos de reloj desde el último.
+    cada_pasos: guarda cada tantos llamados a toca() (útil para pruebas/reproducir).
+    """
+
+    def __init__(self, ruta: str, cada_s: float = 300.0, cada_pasos: int = None,
+                 comprimir: bool = False):
+        self.ruta = ruta if ruta.endswith(".npz") else ruta + ".npz"
+        self.cada_s = cada_s
+        self.cada_pasos = cada_pasos
+        self.comprimir = comprimir
+        self._t_ultimo = time.perf_counter()
+        self._cuenta = 0
+        self._historias: Dict[str, np.ndarray] = {}
+
+    def toca(self) -> bool:
+        """True si corresponde guardar ahora (se llama una vez por paso/caso)."""
+        self._cuenta += 1
+        if self.cada_pasos is not None:
+            return self._cuenta % self.cada_pasos == 0
+        return time.perf_counter() - self._t_ultimo >= self.cada_s
+
+    def guardar(self, **datos) -> None:
+        tmp = self.ruta + ".tmp.npz"
+        (np.savez_compressed if self.comprimir else np.savez)(tmp, **datos)
+        os.replace(tmp, self.ruta)
+        self._t_ultimo = time.perf_counter()
+
+    def cargar(self) -> Optional[Dict[str, np.ndarray]]:
+        """Contenido del último checkpoint, o None si no hay."""
+        if not os.path.exists(self.ruta):
+            return None
+        with np.load(self.ruta, allow_pickle=False) as f:
+            return {k: f[k] for k in f.files}
+
+    def _ruta_historia(self, nombre: str) -> str:
+        return f"{self.ruta[:-4]}.{nombre}.npy"
+
+    def historia(self, nombre: str, forma: Tuple[int, ...], dtype=np.float64) -> np.ndarray:
+        """
+        Historia (forma) en un .npy mapeado en memoria; reusa el existente si
+        coincide forma y tipo. Sólo son válidas las filas que indique el .npz.
+        """
+        if nombre not in self._historias:
+            ruta = self._ruta_historia(nombre)
+            mm = None
+            if os.path.exists(ruta):
+                mm = np.load(ruta, mmap_mode="r+")
+                if mm.shape != tuple(forma) or mm.dtype != np.dtype(dtype):
+                    del mm
+                    mm = None
+            if mm is None:
+                mm = np.lib.format.open_memmap(ruta, mode="w+", dtype=dtype, shape=tuple(forma))
+            self._historias[nombre] = mm
+        return self._historias[nombre]
+
+    def escribir(self, nombre: str, desde: int, filas: np.ndarray) -> None:
+        """Escribe filas[k] en la fila desde+k de la historia y las baja a disco."""
+        mm = self._historias[nombre]
+        mm[desde:desde + len(filas)] = filas
+        mm.flush()
+
+    def terminar(self) -> None:
+        """Borra el checkpoint y sus historias (la corrida terminó bien)."""
+        if os.path.exists(self.ruta):
+            os.remove(self.ruta)
+        for nombre in list(self._historias):
+            del self._historias[nombre]
+            os.remove(self._ruta_historia(nombre))
+
+def huella(*partes) -> np.ndarray:
+    """SHA-1 (texto) del tipo, forma y contenido de cada array."""
+    h = hashlib.sha1()
+    for x in partes:
+        x = np.ascontiguousarray(x)
+        h.update(f"{x.dtype.str}{x.shape}".encode())
+        h.update(x.tobytes())
+    return np.array(h.hexdigest())
+
+def verificar_firma(datos: Dict[str, np.ndarray], metodo: str, firma: np.ndarray,
+                    huella_: np.ndarray = None) -> None:
+    """
+    Evita reanudar con un checkpoint de otra corrida (otro método, t o
+    tolerancias) o, si se da huella_, de otras entradas físicas (otro caso o red).
+    """
+    if str(datos.get("metodo")) != metodo or not np.array_equal(datos.get("firma"), firma):
+        raise ValueError(f"El checkpoint no corresponde a esta corrida ({metodo})")
+    if huella_ is not None and str(datos.get("huella")) != str(huella_):
+        raise ValueError(f"El checkpoint es de otro caso o de otra red ({metodo})")
+
+# ----------------------------
+# RNG
+# ----------------------------
+def estado_rng(rng: np.random.Generator) -> np.ndarray:
+    """Estado del bit generator serializado (array de texto, sin pickle)."""
+    return np.array(json.dumps(rng.bit_generator.state))
+
+def restaurar_rng(estado: np.ndarray) -> np.random.Generator:
+    st = json.loads(str(estado))
+    bg = getattr(np.random, st["bit_generator"])()
+    bg.state = st
+    return np.random.Generator(bg)
@@ -36,6 +36,12 @@ AFT_BAT_MAX = 50 + 273.15  # [K]
 AFT_TANK_MIN = 0 + 273.15  # [K]
 AFT_TANK_MAX = 35 + 273.15  # [K]
 
+# Ventanas AFT por nodo (mín, máx) [K]
+AFT_NODOS = {
+    12: (AFT_OBC_MIN, AFT_OBC_MAX),
+    13: (AFT_BAT_MIN, AFT_BAT_MAX),
+}
+
 # ==========================================
 # FACTORES DE VISTA CON VENUS
 # ==========================================
@@ -187,6 +193,11 @@ THETA_C2 = 115
 THETA_C3 = 245
 THETA_C4 = 270
 
+# Cambios de modo de potencia en caso caliente (OBC/AOCS)
+THETA_P1 = 108
+THETA_P2 = 236
+THETA_P3 = 272
+
 # ==========================================
 # POTENCIAS DISIPADAS - CASO CALIENTE
 # ==========================================
@@ -206,9 +217,9 @@ def get_potencia_disipada_caliente(theta, nodo):
     float : Potencia disipada [W]
     """
     if nodo == 12:  # OBC/AOCS
-        if 0 < theta < 108:
+        if 0 < theta < THETA_P1:
             return 50
-        elif 236 < theta < 272:
+        elif THETA_P2 < theta < THETA_P3:
             return 15
         else:
             return 0
@@ -217,6 +228,17 @@ def get_potencia_disipada_caliente(theta, nodo):
     else:
         return 0
 
+# ==========================================
+# POTENCIAS POR MODO DE OPERACIÓN [W] {nodo: potencia}
+# ==========================================
+# Mismos niveles que la escalera del caso caliente (50 W en nominal,
+# 15 W en downlink, OBC apagado en seguro; batería/tanque siempre 15 W)
+POTENCIA_MODOS = {
+    'seguro':   {12: 0,  13: 15},
+    'nominal':  {12: 50, 13: 15},
+    'downlink': {12: 15, 13: 15},
+}
+
 # ==========================================
 # POTENCIAS DISIPADAS - CASO FRÍO
 # ==========================================
@@ -253,6 +275,7 @@ def get_propiedades_caso(caso='caliente'):
     Returns:
     --------
     dict : Diccionario con propiedades del material
+           ('theta_potencia' lista los ángulos donde cambia get_potencia)
     """
     if caso.lower() == 'caliente':
         return {
@@ -261,7 +284,8 @@ def get_propiedades_caso(caso='caliente'):
             'eps_wc': EPS_WTC_EOL,
             'alpha_wc': ALPHA_WTC_EOL,
             'T_inicial': T_INICIAL_CALIENTE,
-            'get_potencia': get_potencia_disipada_caliente
+            'get_potencia': get_potencia_disipada_caliente,
+            'theta_potencia': (0, THETA_P1, THETA_P2, THETA_P3)
         }
     else:  # caso frío
         return {
@@ -270,7 +294,8 @@ def get_propiedades_caso(caso='caliente'):
             'eps_wc': EPS_WTC_BOL,
             'alpha_wc': ALPHA_WTC_BOL,
             'T_inicial': T_INICIAL_FRIO,
-            'get_potencia': get_potencia_disipada_frio
+            'get_potencia': get_potencia_disipada_frio,
+            'theta_potencia': ()
         }
 
 def get_factor_planeta(nodo):
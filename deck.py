@@ -0,0 +1,230 @@
+# By: Johanna Olivera y Ailin Ferrari
+
+"""
+- Importación de modelos de red térmica en formato de texto tipo SINDA
+  (bloques HEADER NODE/CONDUCTOR/SOURCE/CONTROL DATA) a una RedDispersa.
+- Lectura en una sola pasada, línea a línea: los nodos se numeran a medida
+  que aparecen (definidos o referenciados por un conductor) y al final se
+  reordenan en libres y de contorno con operaciones vectorizadas. Los enlaces
+  al contorno quedan como listas (i, j, valor), sin matrices densas (n, nb).
+- Convenciones del subconjunto soportado:
+    '$' comenta el resto de la línea; mayúsculas/minúsculas indistintas;
+    HEADER xxx DATA, SUB   bloque del submodelo SUB (MAIN si no se da);
+    NODE       id, T0, C     id < 0: nodo de contorno (C se ignora);
+    CONDUCTOR  id, na, nb, G id < 0: radiativo (G = ε·A·F, se multiplica por
+                             SIGMA); nodos 'n' del submodelo o 'SUB.n';
+    SOURCE     nodo, Q [W]   carga constante (se acumula);
+    CONTROL    SIGMA = v, ABSZRO = v (T_K = T - ABSZRO; 0 → deck en K).
+  Los conductores valen en ambos sentidos; otros HEADER se saltean.
+- cargar_deck() guarda la red leída en un .npz junto al deck y la reusa
+  mientras el deck no cambie (tamaño y fecha): recargar un modelo de 10⁴
+  nodos lleva milisegundos en vez de volver a leer el texto.
+"""
+
+from __future__ import annotations
+import argparse
+import os
+import tempfile
+import time
+import numpy as np
+from array import array
+from typing import Dict, Tuple
+from constants import SIGMA
+from red_termica import BASE_CONSTANTE
+from red_dispersa import RedDispersa
+
+VERSION_CACHE: int = 2
+SUBMODELO_DEFECTO: str = "MAIN"
+
+def _cache(ruta: str) -> str:
+    return ruta + ".red.npz"
+
+def _firma(ruta: str) -> np.ndarray:
+    st = os.stat(ruta)
+    return np.array([VERSION_CACHE, st.st_size, st.st_mtime_ns], dtype=np.int64)
+
+# ----------------------------
+# Lectura
+# ----------------------------
+def leer_deck(ruta: str) -> Tuple[RedDispersa, np.ndarray]:
+    """(red, T0 (n,) [K]) a partir del deck en `ruta`."""
+    indice: Dict[str, int] = {}
+    definido = array("b")          # 0 sin definir, 1 libre, 2 contorno
+    T0 = array("d")
+    C = array("d")
+    ca, cb, cv, crad = array("q"), array("q"), array("d"), array("b")
+    qn, qv = array("q"), array("d")
+    control = {"SIGMA": SIGMA, "ABSZRO": 0.0}
+
+    def nodo(ref: str, sub: str) -> int:
+        ref = ref.strip().upper()
+        nombre = ref if "." in ref else f"{sub}.{ref}"
+        sub_n, _, num = nombre.rpartition(".")
+        nombre = f"{sub_n}.{abs(int(num))}"
+        i = indice.get(nombre)
+        if i is None:
+            i = indice[nombre] = len(definido)
+            definido.append(0)
+            T0.append(0.0)
+            C.append(0.0)
+        return i
+
+    bloque, sub = None, SUBMODELO_DEFECTO
+    with open(ruta, encoding="utf-8") as f:
+        for n_linea, linea in enumerate(f, 1):
+            linea = linea.split("$", 1)[0].strip()
+            if not linea:
+                continue
+            try:
+                if linea.upper().startswith("HEADER"):
+                    partes = [p.strip().upper() for p in linea[6:].split(",")]
+                    palabras = partes[0].split()
+                    bloque = palabras[0] if len(palabras) == 2 and palabras[1] == "DATA" else None
+                    sub = partes[1] if len(partes) > 1 and partes[1] else SUBMODELO_DEFECTO
+                    continue
+                if bloque == "NODE":
+                    ident, t, c = linea.split(",")[:3]
+                    i = nodo(ident, sub)
+                    if definido[i]:
+                        raise ValueError(f"nodo {ident.strip()} definido dos veces")
+                    definido[i] = 2 if int(ident) < 0 else 1
+                    T0[i] = float(t)
+                    C[i] = float(c)
+                elif bloque == "CONDUCTOR":
+                    ident, a, b, v = linea.split(",")[:4]
+                    ca.append(nodo(a, sub))
+                    cb.append(nodo(b, sub))
+                    cv.append(float(v))
+                    crad.append(int(ident) < 0)
+                elif bloque == "SOURCE":
+                    a, v = linea.split(",")[:2]
+                    qn.append(nodo(a, sub))
+                    qv.append(float(v))
+                elif bloque == "CONTROL":
+                    clave, v = (p.strip().upper() for p in linea.split("=", 1))
+                    if clave in control:
+                        control[clave] = float(v)
+            except ValueError as e:
+                raise ValueError(f"{ruta}:{n_linea}: {e} ({linea!r})") from None
+
+    tipo = np.frombuffer(definido, dtype=np.int8)
+    nombres = np.array(list(indice))
+    if np.any(tipo == 0):
+        raise ValueError(f"Nodos referenciados y no definidos: {', '.join(nombres[tipo == 0][:10])}")
+    libre = tipo == 1
+    C = np.frombuffer(C)
+    if np.any(C[libre] <= 0):
+        raise ValueError(f"Nodos libres con C ≤ 0: {', '.join(nombres[libre & (C <= 0)][:10])}")
+    # Renumeración: libres 0..n-1 y contorno 0..nb-1, en orden de aparición
+    n, nb = int(libre.sum()), int((~libre).sum())
+    nuevo = np.empty(tipo.size, dtype=np.int64)
+    nuevo[libre] = np.arange(n)
+    nuevo[~libre] = np.arange(nb)
+    T = np.frombuffer(T0) - control["ABSZRO"]
+
+    a, b = np.frombuffer(ca, dtype=np.int64), np.frombuffer(cb, dtype=np.int64)
+    v = np.frombuffer(cv).copy()
+    rad = np.frombuffer(crad, dtype=np.int8).astype(bool)
+    v[rad] *= control["SIGMA"]
+    # Cada conductor en ambos sentidos: (i recibe de j)
+    i, j = np.concatenate([a, b]), np.concatenate([b, a])
+    v, rad = np.concatenate([v, v]), np.concatenate([rad, rad])
+    interno = libre[i] & libre[j]
+    al_contorno = libre[i] & ~libre[j]
+    gs, rs = interno & ~rad, interno & rad
+    gc, rc = al_contorno & ~rad, al_contorno & rad
+
+    q = np.zeros(n)
+    qn, qv = np.frombuffer(qn, dtype=np.int64), np.frombuffer(qv)
+    if np.any(~libre[qn]):
+        raise ValueError("SOURCE sobre un nodo de contorno")
+    np.add.at(q, nuevo[qn], qv)
+
+    red = RedDispersa(nombres[libre].tolist(), C[libre].copy(),
+                      nuevo[i[gs]], nuevo[j[gs]], v[gs], nuevo[i[rs]], nuevo[j[rs]], v[rs],
+                      nuevo[i[gc]], nuevo[j[gc]], v[gc], nuevo[i[rc]], nuevo[j[rc]], v[rc],
+                      T[~libre].copy(), q[:, None], [BASE_CONSTANTE])
+    return red, T[libre].copy()
+
+# ----------------------------
+# Cache binaria
+# ----------------------------
+def guardar_cache(ruta: str, red: RedDispersa, T0: np.ndarray, firma: np.ndarray) -> None:
+    tmp = _cache(ruta) + ".tmp.npz"
+    np.savez(tmp, firma=firma, nombres=np.array(red.nombres), C=red.C, gi=red.gi, gj=red.gj, g=red.g,
+             ri=red.ri, rj=red.rj, r=red.r, gci=red.gci, gcj=red.gcj, gc=red.gc,
+             rci=red.rci, rcj=red.rcj, rc=red.rc, T_contorno=red.T_contorno, q=red.A[:, 0], T0=T0)
+    os.replace(tmp, _cache(ruta))
+
+def cargar_deck(ruta: str, cache: bool = True) -> Tuple[RedDispersa, np.ndarray]:
+    """Como leer_deck, pero reusa/actualiza la cache .npz si el deck no cambió."""
+    if not cache:
+        return leer_deck(ruta)
+    firma = _firma(ruta)
+    if os.path.exists(_cache(ruta)):
+        with np.load(_cache(ruta), allow_pickle=False) as f:
+            if np.array_equal(f["firma"], firma):
+                red = RedDispersa(f["nombres"].tolist(), f["C"], f["gi"], f["gj"], f["g"],
+                                  f["ri"], f["rj"], f["r"], f["gci"], f["gcj"], f["gc"],
+                                  f["rci"], f["rcj"], f["rc"], f["T_contorno"], f["q"][:, None], [BASE_CONSTANTE])
+                return red, f["T0"]
+    red, T0 = leer_deck(ruta)
+    guardar_cache(ruta, red, T0, firma)
+    return red, T0
+
+# ----------------------------
+# Deck sintético (pruebas de escala)
+# ----------------------------
+def deck_sintetico(ruta: str, k: int = 100, g_lateral: float = 0.27, eps_area: float = 1e-4,
+                   potencia: float = 5.0) -> None:
+    """
+    Placa de k×k nodos (submodelo PLACA) con conducción entre vecinos,
+    radiación de cada nodo al espacio (SPACE.1, 3 K) y potencia en un nodo.
+    """
+    with open(ruta, "w", encoding="utf-8") as f:
+        f.write("HEADER CONTROL DATA, GLOBAL\n    ABSZRO = -273.15\n")
+        f.write("HEADER NODE DATA, SPACE\n    -1, -270.15, 0.0\n")
+        f.write("HEADER NODE DATA, PLACA\n")
+        f.writelines(f"    {i + 1}, 20.0, 2.5\n" for i in range(k * k))
+        f.write("HEADER CONDUCTOR DATA, PLACA\n")
+        c = 0
+        for fila in range(k):
+            for col in range(k):
+                i = fila * k + col + 1
+                if col + 1 < k:
+                    c += 1
+                    f.write(f"    {c}, {i}, {i + 1}, {g_lateral}\n")
+                if fila + 1 < k:
+                    c += 1
+                    f.write(f"    {c}, {i}, {i + k}, {g_lateral}\n")
+                c += 1
+                f.write(f"    -{c}, {i}, SPACE.1, {eps_area}\n")
+        f.write(f"HEADER SOURCE DATA, PLACA\n    {(k // 2) * k + k // 2 + 1}, {potencia}\n")
+
+def medir(ruta: str) -> None:
+    """Lee el deck desde el texto (o la cache vigente) y de nuevo desde la cache."""
+    t0 = time.perf_counter()
+    red, T0 = cargar_deck(ruta)
+    t_texto = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    red, T0 = cargar_deck(ruta)
+    t_cache = time.perf_counter() - t0
+    print(f"\n==== {ruta} ====")
+    print(f"> {red.n} nodos libres, {red.T_contorno.size} de contorno, {red.n_enlaces} enlaces internos")
+    print(f"> Lectura del texto: {1e3 * t_texto:.1f} ms   desde la cache: {1e3 * t_cache:.1f} ms")
+    print(f"> Carga total: {red.A[:, 0].sum():.3f} W   T0: [{T0.min():.2f}, {T0.max():.2f}] K")
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Importa un deck de red térmica tipo SINDA")
+    ap.add_argument("deck", nargs="?", default=None, help="deck a leer (sin deck: sintético de 10⁴ nodos)")
+    args = ap.parse_args()
+    if args.deck is not None:
+        medir(args.deck)
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        ruta = os.path.join(tmp, "deck_sintetico.inp")
+        deck_sintetico(ruta, 100)
+        medir(ruta)
+
+if __name__ == "__main__":
+    main()
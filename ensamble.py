@@ -0,0 +1,328 @@
+# By: Johanna Olivera y Ailin Ferrari
+
+"""
+- Ensambles de N miembros del modelo de 13 nodos integrados a la vez
+  (Euler explícito a paso fijo, misma discretización que simulate).
+- Los miembros comparten topología (G0, R0 y bases de carga) y difieren en
+  multiplicadores y coeficientes por miembro, así el paso es un par de
+  productos (N, n) × (n, n) en vez de N matrices propias.
+- Modo float32 opcional para estado, historia y núcleo, con acumulación
+  compensada donde hace falta:
+    * estado guardado como T - T_ref y sumado con Kahan (los incrementos por
+      paso son ~1e-3 K y se perderían contra 300 K en float32);
+    * conducción evaluada sobre T - T_ref (Σ G (T_j - T_i) no cambia);
+    * intercambio con el espacio (3 K) factorizado como
+      (T_e - T)(T_e + T)(T_e² + T²) en vez de restar T_e⁴ - T⁴.
+- validar_precision compara float32 contra float64 en los casos caliente/frío.
+"""
+
+from __future__ import annotations
+import numpy as np
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Sequence, Tuple
+from constants import EPS_AL, AFT_NODOS
+from checkpoint import Checkpoint, huella, verificar_firma
+from red_termica import (
+    BASE_CONSTANTE, Base, RedTermica, NODES_SOLVE, NODES_TOTAL, N_EXTERNOS, C_NODOS,
+    construir_red, estado_inicial, parametros_caso, coeficientes_externos
+)
+from integrador import integrar_euler
+
+T_REF: float = 273.15
+
+@dataclass
+class RedEnsamble:
+    """
+    N miembros con
+      C  (N, n)            capacidades
+      G0 (n, n_total), kG (N,)   conducción compartida × multiplicador
+      R0 (n, n),       kR (N,)   radiación interna compartida × multiplicador
+      Rc (N, n, nb)        radiación hacia los nodos de contorno (por miembro)
+      A  (N, n, K)         amplitudes de las bases de carga compartidas
+    """
+    C: np.ndarray
+    G0: np.ndarray
+    kG: np.ndarray
+    R0: np.ndarray
+    kR: np.ndarray
+    Rc: np.ndarray
+    T_contorno: np.ndarray
+    A: np.ndarray
+    bases: List[Base]
+
+    @property
+    def N(self) -> int:
+        return self.C.shape[0]
+
+    @property
+    def n(self) -> int:
+        return self.C.shape[1]
+
+def desde_red(red: RedTermica, N: int) -> RedEnsamble:
+    """N copias idénticas de una red (sin propiedades dependientes de T)."""
+    if red.prop_T is not None:
+        raise ValueError("Los ensambles no soportan propiedades dependientes de T")
+    n = red.n
+    return RedEnsamble(
+        C=np.broadcast_to(red.C, (N, n)), G0=red.G, kG=np.ones(N),
+        R0=red.R[:, :n], kR=np.ones(N), Rc=np.broadcast_to(red.R[:, n:], (N,) + red.R[:, n:].shape),
+        T_contorno=red.T_contorno, A=np.broadcast_to(red.A, (N,) + red.A.shape), bases=red.bases,
+    )
+
+# Nodo con calefactor (batería/tanque)
+NODO_CALEFACTOR: int = 13
+
+def parametros_ensamble(caso: str = "caliente") -> Dict[str, float]:
+    """parametros_caso más los que sólo existen en ensambles, con su valor nominal."""
+    return dict(parametros_caso(caso), escala_G=1.0, escala_P=1.0, calefactor=0.0)
+
+def ensamble_parametrico(caso: str, N: int, **valores) -> RedEnsamble:
+    """
+    Ensamble del modelo de 13 nodos con parámetros por miembro.
+
+    valores: claves de parametros_ensamble, cada una escalar o array (N,):
+    las de parametros_caso, escala_G (conductancias), escala_P (disipación) y
+    calefactor (potencia constante [W] en el nodo NODO_CALEFACTOR).
+    Lo no dado toma el valor del caso.
+    """
+    red = construir_red(caso)
+    p = parametros_ensamble(caso)
+    desconocidos = set(valores) - set(p)
+    if desconocidos:
+        raise ValueError(f"Parámetros desconocidos: {sorted(desconocidos)}")
+    p.update(valores)
+    v = {k: np.broadcast_to(np.asarray(x, dtype=float), (N,)) for k, x in p.items()}
+
+    n, nb = NODES_SOLVE, NODES_TOTAL - NODES_SOLVE
+    r_esp, a_ir, a_sol, a_alb = coeficientes_externos(
+        v["eps_sa"], v["alpha_s"], v["eps_wc"], v["alpha_wc"], v["gamma"], v["scv"], v["T_venus"],
+        v["cobertura"])
+    Rc = np.zeros((N, n, nb))
+    Rc[:, :N_EXTERNOS, nb - 1] = r_esp
+
+    bases = list(red.bases)
+    if np.any(v["calefactor"] != 0.0):
+        bases.append(BASE_CONSTANTE)
+    nombres = [b.nombre for b in bases]
+    A = np.zeros((N, n, len(nombres)))
+    A[:, :N_EXTERNOS, nombres.index("ir")] = a_ir
+    A[:, :N_EXTERNOS, nombres.index("solar")] = a_sol
+    A[:, :N_EXTERNOS, nombres.index("albedo")] = a_alb
+    if BASE_CONSTANTE in bases:
+        A[:, NODO_CALEFACTOR - 1, nombres.index("constante")] = v["calefactor"]
+    for k, nombre in enumerate(nombres):
+        if nombre.startswith("potencia_"):
+            A[:, :, k] = red.A[:, k] * v["escala_P"][:, None]
+
+    return RedEnsamble(
+        C=np.broadcast_to(C_NODOS, (N, n)), G0=red.G, kG=v["escala_G"].copy(),
+        R0=red.R[:, :n] / EPS_AL, kR=v["eps_al"].copy(), Rc=Rc,
+        T_contorno=red.T_contorno, A=A, bases=bases,
+    )
+
+@dataclass
+class ResultadoEnsamble:
+    """T_min/T_max/T_final (N, n) [K]; historia (N, n_total, m) si se pidió."""
+    T_min: np.ndarray
+    T_max: np.ndarray
+    T_final: np.ndarray
+    t: np.ndarray
+    historia: np.ndarray = None
+    t_historia: np.ndarray = None
+
+def integrar_ensamble(ens: RedEnsamble, T0: np.ndarray, dt: float, t_total: float,
+                      dtype=np.float64, historia_cada: int = 0,
+                      checkpoint: Checkpoint = None,
+                      al_avanzar: Callable[[np.ndarray, int], None] = None) -> ResultadoEnsamble:
+    """
+    Euler explícito de todos los miembros: T_p = T_{p-1} + dt/C·(q_int + q_ext(t_p)).
+    historia_cada = k guarda cada k pasos en `dtype` (0 = sólo extremos y estado final).
+    al_avanzar(historia, columnas) se llama cada vez que se completa una columna
+    de historia; las primeras `columnas` ya no cambian y pueden leerse mientras
+    la integración sigue.
+    """
+    dtype = np.dtype(dtype)
+    compensar = dtype == np.float32
+    N, n = ens.N, ens.n
+    steps = int(t_total // dt)
+    t_axis = np.arange(steps) * dt
+
+    # Constantes del núcleo en la precisión pedida
+    Tc = ens.T_contorno
+    G0 = ens.G0
+    Gt = np.ascontiguousarray(G0[:, :n].T, dtype=dtype)
+    g_c = (G0[:, n:] @ (Tc - T_REF)).astype(dtype)
+    g_sum = G0.sum(axis=1).astype(dtype)
+    Rt = np.ascontiguousarray(ens.R0.T, dtype=dtype)
+    r_sum = ens.R0.sum(axis=1).astype(dtype)
+    kG = ens.kG.astype(dtype)[:, None]
+    kR = ens.kR.astype(dtype)[:, None]
+    Rc = np.asarray(ens.Rc, dtype=dtype)
+    Tc_d = Tc.astype(dtype)
+    k = (dt / np.asarray(ens.C, dtype=float)).astype(dtype)
+    A = np.asarray(ens.A, dtype=dtype)
+    b = np.stack([np.broadcast_to(base.evaluar(t_axis), t_axis.shape) for base in ens.bases]).astype(dtype)
+    T_ref = dtype.type(T_REF)
+
+    D = (np.broadcast_to(np.asarray(T0, dtype=float)[..., :n], (N, n)) - T_REF).astype(dtype)
+    c = np.zeros_like(D)   # compensación de Kahan
+    T_min = D.copy()
+    T_max = D.copy()
+
+    m = (steps + historia_cada - 1) // historia_cada if historia_cada else 0
+    historia = np.empty((N, n + Tc.size, m), dtype=dtype) if m else None
+    if m:
+        historia[:, n:, :] = Tc_d[None, :, None]
+        historia[:, :n, 0] = D + T_ref
+
+    p0 = 1
+    guardado = 1 if m else 0    # columnas de historia ya escritas en el checkpoint
+    firma = np.array([N, n, steps, dt, historia_cada, dtype.itemsize])
+    if checkpoint is not None:
+        huella_ = huella(ens.C, ens.G0, ens.kG, ens.R0, ens.kR, ens.Rc, Tc, ens.A, b, D)
+        if m:
+            checkpoint.historia("historia", (m, N, n), dtype)
+            guardado = 0
+        previo = checkpoint.cargar()
+        if previo is not None:
+            verificar_firma(previo, "ensamble", firma, huella_)
+            p0 = int(previo["p"])
+            D, c, T_min, T_max = (previo[x].astype(dtype) for x in ("D", "c", "T_min", "T_max"))
+            if m:
+                guardado = int(previo["guardado"])
+                historia[:, :n, :guardado] = np.moveaxis(
+                    checkpoint.historia("historia", (m, N, n), dtype)[:guardado], 0, -1)
+    if m and al_avanzar is not None:
+        al_avanzar(historia, (p0 - 1) // historia_cada + 1)
+
+    for p in range(p0, steps):
+        T = D + T_ref
+        T2 = T * T
+        q = kG * (D @ Gt + g_c - g_sum * D)
+        q += kR * (T2 * T2 @ Rt - r_sum * (T2 * T2))
+        for j in range(Tc.size):
+            te = Tc_d[j]
+            q += Rc[:, :, j] * ((te - T) * (te + T) * (te * te + T2))
+        q += A @ b[:, p]
+        dD = k * q
+        if compensar:
+            y = dD - c
+            s = D + y
+            c = (s - D) - y
+            D = s
+        else:
+            D = D + dD
+        np.minimum(T_min, D, out=T_min)
+        np.maximum(T_max, D, out=T_max)
+        if m and p % historia_cada == 0:
+            historia[:, :n, p // historia_cada] = D + T_ref
+            if al_avanzar is not None:
+                al_avanzar(historia, p // historia_cada + 1)
+        if checkpoint is not None and checkpoint.toca():
+            if m:
+                hasta = p // historia_cada + 1
+                checkpoint.escribir("historia", guardado, np.moveaxis(historia[:, :n, guardado:hasta], -1, 0))
+                guardado = hasta
+            checkpoint.guardar(metodo="ensamble", firma=firma, huella=huella_, p=p + 1, D=D, c=c,
+                               T_min=T_min, T_max=T_max, guardado=guardado)
+    if checkpoint is not None:
+        checkpoint.terminar()
+
+    return ResultadoEnsamble(
+        T_min=T_min.astype(float) + T_REF, T_max=T_max.astype(float) + T_REF,
+        T_final=D.astype(float) + T_REF, t=t_axis, historia=historia,
+        t_historia=t_axis[::historia_cada] if m else None,
+    )
+
+def estado_periodico(ens: RedEnsamble, T0: np.ndarray, dt: float, t_periodo: float,
+                     tol: float = 0.01, max_orbitas: int = 40, dtype=np.float64
+                     ) -> Tuple[np.ndarray, int]:
+    """
+    Estado inicial (N, n) que se repite tras una órbita, y órbitas integradas.
+
+    Iteración de la órbita T → Φ(T) acelerada con Aitken por miembro: cada
+    dos órbitas se estima la razón r del modo lento dominante, r = (d₂·d₁)/(d₁·d₁),
+    y se salta a T + d₂·r/(1 - r). Converge cuando max|Φ(T) - T| < tol [K].
+    Φ avanza exactamente t_periodo: ceil(t_periodo/dt) pasos de t_periodo/pasos
+    ≤ dt (integrar_ensamble termina en (steps - 1)·dt, así que se le pide un
+    paso más), sin corrimiento de fase entre órbitas.
+    """
+    pasos = int(np.ceil(t_periodo / dt))
+    dt = t_periodo / pasos
+    orbita = lambda T: integrar_ensamble(ens, T, dt, (pasos + 1.5) * dt, dtype).T_final
+    T = np.broadcast_to(np.asarray(T0, dtype=float)[..., :ens.n], (ens.N, ens.n)).copy()
+    n_orbitas = 0
+    d_prev = None
+    while n_orbitas < max_orbitas:
+        T_sig = orbita(T)
+        n_orbitas += 1
+        d = T_sig - T
+        if np.abs(d).max() < tol:
+            return T_sig, n_orbitas
+        if d_prev is not None:
+            r = np.einsum("ij,ij->i", d, d_prev) / np.maximum(np.einsum("ij,ij->i", d_prev, d_prev), 1e-300)
+            r = np.clip(r, 0.0, 0.95)[:, None]
+            T_sig = T_sig + d * r / (1.0 - r)
+            d = None
+        T, d_prev = T_sig, d
+    return T, n_orbitas
+
+def margen_aft(T_min: np.ndarray, T_max: np.ndarray) -> np.ndarray:
+    """(..., len(AFT_NODOS)) margen mínimo a la ventana AFT de cada nodo [K] (negativo = fuera)."""
+    lo, hi = np.array(list(AFT_NODOS.values())).T
+    idx = np.array(list(AFT_NODOS)) - 1
+    return np.minimum(T_min[..., idx] - lo, hi - T_max[..., idx])
+
+# ----------------------------
+# Validación float32 vs float64
+# ----------------------------
+def validar_precision(N: int = 256, dt: float = 1.0, t_total: float = 6000.0,
+                      casos: Sequence[str] = ("caliente", "frio"),
+                      dispersion: float = 0.05, semilla: int = 0) -> Dict[str, Dict[str, object]]:
+    """
+    Corre cada caso de referencia en float64 y float32 (miembro 0 nominal, el resto
+    con ±dispersion en ópticas, conductancias y disipación) y reporta:
+      'error_max'      máx |T32 - T64| en toda la historia [K]
+      'error_nodo'     máx por nodo (n,) [K]
+      'error_extremos' máx |ΔT_min|, |ΔT_max| [K]
+      'error_ref'      máx |T64 - integrar_euler| del miembro nominal [K] (consistencia)
+    """
+    rng = np.random.default_rng(semilla)
+    reporte: Dict[str, Dict[str, object]] = {}
+    for caso in casos:
+        p = parametros_ensamble(caso)
+        valores = {}
+        for clave in ("eps_sa", "alpha_s", "eps_wc", "alpha_wc", "escala_G", "escala_P"):
+            valores[clave] = p[clave] * (1 + dispersion * rng.uniform(-1, 1, N))
+            valores[clave][0] = p[clave]
+
+        ens = ensamble_parametrico(caso, N, **valores)
+        T0 = estado_inicial(caso)
+        r64 = integrar_ensamble(ens, T0, dt, t_total, np.float64, historia_cada=1)
+        r32 = integrar_ensamble(ens, T0, dt, t_total, np.float32, historia_cada=1)
+        ref = integrar_euler(construir_red(caso), T0, dt, t_total)
+
+        dif = np.abs(r32.historia.astype(float) - r64.historia)
+        reporte[caso] = {
+            "error_max": float(dif.max()),
+            "error_nodo": dif[:, :NODES_SOLVE].max(axis=(0, 2)),
+            "error_extremos": float(max(np.abs(r32.T_min - r64.T_min).max(),
+                                        np.abs(r32.T_max - r64.T_max).max())),
+            "error_ref": float(np.abs(r64.historia[0] - ref.temps).max()),
+            "bytes_historia": (r64.historia.nbytes, r32.historia.nbytes),
+        }
+    return reporte
+
+def main() -> None:
+    for caso, rep in validar_precision().items():
+        print(f"\n==== Caso {caso} ====")
+        print(f"> Error máx float32 vs float64: {rep['error_max']:.3e} K")
+        print(f"> Error máx en extremos:        {rep['error_extremos']:.3e} K")
+        print(f"> float64 vs integrar_euler:    {rep['error_ref']:.3e} K")
+        for i, e in enumerate(rep["error_nodo"]):
+            print(f"> Nodo {i + 1}: {e:.3e} K")
+        b64, b32 = rep["bytes_historia"]
+        print(f"> Historia: {b64 / 2**20:.1f} MiB (float64) → {b32 / 2**20:.1f} MiB (float32)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+# By: Johanna Olivera y Ailin Ferrari
+
+"""
+- Límite de estabilidad de Euler explícito a partir de la red linealizada:
+  autovalores λ de J = C⁻¹(G + 4R·T³) en estados de la órbita; el paso es
+  estable si |1 + h·λ| ≤ 1 para todo λ → h ≤ -2·Re(λ)/|λ|².
+- Estudio de convergencia tipo Richardson en DT (caliente y frío): se integra
+  con DT, DT/2, DT/4, ..., se estima el orden observado y el valor extrapolado
+  de los extremos de los nodos 12 (OBC) y 13 (batería), y se recomienda el DT
+  más grande que cumple la tolerancia pedida sin pasar el límite estable.
+"""
+
+from __future__ import annotations
+import numpy as np
+from typing import Dict, Sequence
+from red_termica import RedTermica, construir_red, estado_inicial
+from integrador import integrar_euler
+
+T_TOTAL: float = 6000.0   # [s]
+
+# ----------------------------
+# Límite de estabilidad
+# ----------------------------
+def autovalores(red: RedTermica, T: np.ndarray) -> np.ndarray:
+    """Autovalores del jacobiano de la red linealizada en T [1/s]."""
+    return np.linalg.eigvals(red.jacobiano(np.asarray(T, dtype=float)[:red.n]))
+
+def dt_estable(red: RedTermica, T: np.ndarray) -> float:
+    """Mayor paso de Euler explícito estable alrededor del estado T [s]."""
+    lam = autovalores(red, T)
+    lam = lam[lam.real < 0]
+    if lam.size == 0:
+        return np.inf
+    return float(np.min(-2.0 * lam.real / np.abs(lam) ** 2))
+
+def dt_estable_orbita(red: RedTermica, temps: np.ndarray, muestras: int = 60) -> float:
+    """Mínimo de dt_estable sobre una historia (n_total, m) muestreada en `muestras` estados."""
+    idx = np.unique(np.linspace(0, temps.shape[1] - 1, muestras).astype(int))
+    return min(dt_estable(red, temps[:, p]) for p in idx)
+
+# ----------------------------
+# Convergencia en DT
+# ----------------------------
+def extremos(temps: np.ndarray, nodos: Sequence[int] = (12, 13)) -> np.ndarray:
+    """(len(nodos), 2) con [T_min, T_max] de cada nodo (numeración 1..13) [K]."""
+    sel = temps[[nodo - 1 for nodo in nodos]]
+    return np.stack([sel.min(axis=1), sel.max(axis=1)], axis=1)
+
+def estudio_dt(caso: str = "caliente", tol: float = 0.1, niveles: int = 6,
+               nodos: Sequence[int] = (12, 13), t_total: float = T_TOTAL,
+               seguridad: float = 0.9) -> Dict[str, object]:
+    """
+    Richardson sobre DT_k = DT_0/2^k, con DT_0 = seguridad·límite estable
+    (redondeado hacia abajo al centésimo de segundo).
+
+    Devuelve:
+      'dt_limite'     límite de estabilidad sobre la órbita [s]
+      'dts'           pasos probados (de mayor a menor) [s]
+      'extremos'      (niveles, len(nodos), 2) extremos por paso [K]
+      'orden'         orden usado en la extrapolación (observado, o 1 si no es confiable)
+      'extrapolado'   extremos extrapolados a DT → 0 [K]
+      'error'         (niveles,) máx |extremos - extrapolado| [K]
+      'dt_recomendado' mayor DT con error ≤ tol en él y en todos los más
+                      finos (None si ninguno); siempre < dt_limite
+    """
+    red = construir_red(caso)
+    T0 = estado_inicial(caso)
+
+    # Límite estable sobre la órbita, con una corrida exploratoria a paso chico
+    base = integrar_euler(red, T0, 0.5, t_total)
+    dt_lim = dt_estable_orbita(red, base.temps)
+    dt0 = np.floor(100.0 * seguridad * dt_lim) / 100.0
+    dts = dt0 / 2.0 ** np.arange(niveles)
+
+    X = np.stack([extremos(integrar_euler(red, T0, dt, t_total).temps, nodos) for dt in dts])
+
+    # Orden observado con los tres pasos más finos; Richardson con los dos últimos.
+    # Si las diferencias ya están al nivel del ruido del muestreo de los escalones
+    # de carga, el orden observado no es confiable y se usa el formal de Euler (1).
+    d1 = np.abs(X[-3] - X[-2]).max()
+    d2 = np.abs(X[-2] - X[-1]).max()
+    p = float(np.log2(d1 / d2)) if d1 > 0 and d2 > 0 else 1.0
+    if not 0.5 <= p <= 4.0:
+        p = 1.0
+    X_inf = X[-1] + (X[-1] - X[-2]) / (2.0 ** p - 1.0)
+    error = np.abs(X - X_inf).max(axis=(1, 2))
+
+    # El error no tiene por qué bajar monótonamente: se exige tol desde ahí hacia abajo
+    falla = np.flatnonzero(error > tol)
+    k = falla[-1] + 1 if falla.size else 0
+    return {
+        "dt_limite": dt_lim,
+        "dts": dts,
+        "extremos": X,
+        "orden": p,
+        "extrapolado": X_inf,
+        "error": error,
+        "dt_recomendado": float(dts[k]) if k < niveles else None,
+    }
+
+def recomendar_dt(casos: Sequence[str] = ("caliente", "frio"), tol: float = 0.1, **kw) -> float:
+    """Mayor DT que cumple tol en todos los casos (el más chico de los recomendados)."""
+    dts = [estudio_dt(caso, tol, **kw)["dt_recomendado"] for caso in casos]
+    if any(dt is None for dt in dts):
+        raise ValueError(f"Ningún DT probado alcanza tol = {tol} K; aumentar niveles")
+    return min(dts)
+
+def main() -> None:
+    tol = 0.1
+    recomendados = []
+    for caso in ("caliente", "frio"):
+        r = estudio_dt(caso, tol)
+        print(f"\n==== Caso {caso} ====")
+        print(f"> Límite de estabilidad (Euler explícito): {r['dt_limite']:.3f} s")
+        print(f"> Orden observado: {r['orden']:.2f}")
+        for dt, e in zip(r["dts"], r["error"]):
+            print(f"> DT = {dt:7.4f} s  error extremos nodos 12/13 = {e:.3e} K")
+        print(f"> DT recomendado (tol {tol} K): {r['dt_recomendado']}")
+        recomendados.append(r["dt_recomendado"])
+    if None not in recomendados:
+        print(f"\n> DT recomendado para ambos casos: {min(recomendados)} s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+# By: Johanna Olivera y Ailin Ferrari
+
+"""
+- API de librería para los flujos solar, albedo e infrarrojo por cara.
+- Una sola llamada evalúa todas las caras × estados (INC/BOL/EOL) × θ por broadcasting,
+  sin globals ni matplotlib (los scripts carga_* sólo grafican sobre esto).
+- Totales por órbita en forma cerrada (integrales de cos/sin por ventana angular).
+"""
+
+from __future__ import annotations
+import numpy as np
+from dataclasses import dataclass
+from typing import Dict, Sequence, Tuple
+from constants import (
+    SIGMA, SCV, GAMMA, T_VENUS, ORBITAL_PERIOD,
+    F_PLANET_ZPLUS, F_PLANET_LATERAL, F_PLANET_ZMINUS,
+    F_AEFF, ETA_ELEC, AREA_PANEL, AREA_CARA_Y,
+    ALPHA_S_BOL, ALPHA_S_EOL, EPS_SA_BOL, EPS_SA_EOL,
+    ALPHA_WTC_BOL, ALPHA_WTC_EOL, EPS_WTC_BOL, EPS_WTC_EOL,
+    THETA_C1, THETA_C2, THETA_C3, THETA_C4
+)
+
+CARAS: Tuple[str, ...] = ("Z+", "Z-", "X+", "X-", "Y+", "Y-")
+ESTADOS: Tuple[str, ...] = ("INC", "BOL", "EOL")
+TIPOS: Tuple[str, ...] = ("solar", "albedo", "ir")
+
+c1, c2, c3, c4 = np.radians([THETA_C1, THETA_C2, THETA_C3, THETA_C4])
+DOS_PI = 2.0 * np.pi
+
+# ----------------------------
+# Geometría y materiales por cara
+# ----------------------------
+# Material: 'sa' = solar array (con f_Aeff y η), 'wtc' = white thermal coating
+MATERIAL: Dict[str, str] = {"Z+": "sa", "Z-": "sa", "X+": "sa", "X-": "sa", "Y+": "wtc", "Y-": "wtc"}
+
+# Área por cara [m²] (dos paneles por cara con SA; tapas Y con coating)
+AREA_CARA: Dict[str, float] = {c: (2 * AREA_PANEL if MATERIAL[c] == "sa" else AREA_CARA_Y) for c in CARAS}
+
+# cos(φ) = a·cos(θ) + b·sin(θ) para el Sol, con el signo por orientación
+COS_SOLAR = np.array([
+    [-1.0, 0.0],   # Z+
+    [1.0, 0.0],    # Z-
+    [0.0, -1.0],   # X+
+    [0.0, 1.0],    # X-
+    [0.0, 0.0],    # Y+ (nunca recibe Sol directo)
+    [0.0, 0.0],    # Y-
+])
+
+# Ventanas de iluminación directa [rad] (bordes incluidos)
+VENTANAS_SOLAR: Dict[str, Tuple[Tuple[float, float], ...]] = {
+    "Z+": ((c1, c2), (c3, c4)),
+    "Z-": ((0.0, c1), (c4, DOS_PI)),
+    "X+": ((c3, DOS_PI),),
+    "X-": ((0.0, c2),),
+    "Y+": (),
+    "Y-": (),
+}
+
+# Albedo sólo fuera de eclipse, ley cos(θ)·F_i
+VENTANAS_ALBEDO: Tuple[Tuple[float, float], ...] = ((0.0, c1), (c4, DOS_PI))
+F_PLANETA = np.array([F_PLANET_ZPLUS, F_PLANET_ZMINUS] + [F_PLANET_LATERAL] * 4)
+
+# (alpha, eps) por material y estado; 'INC' = por unidad de absortividad
+PROPIEDADES_ESTADO: Dict[str, Dict[str, Tuple[float, float]]] = {
+    "INC": {"sa": (1.0, 1.0), "wtc": (1.0, 1.0)},
+    "BOL": {"sa": (ALPHA_S_BOL, EPS_SA_BOL), "wtc": (ALPHA_WTC_BOL, EPS_WTC_BOL)},
+    "EOL": {"sa": (ALPHA_S_EOL, EPS_SA_EOL), "wtc": (ALPHA_WTC_EOL, EPS_WTC_EOL)},
+}
+
+def _coeficientes(estados: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """(k_abs, k_ir) de forma (caras, estados): α·f_Aeff·η (SA) o α (coating), y ε."""
+    k_abs = np.empty((len(CARAS), len(estados)))
+    k_ir = np.empty_like(k_abs)
+    for e, estado in enumerate(estados):
+        st = estado.upper().strip()
+        if st not in PROPIEDADES_ESTADO:
+            raise ValueError(f"STATE inválido: {estado}")
+        for c, cara in enumerate(CARAS):
+            alpha, eps = PROPIEDADES_ESTADO[st][MATERIAL[cara]]
+            ef = F_AEFF * ETA_ELEC if (st != "INC" and MATERIAL[cara] == "sa") else 1.0
+            k_abs[c, e] = alpha * ef
+            k_ir[c, e] = eps
+    return k_abs, k_ir
+
+def _mascara(ventanas: Sequence[Tuple[float, float]], theta: np.ndarray) -> np.ndarray:
+    m = np.zeros(theta.shape, dtype=bool)
+    for a, b in ventanas:
+        m |= (theta >= a) & (theta <= b)
+    return m
+
+def _areas(por_area: bool) -> np.ndarray:
+    return np.ones(len(CARAS)) if por_area else np.array([AREA_CARA[c] for c in CARAS])
+
+# ----------------------------
+# Resultado etiquetado
+# ----------------------------
+@dataclass
+class Flujos:
+    """Flujos (cara, estado, θ): [W/m²] si por_area, [W] si no."""
+    solar: np.ndarray
+    albedo: np.ndarray
+    ir: np.ndarray
+    caras: Tuple[str, ...]
+    estados: Tuple[str, ...]
+    theta: np.ndarray
+
+    @property
+    def total(self) -> np.ndarray:
+        return self.solar + self.albedo + self.ir
+
+    def sel(self, tipo: str = "total", cara: str = None, estado: str = None) -> np.ndarray:
+        """Corte por etiqueta, p.ej. sel('solar', cara='Z+', estado='EOL') → (θ,)."""
+        datos = self.total if tipo == "total" else getattr(self, tipo)
+        if cara is not None:
+            datos = datos[self.caras.index(cara)]
+            if estado is not None:
+                return datos[self.estados.index(estado.upper())]
+            return datos
+        if estado is not None:
+            return datos[:, self.estados.index(estado.upper())]
+        return datos
+
+# ----------------------------
+# API
+# ----------------------------
+def flujos_caras(theta: np.ndarray, estados: Sequence[str] = ESTADOS,
+                 por_area: bool = True) -> Flujos:
+    """
+    Flujos solar/albedo/IR para todas las caras × estados × θ [rad] de una vez.
+
+    Q_sol = α·S_V·cos(φ)            en la ventana de iluminación de cada cara
+    Q_alb = α·γ·S_V·F_i·cos(θ)      fuera de eclipse
+    Q_ir  = ε·F_i·σ·T_V⁴            (constante en θ)
+    con α ← α·f_Aeff·η en las caras con solar array (salvo 'INC').
+    `ir` es una vista broadcast (cara, estado, 1) → (cara, estado, θ), no se
+    materializa: copiarla antes de escribir en ella.
+    """
+    theta = np.atleast_1d(np.asarray(theta, dtype=float))
+    estados = tuple(e.upper().strip() for e in estados)
+    k_abs, k_ir = _coeficientes(estados)
+    k_abs = k_abs * _areas(por_area)[:, None]
+    k_ir = k_ir * _areas(por_area)[:, None]
+
+    th = np.mod(theta, DOS_PI)
+    cos_t, sin_t = np.cos(theta), np.sin(theta)
+    cos_phi = COS_SOLAR[:, :1] * cos_t + COS_SOLAR[:, 1:] * sin_t            # (caras, θ)
+    mask_sol = np.stack([_mascara(VENTANAS_SOLAR[c], th) for c in CARAS])
+    forma_sol = SCV * np.where(mask_sol, cos_phi, 0.0)
+    forma_alb = GAMMA * SCV * F_PLANETA[:, None] * np.where(_mascara(VENTANAS_ALBEDO, th), cos_t, 0.0)
+    nivel_ir = F_PLANETA * SIGMA * T_VENUS ** 4
+
+    solar = k_abs[:, :, None] * forma_sol[:, None, :]
+    albedo = k_abs[:, :, None] * forma_alb[:, None, :]
+    ir = np.broadcast_to((k_ir * nivel_ir[:, None])[:, :, None], solar.shape)   # vista de sólo lectura
+    return Flujos(solar, albedo, ir, CARAS, estados, theta)
+
+def _integral_ventanas(ventanas: Sequence[Tuple[float, float]], a: float, b: float) -> float:
+    """∫ (a·cos θ + b·sin θ) dθ sobre la unión de ventanas."""
+    return sum(a * (np.sin(hi) - np.sin(lo)) + b * (np.cos(lo) - np.cos(hi)) for lo, hi in ventanas)
+
+def totales_orbita(estados: Sequence[str] = ESTADOS, por_area: bool = True,
+                   periodo: float = ORBITAL_PERIOD) -> Dict[str, np.ndarray]:
+    """
+    Energía por órbita (cara, estado) [J/m² o J] para 'solar', 'albedo', 'ir' y 'total'.
+    Integrales cerradas de las leyes de flujos_caras, sin muestrear θ.
+    """
+    estados = tuple(e.upper().strip() for e in estados)
+    k_abs, k_ir = _coeficientes(estados)
+    k_abs = k_abs * _areas(por_area)[:, None]
+    k_ir = k_ir * _areas(por_area)[:, None]
+    seg_por_rad = periodo / DOS_PI
+
+    int_sol = np.array([_integral_ventanas(VENTANAS_SOLAR[c], *COS_SOLAR[i]) for i, c in enumerate(CARAS)])
+    int_alb = F_PLANETA * _integral_ventanas(VENTANAS_ALBEDO, 1.0, 0.0)
+    out = {
+        "solar": k_abs * (SCV * seg_por_rad * int_sol)[:, None],
+        "albedo": k_abs * (GAMMA * SCV * seg_por_rad * int_alb)[:, None],
+        "ir": k_ir * (F_PLANETA * SIGMA * T_VENUS ** 4 * periodo)[:, None],
+    }
+    out["total"] = out["solar"] + out["albedo"] + out["ir"]
+    return out
@@ -0,0 +1,162 @@
+# By: Johanna Olivera y Ailin Ferrari
+
+"""
+- Índice persistente de estados ya convergidos (órbita periódica o
+  estacionario) para arrancar resoluciones nuevas cerca de la solución en vez
+  de hacerlo siempre desde T_INICIAL_CALIENTE/T_INICIAL_FRIO.
+- Parámetros normalizados a [0, 1] con los límites dados; búsqueda de vecinos
+  con un KD-tree propio (numpy, hojas de hasta HOJA puntos). Los puntos nuevos
+  se buscan por fuerza bruta hasta que conviene reconstruir el árbol.
+- semilla(): estado del vecino más cercano (k=1) o interpolación por inverso
+  de la distancia al cuadrado entre los k más cercanos.
+- Se guarda en un .npz (escritura atómica); sólo se carga si coincide la
+  definición de parámetros y el caso.
+"""
+
+from __future__ import annotations
+import heapq
+import os
+import numpy as np
+from typing import Dict, List, Sequence, Tuple
+
+HOJA: int = 16   # puntos por hoja del KD-tree
+
+class KDTree:
+    """KD-tree estático sobre X (m, d) con corte en la mediana de la dimensión más extendida."""
+
+    def __init__(self, X: np.ndarray):
+        self.X = np.asarray(X, dtype=float)
+        self.orden = np.arange(self.X.shape[0])
+        # Nodos: dimensión y valor de corte, hijos (-1 = hoja) y rango [ini, fin) en orden
+        self._dim: List[int] = []
+        self._val: List[float] = []
+        self._izq: List[int] = []
+        self._der: List[int] = []
+        self._rango: List[Tuple[int, int]] = []
+        if self.X.shape[0]:
+            self._construir(0, self.X.shape[0])
+
+    def _construir(self, ini: int, fin: int) -> int:
+        nodo = len(self._dim)
+        self._dim.append(-1)
+        self._val.append(0.0)
+        self._izq.append(-1)
+        self._der.append(-1)
+        self._rango.append((ini, fin))
+        if fin - ini <= HOJA:
+            return nodo
+        idx = self.orden[ini:fin]
+        P = self.X[idx]
+        dim = int(np.argmax(P.max(axis=0) - P.min(axis=0)))
+        medio = (fin - ini) // 2
+        part = np.argpartition(P[:, dim], medio)
+        self.orden[ini:fin] = idx[part]
+        self._dim[nodo] = dim
+        self._val[nodo] = float(self.X[self.orden[ini + medio], dim])
+        self._izq[nodo] = self._construir(ini, ini + medio)
+        self._der[nodo] = self._construir(ini + medio, fin)
+        return nodo
+
+    def consultar(self, x: np.ndarray, k: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+        """(distancias, índices) de los k puntos más cercanos a x (d,), de menor a mayor."""
+        if not self._dim:
+            return np.empty(0), np.empty(0, dtype=int)
+        mejores: List[Tuple[float, int]] = []   # heap de (-d², índice)
+        pila = [(0, 0.0)]
+        while pila:
+            nodo, cota = pila.pop()
+            if len(mejores) == k and cota >= -mejores[0][0]:
+                continue
+            dim = self._dim[nodo]
+            if dim < 0:
+                ini, fin = self._rango[nodo]
+                idx = self.orden[ini:fin]
+                d2 = ((self.X[idx] - x) ** 2).sum(axis=1)
+                for di, i in zip(d2, idx):
+                    if len(mejores) < k:
+                        heapq.heappush(mejores, (-di, int(i)))
+                    elif di < -mejores[0][0]:
+                        heapq.heapreplace(mejores, (-di, int(i)))
+                continue
+            delta = x[dim] - self._val[nodo]
+            cerca, lejos = (self._izq[nodo], self._der[nodo]) if delta < 0 else (self._der[nodo], self._izq[nodo])
+            pila.append((lejos, max(cota, delta * delta)))
+            pila.append((cerca, cota))
+        mejores.sort(key=lambda e: -e[0])
+        return np.sqrt([-d for d, _ in mejores]), np.array([i for _, i in mejores], dtype=int)
+
+class IndiceCalido:
+    """
+    Estados convergidos (m, n) indexados por sus parámetros (m, d).
+    limites: {nombre: (lo, hi)} define el orden y la normalización de los parámetros.
+    """
+
+    def __init__(self, limites: Dict[str, Tuple[float, float]], caso: str, ruta: str = None):
+        self.nombres = tuple(limites)
+        self.lo, self.hi = np.array([limites[v] for v in self.nombres], dtype=float).T
+        self.caso = caso
+        self.ruta = ruta
+        self.P = np.empty((0, len(self.nombres)))   # normalizados
+        self.estados: np.ndarray = None
+        self._arbol = KDTree(self.P)
+        if ruta and os.path.exists(ruta):
+            with np.load(ruta, allow_pickle=False) as f:
+                if (tuple(f["nombres"]) == self.nombres and str(f["caso"]) == caso
+                        and np.array_equal(f["lo"], self.lo) and np.array_equal(f["hi"], self.hi)):
+                    self.P, self.estados = f["P"], f["estados"]
+                    self._arbol = KDTree(self.P)
+
+    def __len__(self) -> int:
+        return self.P.shape[0]
+
+    def normalizar(self, X: np.ndarray) -> np.ndarray:
+        return (np.atleast_2d(np.asarray(X, dtype=float)) - self.lo) / (self.hi - self.lo)
+
+    def agregar(self, X: np.ndarray, estados: np.ndarray) -> None:
+        """Suma parámetros X (m, d) con sus estados convergidos (m, n)."""
+        estados = np.atleast_2d(np.asarray(estados, dtype=float))
+        self.P = np.concatenate([self.P, self.normalizar(X)])
+        self.estados = estados.copy() if self.estados is None else np.concatenate([self.estados, estados])
+        # Reconstruir cuando los puntos fuera del árbol pasan de un cuarto del total
+        if len(self) - self._arbol.X.shape[0] > max(HOJA, len(self) // 4):
+            self._arbol = KDTree(self.P)
+
+    def vecinos(self, x: np.ndarray, k: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+        """k vecinos de un punto ya normalizado: árbol + puntos agregados después."""
+        d, i = self._arbol.consultar(x, k)
+        m0 = self._arbol.X.shape[0]
+        if len(self) > m0:
+            d_extra = np.sqrt(((self.P[m0:] - x) ** 2).sum(axis=1))
+            d = np.concatenate([d, d_extra])
+            i = np.concatenate([i, np.arange(m0, len(self))])
+            orden = np.argsort(d, kind="stable")[:k]
+            d, i = d[orden], i[orden]
+        return d, i
+
+    def semilla(self, X: np.ndarray, k: int = 4, defecto: np.ndarray = None) -> np.ndarray:
+        """
+        Estados iniciales (m, n) para los parámetros X (m, d): vecino más cercano
+        (k=1) o promedio pesado por 1/d² de los k más cercanos. Sin datos devuelve
+        `defecto` repetido.
+        """
+        P = self.normalizar(X)
+        if not len(self):
+            if defecto is None:
+                raise ValueError("Índice vacío y sin estado por defecto")
+            return np.tile(np.asarray(defecto, dtype=float), (P.shape[0], 1))
+        salida = np.empty((P.shape[0], self.estados.shape[1]))
+        for j, p in enumerate(P):
+            d, i = self.vecinos(p, k)
+            if d[0] == 0.0:
+                salida[j] = self.estados[i[0]]
+            else:
+                w = 1.0 / d ** 2
+                salida[j] = w @ self.estados[i] / w.sum()
+        return salida
+
+    def guardar(self) -> None:
+        if self.ruta and len(self):
+            tmp = self.ruta + ".tmp.npz"
+            np.savez(tmp, nombres=np.array(self.nombres), caso=self.caso, lo=self.lo, hi=self.hi,
+                     P=self.P, estados=self.estados)
+            os.replace(tmp, self.ruta)
@@ -0,0 +1,377 @@
+# By: Johanna Olivera y Ailin Ferrari
+
+"""
+- Integradores de la red térmica (red_termica.RedTermica).
+- Euler explícito a paso fijo: misma discretización que simOrbital.simulate.
+- Integración por tramos: se precalculan todas las discontinuidades de carga
+  (eclipse, ventanas de albedo, cambios de potencia) y el paso adaptativo cae
+  exactamente en cada una; entre bordes se dan pasos grandes (Rosenbrock ROS2,
+  L-estable, así que la bandeja rígida no limita el paso).
+- Multirate: los nodos de constante de tiempo corta (la bandeja, muy
+  conductiva hacia las cajas) se subdividen en pasos DT y el resto avanza con
+  un paso grande m·DT; el calor intercambiado entre grupos se acumula sobre
+  los mismos subpasos de ambos lados.
+- Euler y tramos aceptan un Checkpoint: guardan su estado cada tanto y, si el
+  archivo existe, reanudan desde ahí con el mismo resultado bit a bit.
+- Todos aceptan un perfil.Perfil para medir el tiempo por etapa.
+"""
+
+from __future__ import annotations
+import numpy as np
+from dataclasses import dataclass
+from checkpoint import Checkpoint, huella, verificar_firma
+from red_termica import RedTermica
+from perfil import Perfil, etapas
+
+# Coeficiente de ROS2 (Verwer et al.), orden 2 para cualquier jacobiano aproximado
+GAMMA_ROS2: float = 1.0 + 1.0 / np.sqrt(2.0)
+
+@dataclass
+class Resultado:
+    """Historia de temperaturas (n_total, m) [K] en los instantes t (m,) [s]."""
+    temps: np.ndarray
+    t: np.ndarray
+    n_pasos: int = 0
+    n_rechazos: int = 0
+    n_evals: int = 0
+    n_evals_nodo: int = 0   # balances de nodo evaluados (multirate)
+
+def huella_red(red: RedTermica, T0: np.ndarray, q: np.ndarray) -> np.ndarray:
+    """Huella de las entradas físicas de una corrida: red, estado inicial y cargas q."""
+    T0 = np.asarray(T0, dtype=float)[:red.n]
+    extra = () if red.prop_T is None else red.prop_T.evaluar(T0)
+    return huella(red.C, red.G, red.R, red.A, red.T_contorno, T0, q, *extra)
+
+def cargas_perfiladas(red: RedTermica, t: np.ndarray, perfil: Perfil = None) -> np.ndarray:
+    """red.cargas(t) midiendo aparte las bases de potencia ('potencia') y el resto ('cargas')."""
+    if perfil is None:
+        return red.cargas(t)
+    t = np.asarray(t, dtype=float)
+    b = [None] * len(red.bases)
+    for etapa, es_potencia in (("cargas", False), ("potencia", True)):
+        with perfil.medir(etapa):
+            for i, base in enumerate(red.bases):
+                if base.nombre.startswith("potencia_") == es_potencia:
+                    b[i] = np.broadcast_to(base.evaluar(t), t.shape)
+    with perfil.medir("cargas"):
+        return np.tensordot(red.A, np.stack(b), axes=(1, 0))
+
+# ----------------------------
+# Euler explícito (referencia)
+# ----------------------------
+def integrar_euler(red: RedTermica, T0: np.ndarray, dt: float, t_total: float,
+                   checkpoint: Checkpoint = None, perfil: Perfil = None) -> Resultado:
+    """
+    Avance explícito T_p = T_{p-1} + dt/C·(q_int(T_{p-1}) + q_ext(t_p)),
+    como en simulate (la carga se evalúa al final del paso).
+    """
+    steps = int(t_total // dt)
+    t_axis = np.arange(steps) * dt
+    q_ext = cargas_perfiladas(red, t_axis, perfil)   # (n, steps) de una vez
+    k = dt / red.C
+
+    temps = np.empty((red.n + red.T_contorno.size, steps))
+    temps[red.n:, :] = red.T_contorno[:, None]
+    T = np.asarray(T0, dtype=float)[:red.n].copy()
+    temps[:red.n, 0] = T
+
+    p0 = guardado = 1
+    firma = np.array([steps, dt])
+    if checkpoint is not None:
+        huella_ = huella_red(red, T, q_ext)
+        checkpoint.historia("temps", (steps, red.n))
+        guardado = 0    # columnas ya escritas en la historia del checkpoint
+        previo = checkpoint.cargar()
+        if previo is not None:
+            verificar_firma(previo, "euler", firma, huella_)
+            p0 = guardado = int(previo["p"])
+            temps[:red.n, :p0] = checkpoint.historia("temps", (steps, red.n))[:p0].T
+            T = temps[:red.n, p0 - 1].copy()
+
+    def guardar(p: int) -> None:
+        nonlocal guardado
+        checkpoint.escribir("temps", guardado, temps[:red.n, guardado:p + 1].T)
+        guardado = p + 1
+        checkpoint.guardar(metodo="euler", firma=firma, huella=huella_, p=p + 1)
+
+    # Conducción y radiación por separado (mismas operaciones que flujo_interno)
+    n = red.n
+    Gi, Gc, Ri = red.G[:, :n], red.G[:, n:] @ red.T_contorno, red.R[:, :n]
+    if perfil is not None:
+        perfil.n_nodos = n
+    m = etapas(perfil, ("conduccion", "radiacion", "ecuaciones", "actualizacion", "salida", "checkpoint"))
+    for p in range(p0, steps):
+        if red.prop_T is None:
+            T4 = T ** 4
+            q_cond = Gi @ T + Gc - red.g_sum * T
+            m(0)
+            q_rad = Ri @ T4 + red.R4_contorno - red.r_sum * T4
+            m(1)
+            T = T + k * (q_cond + q_rad + q_ext[:, p])
+        else:
+            dT = red.derivada(t_axis[p], T, q_ext[:, p])
+            m(2)
+            T = T + dt * dT
+        m(3)
+        temps[:n, p] = T
+        m(4)
+        if checkpoint is not None and checkpoint.toca():
+            guardar(p)
+        m(5)
+        m.paso()
+    m.volcar()
+    if checkpoint is not None:
+        checkpoint.terminar()
+    return Resultado(temps, t_axis, n_pasos=steps - 1, n_evals=steps - 1)
+
+# ----------------------------
+# Integración por tramos
+# ----------------------------
+def _t_dentro(t: float, a: float, b: float) -> float:
+    """Corre t apenas hacia adentro de [a, b] para evaluar la carga del lado del tramo."""
+    eps = max(1e-6, 1024.0 * np.spacing(abs(b)))
+    return min(max(t, a + eps), b - eps)
+
+def _hermite(ta, ya, fa, tb, yb, fb, t):
+    """Interpolación cúbica de Hermite dentro de un paso aceptado, t (m,) → (n, m)."""
+    h = tb - ta
+    s = (t - ta) / h
+    s2, s3 = s * s, s * s * s
+    return (np.outer(ya, 2 * s3 - 3 * s2 + 1) + np.outer(h * fa, s3 - 2 * s2 + s)
+            + np.outer(yb, -2 * s3 + 3 * s2) + np.outer(h * fb, s3 - s2))
+
+def cortes_tramos(red: RedTermica, t0: float, t1: float) -> np.ndarray:
+    """[t0, bordes..., t1]: extremos de los tramos suaves de la corrida."""
+    return np.concatenate([[t0], red.bordes(t0, t1), [t1]])
+
+def integrar_tramos(red: RedTermica, T0: np.ndarray, t_salida: np.ndarray,
+                    rtol: float = 1e-5, atol: float = 1e-3,
+                    h0: float = 1.0, h_max: float = np.inf,
+                    checkpoint: Checkpoint = None, perfil: Perfil = None) -> Resultado:
+    """
+    Integra de t_salida[0] a t_salida[-1] tramo a tramo entre discontinuidades.
+
+    El paso se controla con el estimador embebido de ROS2 (diferencia con
+    Euler linealmente implícito); al llegar a un borde el paso se recorta
+    para caer justo ahí y las cargas se evalúan siempre del lado del tramo.
+    Las salidas se obtienen por Hermite cúbico, sin forzar el paso a t_salida.
+    """
+    t_salida = np.asarray(t_salida, dtype=float)
+    n = red.n
+    I = np.eye(n)
+    cortes = cortes_tramos(red, t_salida[0], t_salida[-1])
+
+    temps = np.empty((n + red.T_contorno.size, t_salida.size))
+    temps[n:, :] = red.T_contorno[:, None]
+    y = np.asarray(T0, dtype=float)[:n].copy()
+    temps[:n, 0] = y
+    j = 1   # próxima salida a completar
+
+    t, h = cortes[0], h0
+    tramo0 = 0
+    n_pasos = n_rechazos = n_evals = 0
+    guardado = 1
+    firma = np.array([t_salida.size, t_salida[0], t_salida[-1], rtol, atol, h_max])
+    if checkpoint is not None:
+        huella_ = huella_red(red, y, np.concatenate([red.cargas(t_salida).ravel(), cortes]))
+        historia = checkpoint.historia("temps", (t_salida.size, n))
+        guardado = 0    # salidas ya escritas en la historia del checkpoint
+        previo = checkpoint.cargar()
+        if previo is not None:
+            verificar_firma(previo, "tramos", firma, huella_)
+            tramo0, j = int(previo["tramo"]), int(previo["j"])
+            t, h = float(previo["t"]), float(previo["h"])
+            y = previo["y"].copy()
+            temps[:n, :j] = historia[:j].T
+            guardado = j
+            n_pasos, n_rechazos, n_evals = (int(c) for c in previo["cuentas"])
+            if t > cortes[tramo0]:
+                n_evals -= 1    # f0 a mitad de tramo ya estaba contada
+
+    if perfil is not None:
+        perfil.n_nodos = n
+    e = etapas(perfil, ("ecuaciones", "jacobiano", "solve", "control", "salida", "checkpoint"))
+    # Cada tramo empieza donde terminó el anterior (tn = b exacto)
+    for tramo in range(tramo0, cortes.size - 1):
+        a, b = cortes[tramo], cortes[tramo + 1]
+        f0 = red.derivada(_t_dentro(t, a, b), y)
+        n_evals += 1
+        e(0)
+        while t < b:
+            llega = t + 1.01 * h >= b
+            hs = b - t if llega else h
+            W = I - GAMMA_ROS2 * hs * red.jacobiano(y)
+            e(1)
+            k1 = np.linalg.solve(W, f0)
+            e(2)
+            tn = b if llega else t + hs
+            f1 = red.derivada(_t_dentro(tn, a, b), y + hs * k1)
+            e(0)
+            k2 = np.linalg.solve(W, f1 - 2.0 * k1)
+            e(2)
+            yn = y + 1.5 * hs * k1 + 0.5 * hs * k2
+            n_evals += 1
+
+            escala = atol + rtol * np.maximum(np.abs(y), np.abs(yn))
+            err = np.sqrt(np.mean((0.5 * hs * (k1 + k2) / escala) ** 2))
+            fac = min(5.0, max(0.2, 0.9 / np.sqrt(err))) if err > 0 else 5.0
+            e(3)
+
+            if err <= 1.0:
+                fn = red.derivada(_t_dentro(tn, a, b), yn)
+                n_evals += 1
+                e(0)
+                k = j
+                while k < t_salida.size and t_salida[k] <= tn:
+                    k += 1
+                if k > j:
+                    temps[:n, j:k] = _hermite(t, y, f0, tn, yn, fn, t_salida[j:k])
+                    j = k
+                e(4)
+                t, y, f0 = tn, yn, fn
+                n_pasos += 1
+                # Un paso recortado por el borde no achica el paso del tramo siguiente
+                h = min(h_max, max(h, hs * fac) if llega else hs * fac)
+                if checkpoint is not None and checkpoint.toca():
+                    checkpoint.escribir("temps", guardado, temps[:n, guardado:j].T)
+                    guardado = j
+                    checkpoint.guardar(metodo="tramos", firma=firma, huella=huella_,
+                                       tramo=tramo + 1 if t >= b else tramo, j=j, t=t, h=h, y=y,
+                                       cuentas=np.array([n_pasos, n_rechazos, n_evals]))
+                e(5)
+            else:
+                n_rechazos += 1
+                h = min(h_max, hs * fac)
+                e(3)
+            e.paso()
+    e.volcar()
+
+    if checkpoint is not None:
+        checkpoint.terminar()
+    return Resultado(temps, t_salida, n_pasos, n_rechazos, n_evals)
+
+# ----------------------------
+# Multirate
+# ----------------------------
+def constantes_tiempo(red: RedTermica, T: np.ndarray) -> np.ndarray:
+    """τ_i = C_i / (Σ G_ij + 4 Σ R_ij T_i³) [s] de cada nodo libre alrededor de T."""
+    T = np.asarray(T, dtype=float)[:red.n]
+    return red.C / (red.g_sum + 4.0 * red.r_sum * T ** 3)
+
+def nodos_rapidos(red: RedTermica, T: np.ndarray, H: float) -> np.ndarray:
+    """Índices de los nodos que un paso H de Euler no resuelve (τ < H)."""
+    return np.flatnonzero(constantes_tiempo(red, T) < H)
+
+def integrar_multirate(red: RedTermica, T0: np.ndarray, dt: float, t_total: float,
+                       m: int = 5, rapidos: np.ndarray = None, perfil: Perfil = None) -> Resultado:
+    """
+    Euler multirate con paso fino dt (nodos rápidos) y paso grueso H = m·dt (lentos).
+
+    En cada paso grueso:
+      1. predictor de los lentos con Euler en H (acople evaluado al inicio);
+      2. m subpasos de los rápidos con los lentos interpolados linealmente entre
+         el inicio y el predictor, acumulando el calor que cada lento cede a los
+         rápidos en esos mismos estados;
+      3. corrector de los lentos con ese calor acumulado y la carga externa
+         promediada sobre los subpasos, así lo que sale de un grupo es lo que
+         entra al otro.
+    Las salidas quedan en la grilla fina de integrar_euler (lentos interpolados).
+    rapidos: índices 0..n-1; por defecto nodos_rapidos(red, T0, m·dt). ValueError
+    si queda un nodo lento con τ(T0) < m·dt (el paso grueso lo haría divergir).
+
+    Los lentos son Euler de primer orden en H, así que su error crece con m.
+    Caso caliente, dt = 1 s, una órbita, máximo error de los paneles frente a
+    Euler con dt = 0.1 s: Euler 0.048 K; m = 2: 0.056 K; m = 5: 0.093 K;
+    m = 10: 0.154 K (nodos 12/13 ≤ 0.03 K). m = 2 ya reduce las evaluaciones
+    de nodo casi a la mitad con el error de Euler. Contra las doradas
+    (regresion.py, RMS ≤ 0.05 K) m = 5 da RMS 0.024 K en el nodo 1 y m = 10
+    0.053 K, fuera de tolerancia: por eso m = 5 por defecto.
+    """
+    if red.prop_T is not None:
+        raise ValueError("integrar_multirate no soporta propiedades dependientes de T")
+    if m < 1:
+        raise ValueError("m debe ser ≥ 1")
+    n = red.n
+    steps = int(t_total // dt)
+    t_axis = np.arange(steps) * dt
+    q_ext = cargas_perfiladas(red, t_axis, perfil)
+    T = np.asarray(T0, dtype=float)[:n].copy()
+    tau = constantes_tiempo(red, T)
+    if rapidos is None:
+        f = nodos_rapidos(red, T, m * dt)
+    else:
+        f = np.unique(np.asarray(rapidos, dtype=int))
+        if f.size and (f[0] < 0 or f[-1] >= n):
+            raise ValueError(f"Índices de nodos rápidos fuera de 0..{n - 1}")
+    s = np.setdiff1d(np.arange(n), f)
+    inestables = s[tau[s] < m * dt]
+    if inestables.size:
+        raise ValueError(f"Nodos lentos con τ < m·dt = {m * dt:g} s: {(inestables + 1).tolist()}; "
+                         "agregarlos a rapidos o reducir m")
+    c = np.arange(n, n + red.T_contorno.size)
+    Tc, Tc4 = red.T_contorno, red.T_contorno ** 4
+    G, R = red.G, red.R
+
+    # Lentos: flujo propio (entre lentos y al contorno) y acople con los rápidos
+    Gss, Rss = G[np.ix_(s, s)], R[np.ix_(s, s)]
+    Gsf, Rsf = G[np.ix_(s, f)], R[np.ix_(s, f)]
+    a_s = G[np.ix_(s, c)] @ Tc + R[np.ix_(s, c)] @ Tc4
+    g_s, r_s = Gss.sum(axis=1) + G[np.ix_(s, c)].sum(axis=1), Rss.sum(axis=1) + R[np.ix_(s, c)].sum(axis=1)
+    gsf, rsf = Gsf.sum(axis=1), Rsf.sum(axis=1)
+    # Rápidos: flujo completo con los lentos como dato
+    Gff, Rff = G[np.ix_(f, f)], R[np.ix_(f, f)]
+    Gfs, Rfs = G[np.ix_(f, s)], R[np.ix_(f, s)]
+    a_f = G[np.ix_(f, c)] @ Tc + R[np.ix_(f, c)] @ Tc4
+    g_f, r_f = red.g_sum[f], red.r_sum[f]
+    k_s, k_f = dt / red.C[s], dt / red.C[f]
+
+    def propio_s(Ts):
+        Ts4 = Ts ** 4
+        return Gss @ Ts + Rss @ Ts4 + a_s - g_s * Ts - r_s * Ts4
+
+    def acople_s(Ts, Tf):
+        return Gsf @ Tf + Rsf @ Tf ** 4 - gsf * Ts - rsf * Ts ** 4
+
+    temps = np.empty((n + c.size, steps))
+    temps[n:, :] = Tc[:, None]
+    temps[:n, 0] = T
+    Ts, Tf = T[s], T[f]
+    n_evals_nodo = 0
+    if perfil is not None:
+        perfil.n_nodos = n
+    e = etapas(perfil, ("lentos", "rapidos", "salida"))
+
+    p = 0
+    while p < steps - 1:
+        mk = min(m, steps - 1 - p)
+        q_s = q_ext[s, p + 1:p + mk + 1].sum(axis=1)     # Σ carga de los subpasos
+        base_s = mk * propio_s(Ts) + q_s
+        Ts_pred = Ts + k_s * (base_s + mk * acople_s(Ts, Tf))
+        e(0)
+        # Sumas de los estados de los subpasos: el acople acumulado es lineal en ellas
+        S_f, S_f4, S_s, S_s4 = np.zeros(f.size), np.zeros(f.size), np.zeros(s.size), np.zeros(s.size)
+        for j in range(mk):
+            Ts_j = Ts + (j / mk) * (Ts_pred - Ts)
+            Tf4, Ts_j4 = Tf ** 4, Ts_j ** 4
+            S_f += Tf
+            S_f4 += Tf4
+            S_s += Ts_j
+            S_s4 += Ts_j4
+            Tf = Tf + k_f * (Gff @ Tf + Rff @ Tf4 + Gfs @ Ts_j + Rfs @ Ts_j4 + a_f
+                             - g_f * Tf - r_f * Tf4 + q_ext[f, p + j + 1])
+            temps[f, p + j + 1] = Tf
+        e(1)
+        n_evals_nodo += s.size + mk * f.size
+        acumulado = Gsf @ S_f + Rsf @ S_f4 - gsf * S_s - rsf * S_s4
+        Ts_nuevo = Ts + k_s * (base_s + acumulado)
+        e(0)
+        w = np.arange(1, mk + 1) / mk
+        temps[s, p + 1:p + mk + 1] = Ts[:, None] + np.outer(Ts_nuevo - Ts, w)
+        Ts = Ts_nuevo
+        p += mk
+        e(2)
+        e.paso()
+    e.volcar()
+
+    return Resultado(temps, t_axis, n_pasos=(steps - 1 + m - 1) // m,
+                     n_evals=steps - 1, n_evals_nodo=n_evals_nodo)
@@ -0,0 +1,164 @@
+# By: Johanna Olivera y Ailin Ferrari
+
+"""
+- Refinamiento del modelo de 13 nodos: cada nodo elegido se parte en k×k
+  subnodos (celdas cuadradas de igual área) y se arma una RedDispersa.
+- Se conservan los totales del modelo original:
+    C_i     → C_i/k² por celda;
+    R_i,esp y cargas (solar, albedo, IR, potencia) → repartidas por área;
+    G_ij, R_ij entre nodos originales → repartidas entre pares de celdas, con
+    suma igual al valor original. La conducción entra por el perímetro de la
+    placa (uniones con la estructura) y la radiación por toda la cara.
+- Entre celdas vecinas de una misma placa se agrega conducción lateral
+  G_LATERAL = k_Al·espesor (para celdas cuadradas no depende del tamaño).
+- familia_sintetica() genera modelos de cientos a decenas de miles de nodos
+  para medir escalado del solver disperso (red_dispersa.integrar_implicito).
+"""
+
+from __future__ import annotations
+import time
+import numpy as np
+from typing import Dict, List, Mapping, Sequence, Tuple, Union
+from red_termica import RedTermica, construir_red, estado_inicial
+from red_dispersa import RedDispersa, enlaces, integrar_implicito
+
+# Conducción entre celdas vecinas [W/K]: Al 6061 (167 W/mK) × 1.6 mm de espesor
+G_LATERAL: float = 167.0 * 1.6e-3
+
+# Nodos que se refinan por defecto: paneles, caras Y± y bandeja
+NODOS_PLACA: Tuple[int, ...] = tuple(range(1, 12))
+
+def _perimetro(k: int) -> np.ndarray:
+    """Índices (fila·k + col) de las celdas del borde, recorridas en sentido horario."""
+    if k == 1:
+        return np.array([0])
+    arriba = [(0, c) for c in range(k)]
+    derecha = [(f, k - 1) for f in range(1, k)]
+    abajo = [(k - 1, c) for c in range(k - 2, -1, -1)]
+    izquierda = [(f, 0) for f in range(k - 2, 0, -1)]
+    return np.array([f * k + c for f, c in arriba + derecha + abajo + izquierda])
+
+def _pares(a: np.ndarray, b: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Empareja dos listas de celdas recorriéndolas a la par (la más corta se repite)."""
+    m = max(a.size, b.size)
+    i = np.arange(m)
+    return a[i % a.size], b[i % b.size]
+
+def refinar(red: RedTermica, k: Union[int, Mapping[int, int]] = 4,
+            nodos: Sequence[int] = NODOS_PLACA, g_lateral: float = G_LATERAL) -> RedDispersa:
+    """
+    Red dispersa con los `nodos` (numeración 1..n) partidos en k×k celdas.
+    k puede ser un entero o {nodo: k}. Los demás nodos quedan como están.
+    """
+    if red.prop_T is not None:
+        raise ValueError("El refinamiento no soporta propiedades dependientes de T")
+    n = red.n
+    ks = np.ones(n, dtype=int)
+    for nodo in nodos:
+        ks[nodo - 1] = k.get(nodo, 1) if isinstance(k, Mapping) else k
+    if np.any(ks < 1):
+        raise ValueError("k debe ser ≥ 1")
+
+    inicio = np.concatenate([[0], np.cumsum(ks ** 2)])
+    celdas = [np.arange(inicio[i], inicio[i + 1]) for i in range(n)]
+    borde = [inicio[i] + _perimetro(ks[i]) for i in range(n)]
+    padre = np.repeat(np.arange(n), ks ** 2)
+    frac = 1.0 / ks[padre] ** 2           # fracción de área de cada celda
+
+    def repartir(M: np.ndarray, entrada: List[np.ndarray]):
+        ii, jj, vv = [], [], []
+        for i, j in zip(*np.nonzero(M)):
+            a, b = _pares(entrada[i], entrada[j])
+            ii.append(a)
+            jj.append(b)
+            vv.append(np.full(a.size, M[i, j] / a.size))
+        return ii, jj, vv
+
+    gi, gj, g = repartir(red.G[:, :n], borde)
+    ri, rj, r = repartir(red.R[:, :n], celdas)
+
+    # Conducción lateral entre celdas vecinas de cada placa (en ambos sentidos)
+    for i in range(n):
+        kk = ks[i]
+        if kk == 1:
+            continue
+        idx = inicio[i] + np.arange(kk * kk).reshape(kk, kk)
+        a = np.concatenate([idx[:, :-1].ravel(), idx[:-1, :].ravel()])
+        b = np.concatenate([idx[:, 1:].ravel(), idx[1:, :].ravel()])
+        gi += [a, b]
+        gj += [b, a]
+        g.append(np.full(2 * a.size, g_lateral))
+
+    cat = lambda x, dtype=float: np.concatenate(x).astype(dtype) if x else np.empty(0, dtype)
+    nombres = [f"{red.nombres[p]}" + (f" [{c // ks[p]},{c % ks[p]}]" if ks[p] > 1 else "")
+               for p, c in zip(padre, np.arange(padre.size) - inicio[padre])]
+    return RedDispersa(
+        nombres, red.C[padre] * frac,
+        cat(gi, int), cat(gj, int), cat(g), cat(ri, int), cat(rj, int), cat(r),
+        *enlaces(red.G[padre, n:] * frac[:, None]), *enlaces(red.R[padre, n:] * frac[:, None]),
+        red.T_contorno.copy(),
+        red.A[padre] * frac[:, None], list(red.bases), padre,
+    )
+
+def totales(red: RedDispersa, n: int) -> Dict[str, np.ndarray]:
+    """Totales por nodo de origen (C, cargas, contorno) y entre nodos de origen (G, R), sin la conducción lateral."""
+    p = red.padre
+    G = np.zeros((n, n))
+    R = np.zeros((n, n))
+    externo = p[red.gi] != p[red.gj]
+    np.add.at(G, (p[red.gi][externo], p[red.gj][externo]), red.g[externo])
+    np.add.at(R, (p[red.ri], p[red.rj]), red.r)
+    Gc = np.zeros((n, red.T_contorno.size))
+    Rc = np.zeros_like(Gc)
+    np.add.at(Gc, (p[red.gci], red.gcj), red.gc)
+    np.add.at(Rc, (p[red.rci], red.rcj), red.rc)
+    suma = lambda x: np.array([np.bincount(p, col, n) for col in np.atleast_2d(x.T)]).T
+    return {"C": np.bincount(p, red.C, n), "G": G, "R": R, "A": suma(red.A),
+            "g_contorno": Gc, "r_contorno": Rc}
+
+def familia_sintetica(caso: str = "caliente", ks: Sequence[int] = (6, 12, 24, 48),
+                      nodos: Sequence[int] = NODOS_PLACA) -> List[RedDispersa]:
+    """Modelos refinados de tamaño creciente (11·k² + 2 nodos con los nodos por defecto)."""
+    red = construir_red(caso)
+    return [refinar(red, k, nodos) for k in ks]
+
+def estado_inicial_refinado(red: RedDispersa, caso: str = "caliente") -> np.ndarray:
+    """T_inicial del caso copiado a las celdas de cada nodo."""
+    return estado_inicial(caso)[red.padre]
+
+def medir_escalado(caso: str = "caliente", ks: Sequence[int] = (6, 12, 24, 48),
+                   dt: float = 10.0, pasos: int = 50) -> List[Dict[str, float]]:
+    """Tiempo por paso del solver implícito en la familia sintética."""
+    salida = []
+    for red in familia_sintetica(caso, ks):
+        T0 = estado_inicial_refinado(red, caso)
+        t0 = time.perf_counter()
+        r = integrar_implicito(red, T0, dt, pasos * dt, nodos=[], cada=pasos)
+        seg = time.perf_counter() - t0
+        salida.append({"nodos": red.n, "enlaces": red.n_enlaces, "s_por_paso": seg / r.n_pasos,
+                       "jv_por_paso": r.n_evals / r.n_pasos})
+    return salida
+
+def main() -> None:
+    caso = "caliente"
+    red = construir_red(caso)
+    fina = refinar(red, 8)
+    tot = totales(fina, red.n)
+    print("\n==== Conservación (k = 8) ====")
+    print(f"> C: {np.abs(tot['C'] - red.C).max():.2e}  G: {np.abs(tot['G'] - red.G[:, :red.n]).max():.2e}  "
+          f"R: {np.abs(tot['R'] - red.R[:, :red.n]).max():.2e}  A: {np.abs(tot['A'] - red.A).max():.2e}")
+
+    r = integrar_implicito(fina, estado_inicial_refinado(fina, caso), 5.0, 6000.0, cada=12)
+    print("\n==== Gradiente en la órbita (k = 8) ====")
+    for nodo in (1, 3, 9, 11):
+        sel = fina.padre[:] == nodo - 1
+        dT = r.temps[sel].max(axis=0) - r.temps[sel].min(axis=0)
+        print(f"> Nodo {nodo}: ΔT máx entre celdas {dT.max():.3f} K")
+
+    print("\n==== Escalado del solver disperso ====")
+    for fila in medir_escalado(caso):
+        print(f"> {fila['nodos']:6d} nodos, {fila['enlaces']:7d} enlaces: "
+              f"{1e3 * fila['s_por_paso']:8.2f} ms/paso, {fila['jv_por_paso']:.1f} J·v/paso")
+
+if __name__ == "__main__":
+    main()
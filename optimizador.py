@@ -0,0 +1,254 @@
+# By: Johanna Olivera y Ailin Ferrari
+
+"""
+- Optimización de diseño térmico sobre el simulador por ensambles: coating
+  blanco (α y ε BOL), cobertura de celdas en los paneles y potencia del
+  calefactor de la batería.
+- Objetivos:
+    'margen'     maximizar el peor margen AFT (nodos 12/13) entre caliente y frío;
+    'calefactor' minimizar la potencia del calefactor con margen ≥ margen_min.
+- Evolución diferencial (población acotada, sin gradientes: el peor margen es
+  un mínimo de extremos y no es derivable). Cada generación se evalúa como un
+  único ensamble por caso, así toda la población avanza en paralelo.
+- Los márgenes se miden en la órbita periódica de cada diseño
+  (ensamble.estado_periodico): el caso frío tarda ~15 órbitas en asentarse
+  desde T_INICIAL_FRIO y una sola órbita subestima el efecto del calefactor.
+- Las evaluaciones se guardan en un Archivo (opcionalmente en .npz): los
+  diseños repetidos no se vuelven a simular y una optimización nueva arranca
+  con los mejores diseños ya evaluados. Los estados periódicos convergidos van
+  a un IndiceCalido por caso y cada diseño nuevo arranca desde sus vecinos.
+- El coating se especifica en BOL (caso frío); en el caso caliente (EOL) se
+  aplica la misma degradación que entre ALPHA/EPS_WTC_BOL y _EOL. El
+  calefactor sólo actúa en el caso frío (en el caliente el termostato lo
+  mantiene apagado).
+"""
+
+from __future__ import annotations
+import os
+import numpy as np
+from dataclasses import dataclass, field
+from typing import Dict, List, Sequence, Tuple
+from constants import ALPHA_WTC_BOL, ALPHA_WTC_EOL, EPS_WTC_BOL, EPS_WTC_EOL, AFT_NODOS, ORBITAL_PERIOD
+from red_termica import estado_inicial
+from ensamble import ensamble_parametrico, integrar_ensamble, estado_periodico, margen_aft
+from indice_calido import IndiceCalido
+
+DT: float = 1.0           # [s]
+
+# Variables de diseño y límites por defecto
+LIMITES: Dict[str, Tuple[float, float]] = {
+    "alpha_wc": (0.08, 0.40),     # absortividad solar del coating (BOL)
+    "eps_wc": (0.05, 0.92),       # emisividad IR del coating (BOL)
+    "cobertura": (0.30, 1.00),    # fracción de paneles con celdas
+    "calefactor": (0.0, 60.0),    # potencia del calefactor de la batería [W]
+}
+
+PENALIZACION: float = 10.0   # [W/K] por debajo de margen_min (objetivo 'calefactor')
+
+def parametros_diseno(X: np.ndarray, variables: Sequence[str], caso: str) -> Dict[str, np.ndarray]:
+    """Diseños X (P, d) → valores por miembro para ensamble_parametrico en el caso dado."""
+    valores = {}
+    for j, nombre in enumerate(variables):
+        x = X[:, j]
+        if nombre == "alpha_wc" and caso == "caliente":
+            x = x + (ALPHA_WTC_EOL - ALPHA_WTC_BOL)
+        elif nombre == "eps_wc" and caso == "caliente":
+            x = x * (EPS_WTC_EOL / EPS_WTC_BOL)
+        elif nombre == "calefactor" and caso == "caliente":
+            x = np.zeros_like(x)
+        valores[nombre] = x
+    return valores
+
+def caja(variables: Sequence[str], limites: Dict[str, Tuple[float, float]] = None
+         ) -> Dict[str, Tuple[float, float]]:
+    """Límites de cada variable: LIMITES completados/reemplazados por `limites`."""
+    lim = dict(LIMITES, **(limites or {}))
+    desconocidas = set(variables) - set(lim)
+    if desconocidas:
+        raise ValueError(f"Variables desconocidas: {sorted(desconocidas)}")
+    return {v: tuple(map(float, lim[v])) for v in variables}
+
+# ----------------------------
+# Evaluaciones
+# ----------------------------
+class Archivo:
+    """
+    Diseños ya evaluados: X (k, d) y márgenes (k, 2·len(AFT_NODOS)) con el
+    orden [caliente nodos..., frío nodos...]. evaluar() sólo simula lo nuevo.
+    limites completa/reemplaza LIMITES; la caja resultante normaliza los IndiceCalido.
+    """
+
+    CASOS: Tuple[str, ...] = ("caliente", "frio")
+
+    def __init__(self, variables: Sequence[str], ruta: str = None, tol_periodico: float = 0.05,
+                 dt: float = DT, calido: bool = True, limites: Dict[str, Tuple[float, float]] = None):
+        self.variables = tuple(variables)
+        self.limites = caja(self.variables, limites)
+        self.ruta = ruta
+        self.tol_periodico = tol_periodico
+        self.dt = dt
+        self.indices: Dict[str, IndiceCalido] = {}
+        if calido:
+            base = ruta[:-4] if ruta and ruta.endswith(".npz") else ruta
+            for caso in self.CASOS:
+                self.indices[caso] = IndiceCalido(self.limites, caso, f"{base}_{caso}_calido.npz" if ruta else None)
+        self.n_orbitas = 0
+        self.X = np.empty((0, len(self.variables)))
+        self.margenes = np.empty((0, 2 * len(AFT_NODOS)))
+        self._indice: Dict[bytes, int] = {}
+        self.n_simulados = 0
+        self.n_reutilizados = 0
+        if ruta and os.path.exists(ruta):
+            with np.load(ruta, allow_pickle=False) as f:
+                if (tuple(f["variables"]) == self.variables and float(f["dt"]) == dt
+                        and float(f["tol_periodico"]) == tol_periodico):
+                    self._agregar(f["X"], f["margenes"])
+
+    @staticmethod
+    def _clave(x: np.ndarray) -> bytes:
+        return np.round(x, 12).tobytes()
+
+    def _agregar(self, X: np.ndarray, margenes: np.ndarray) -> None:
+        for x in X:
+            self._indice[self._clave(x)] = len(self._indice)
+        self.X = np.concatenate([self.X, X])
+        self.margenes = np.concatenate([self.margenes, margenes])
+
+    def evaluar(self, X: np.ndarray) -> np.ndarray:
+        """Márgenes (P, 2·len(AFT_NODOS)) [K] de los diseños X (P, d)."""
+        X = np.atleast_2d(np.asarray(X, dtype=float))
+        idx = np.array([self._indice.get(self._clave(x), -1) for x in X])
+        nuevos = np.flatnonzero(idx < 0)
+        # Un diseño repetido dentro de la misma población se simula una sola vez
+        _, primeros = np.unique(np.round(X[nuevos], 12), axis=0, return_index=True)
+        nuevos = nuevos[np.sort(primeros)]
+        self.n_reutilizados += X.shape[0] - nuevos.size
+        if nuevos.size:
+            self.n_simulados += nuevos.size
+            self._agregar(X[nuevos], self._simular(X[nuevos]))
+            idx = np.array([self._indice[self._clave(x)] for x in X])
+        return self.margenes[idx]
+
+    def _simular(self, X: np.ndarray) -> np.ndarray:
+        """Extremos sobre la órbita periódica de cada diseño, un ensamble por caso."""
+        salida = []
+        for caso in self.CASOS:
+            ens = ensamble_parametrico(caso, X.shape[0], **parametros_diseno(X, self.variables, caso))
+            indice = self.indices.get(caso)
+            T0 = estado_inicial(caso) if indice is None else indice.semilla(X, defecto=estado_inicial(caso))
+            T0, n_orbitas = estado_periodico(ens, T0, self.dt, ORBITAL_PERIOD, self.tol_periodico)
+            self.n_orbitas += n_orbitas
+            if indice is not None:
+                indice.agregar(X, T0)
+            r = integrar_ensamble(ens, T0, self.dt, ORBITAL_PERIOD)
+            salida.append(margen_aft(r.T_min, r.T_max))
+        return np.concatenate(salida, axis=1)
+
+    def guardar(self) -> None:
+        if self.ruta:
+            tmp = self.ruta + ".tmp.npz"
+            np.savez(tmp, variables=np.array(self.variables), tol_periodico=self.tol_periodico, dt=self.dt,
+                     X=self.X, margenes=self.margenes)
+            os.replace(tmp, self.ruta)
+        for indice in self.indices.values():
+            indice.guardar()
+
+# ----------------------------
+# Objetivo y optimización
+# ----------------------------
+def objetivo(X: np.ndarray, margenes: np.ndarray, variables: Sequence[str],
+             tipo: str = "margen", margen_min: float = 2.0) -> np.ndarray:
+    """Valor a minimizar (P,)."""
+    peor = margenes.min(axis=1)
+    if tipo == "margen":
+        return -peor
+    if tipo == "calefactor":
+        if "calefactor" not in variables:
+            raise ValueError("El objetivo 'calefactor' requiere la variable 'calefactor'")
+        P = X[:, list(variables).index("calefactor")]
+        return P + PENALIZACION * np.maximum(0.0, margen_min - peor)
+    raise ValueError(f"Objetivo desconocido: {tipo}")
+
+@dataclass
+class ResultadoOptimizacion:
+    diseno: Dict[str, float]
+    valor: float
+    margenes: Dict[str, float]          # '<caso>_<nodo>' → margen [K]
+    historia: List[float] = field(default_factory=list)   # mejor valor por generación
+    n_simulados: int = 0
+    n_reutilizados: int = 0
+
+def optimizar(tipo: str = "margen", variables: Sequence[str] = tuple(LIMITES),
+              limites: Dict[str, Tuple[float, float]] = None,
+              poblacion: int = 32, generaciones: int = 30,
+              F: float = 0.6, CR: float = 0.9, margen_min: float = 2.0,
+              archivo: Archivo = None, semilla: int = 0, tol: float = 1e-3,
+              paciencia: int = 10) -> ResultadoOptimizacion:
+    """
+    Evolución diferencial rand/1/bin en la caja de `limites` (por defecto, la del archivo).
+    Para antes de `generaciones` si el mejor valor no mejora más de tol en `paciencia` generaciones.
+    """
+    variables = tuple(variables)
+    if archivo is None:
+        archivo = Archivo(variables, limites=limites)
+    elif archivo.variables != variables:
+        raise ValueError("El archivo se creó con otras variables de diseño")
+    elif limites and caja(variables, limites) != archivo.limites:
+        raise ValueError("El archivo se creó con otros límites; pasarlos a Archivo(limites=...)")
+    lo, hi = np.array([archivo.limites[v] for v in variables]).T
+    rng = np.random.default_rng(semilla)
+    d = len(variables)
+
+    # Población inicial: los mejores ya evaluados (dentro de la caja) + muestras uniformes
+    X = lo + (hi - lo) * rng.random((poblacion, d))
+    if archivo.X.shape[0]:
+        dentro = np.all((archivo.X >= lo) & (archivo.X <= hi), axis=1)
+        previos = archivo.X[dentro]
+        f_prev = objetivo(previos, archivo.margenes[dentro], variables, tipo, margen_min)
+        semillas = previos[np.argsort(f_prev)[:poblacion // 2]]
+        X[:semillas.shape[0]] = semillas
+    f = objetivo(X, archivo.evaluar(X), variables, tipo, margen_min)
+
+    historia = [float(f.min())]
+    for _ in range(generaciones):
+        # Mutación rand/1 con tres índices distintos entre sí y del objetivo
+        r = np.array([rng.choice(np.delete(np.arange(poblacion), i), 3, replace=False)
+                      for i in range(poblacion)])
+        V = X[r[:, 0]] + F * (X[r[:, 1]] - X[r[:, 2]])
+        V = np.where(V < lo, lo + rng.random(V.shape) * (X - lo), V)   # rebote dentro de la caja
+        V = np.where(V > hi, hi - rng.random(V.shape) * (hi - X), V)
+        cruza = rng.random((poblacion, d)) < CR
+        cruza[np.arange(poblacion), rng.integers(0, d, poblacion)] = True
+        U = np.where(cruza, V, X)
+
+        f_U = objetivo(U, archivo.evaluar(U), variables, tipo, margen_min)
+        mejora = f_U <= f
+        X[mejora], f[mejora] = U[mejora], f_U[mejora]
+        historia.append(float(f.min()))
+        if len(historia) > paciencia and historia[-1 - paciencia] - historia[-1] < tol:
+            break
+
+    archivo.guardar()
+    b = int(np.argmin(f))
+    m = archivo.evaluar(X[b:b + 1])[0]
+    nombres = [f"{caso}_{nodo}" for caso in Archivo.CASOS for nodo in AFT_NODOS]
+    return ResultadoOptimizacion(
+        diseno=dict(zip(variables, X[b].tolist())), valor=float(f[b]),
+        margenes=dict(zip(nombres, m.tolist())), historia=historia,
+        n_simulados=archivo.n_simulados, n_reutilizados=archivo.n_reutilizados,
+    )
+
+def main() -> None:
+    archivo = Archivo(tuple(LIMITES), ruta="optimizacion.npz")
+    for tipo in ("margen", "calefactor"):
+        r = optimizar(tipo, archivo=archivo)
+        print(f"\n==== Objetivo: {tipo} ====")
+        for nombre, valor in r.diseno.items():
+            print(f"> {nombre}: {valor:.4f}")
+        for nombre, valor in r.margenes.items():
+            print(f"> Margen AFT {nombre}: {valor:.3f} K")
+        print(f"> Generaciones: {len(r.historia) - 1}, simulados: {r.n_simulados}, "
+              f"reutilizados: {r.n_reutilizados}, órbitas integradas: {archivo.n_orbitas}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+# By: Johanna Olivera y Ailin Ferrari
+
+"""
+- Perfilado por etapas de una corrida (cargas, potencia, conducción,
+  radiación, actualización, salida, checkpoint, gráficos, ...).
+- Los integradores reciben un Perfil opcional y marcan el fin de cada etapa
+  con un contador en ns (time.perf_counter_ns) que se acumula en listas
+  locales y se vuelca al Perfil una vez por bloque de pasos, no por llamada.
+  Sin Perfil se usa un marcador nulo: el mismo lazo, sin medir.
+- El reporte trae tiempo total, pasos/s, fracción por etapa y asignaciones
+  (bloques netos de Python; con memoria=True también pico de tracemalloc),
+  con el mismo esquema para cualquier integrador: se puede exportar a JSON
+  y comparar entre backends.
+"""
+
+from __future__ import annotations
+import json
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Dict, Sequence
+
+BLOQUE: int = 256   # pasos por volcado de contadores
+
+class Etapas:
+    """
+    Marcador de etapas de un lazo: m(i) suma el tiempo desde la marca anterior
+    a la etapa i; m.paso() cuenta un paso y vuelca cada BLOQUE pasos.
+    """
+
+    def __init__(self, perfil: "Perfil", nombres: Sequence[str], bloque: int = BLOQUE):
+        self.perfil = perfil
+        self.nombres = tuple(nombres)
+        self.bloque = bloque
+        self.acum = [0] * len(self.nombres)
+        self.llamadas = [0] * len(self.nombres)
+        self.pasos = 0
+        self._t = time.perf_counter_ns()
+
+    def __call__(self, i: int) -> None:
+        t = time.perf_counter_ns()
+        self.acum[i] += t - self._t
+        self.llamadas[i] += 1
+        self._t = t
+
+    def reiniciar(self) -> None:
+        """Descarta el tiempo transcurrido desde la última marca (código no medido)."""
+        self._t = time.perf_counter_ns()
+
+    def paso(self) -> None:
+        self.pasos += 1
+        if self.pasos % self.bloque == 0:
+            self.volcar()
+
+    def volcar(self) -> None:
+        for nombre, ns, k in zip(self.nombres, self.acum, self.llamadas):
+            if k:
+                self.perfil.sumar(nombre, ns, k)
+        self.perfil.n_pasos += self.pasos
+        self.acum = [0] * len(self.nombres)
+        self.llamadas = [0] * len(self.nombres)
+        self.pasos = 0
+
+class _EtapasNulas:
+    """Mismo uso que Etapas, sin costo más allá de la llamada."""
+
+    def __call__(self, i: int) -> None:
+        pass
+
+    def reiniciar(self) -> None:
+        pass
+
+    def paso(self) -> None:
+        pass
+
+    def volcar(self) -> None:
+        pass
+
+ETAPAS_NULAS = _EtapasNulas()
+
+def etapas(perfil: "Perfil", nombres: Sequence[str]):
+    """Etapas del Perfil, o el marcador nulo si no hay Perfil."""
+    return ETAPAS_NULAS if perfil is None else Etapas(perfil, nombres)
+
+class Perfil:
+    """Acumulador de tiempos por etapa de una corrida."""
+
+    def __init__(self, backend: str = "", memoria: bool = False):
+        self.backend = backend
+        self.memoria = memoria
+        self.ns: Dict[str, int] = {}
+        self.llamadas: Dict[str, int] = {}
+        self.n_pasos = 0
+        self.n_nodos = 0
+        self._t0 = None
+        self.wall_ns = 0
+        self._bloques0 = 0
+        self.bloques_netos = 0
+        self.pico_bytes = None
+
+    def sumar(self, nombre: str, ns: int, llamadas: int = 1) -> None:
+        self.ns[nombre] = self.ns.get(nombre, 0) + ns
+        self.llamadas[nombre] = self.llamadas.get(nombre, 0) + llamadas
+
+    @contextmanager
+    def medir(self, nombre: str):
+        """Etapa gruesa (armado del modelo, gráficos, precálculo de cargas)."""
+        t0 = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.sumar(nombre, time.perf_counter_ns() - t0)
+
+    def iniciar(self) -> "Perfil":
+        if self.memoria:
+            tracemalloc.start()
+        self._bloques0 = sys.getallocatedblocks()
+        self._t0 = time.perf_counter_ns()
+        return self
+
+    def terminar(self) -> "Perfil":
+        self.wall_ns = time.perf_counter_ns() - self._t0
+        self.bloques_netos = sys.getallocatedblocks() - self._bloques0
+        if self.memoria:
+            self.pico_bytes = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        return self
+
+    def __enter__(self) -> "Perfil":
+        return self.iniciar()
+
+    def __exit__(self, *exc) -> None:
+        self.terminar()
+
+    def resumen(self) -> Dict[str, object]:
+        wall = self.wall_ns or sum(self.ns.values())
+        medido = sum(self.ns.values())
+        etapas_ = {
+            nombre: {"ns": ns, "llamadas": self.llamadas[nombre],
+                     "fraccion": ns / wall if wall else 0.0,
+                     "ns_por_llamada": ns / self.llamadas[nombre] if self.llamadas[nombre] else 0.0}
+            for nombre, ns in sorted(self.ns.items(), key=lambda e: -e[1])
+        }
+        return {
+            "backend": self.backend,
+            "n_nodos": self.n_nodos,
+            "n_pasos": self.n_pasos,
+            "wall_s": wall / 1e9,
+            "pasos_por_s": self.n_pasos / (wall / 1e9) if wall else 0.0,
+            "no_medido_s": max(0, wall - medido) / 1e9,
+            "etapas": etapas_,
+            "asignaciones": {"bloques_netos": self.bloques_netos, "pico_bytes": self.pico_bytes},
+        }
+
+    def exportar(self, ruta: str) -> None:
+        with open(ruta, "w", encoding="utf-8") as f:
+            json.dump(self.resumen(), f, indent=2, ensure_ascii=False)
+
+    def imprimir(self) -> None:
+        r = self.resumen()
+        print(f"\n==== Perfil ({r['backend']}) ====")
+        print(f"> Tiempo total: {r['wall_s']:.3f} s, {r['n_pasos']} pasos, {r['pasos_por_s']:.0f} pasos/s")
+        for nombre, e in r["etapas"].items():
+            print(f"> {nombre:14s} {e['ns'] / 1e6:10.2f} ms  {100 * e['fraccion']:5.1f} %  "
+                  f"({e['llamadas']} llamadas, {e['ns_por_llamada']:.0f} ns c/u)")
+        print(f"> Sin medir: {r['no_medido_s'] * 1e3:.2f} ms")
+        a = r["asignaciones"]
+        pico = f", pico {a['pico_bytes'] / 2**20:.1f} MiB" if a["pico_bytes"] is not None else ""
+        print(f"> Asignaciones: {a['bloques_netos']} bloques netos{pico}")
@@ -0,0 +1,207 @@
+# By: Johanna Olivera y Ailin Ferrari
+
+"""
+- Perfiles de potencia disipada por nodo como arrays ordenados de quiebres.
+- Fuentes: series de tiempo (CSV o arrays), tablas de modos (seguro/nominal/downlink)
+  con su línea de tiempo, o la escalera get_potencia_disipada_* de constants.py.
+- Búsqueda O(1) si los quiebres son uniformes y binaria (searchsorted) si no;
+  evaluación vectorizada sobre arrays de t, sin ramas de Python por paso.
+"""
+
+from __future__ import annotations
+import copy
+import csv
+import numpy as np
+from dataclasses import replace
+from typing import TYPE_CHECKING, Callable, Dict, List, Sequence, Tuple
+from constants import ORBITAL_PERIOD, POTENCIA_MODOS
+from bases import Base
+
+if TYPE_CHECKING:   # red_termica importa este módulo
+    from red_termica import RedTermica
+
+class PerfilPotencia(Base):
+    """
+    P(t) [W] definida por quiebres t_bordes (ordenados) y valores.
+
+    interpolacion='escalon': P = valores[k] en [t_bordes[k], t_bordes[k+1]).
+    interpolacion='lineal' : interpolación lineal entre quiebres.
+    Con `periodo` el perfil se repite (t mod periodo); sin él, antes del primer
+    quiebre y después del último se mantiene el valor extremo.
+    """
+
+    def __init__(self, t_bordes: Sequence[float], valores: Sequence[float],
+                 periodo: float = None, interpolacion: str = "escalon",
+                 nombre: str = "potencia"):
+        t_b = np.asarray(t_bordes, dtype=float)
+        v = np.asarray(valores, dtype=float)
+        if t_b.ndim != 1 or t_b.shape != v.shape or t_b.size == 0:
+            raise ValueError("t_bordes y valores deben ser arrays 1-D no vacíos del mismo largo")
+        if interpolacion not in ("escalon", "lineal"):
+            raise ValueError(f"interpolacion inválida: {interpolacion}")
+        orden = np.argsort(t_b, kind="stable")
+        t_b, v = t_b[orden], v[orden]
+        if periodo is not None:
+            t_b = np.mod(t_b, periodo)
+            orden = np.argsort(t_b, kind="stable")
+            t_b, v = t_b[orden], v[orden]
+
+        if interpolacion == "escalon":
+            # Quiebres redundantes (mismo valor que el anterior) no aportan nada
+            cambia = np.concatenate([[True], v[1:] != v[:-1]])
+            t_b, v = t_b[cambia], v[cambia]
+
+        self.nombre = nombre
+        self.t_bordes = t_b
+        self.valores = v
+        self.periodo = periodo
+        self.interpolacion = interpolacion
+
+        # Quiebres uniformes → índice aritmético en vez de búsqueda binaria
+        paso = np.diff(t_b)
+        self._uniforme = paso.size > 0 and np.allclose(paso, paso[0], rtol=1e-12, atol=0.0)
+        self._paso = float(paso[0]) if self._uniforme else 0.0
+
+        if interpolacion == "lineal":
+            self._t_saltos = t_b        # quiebres de pendiente
+        elif periodo is None or v[0] == v[-1]:
+            self._t_saltos = t_b[1:]    # en t_bordes[0] el valor no cambia (ni al dar la vuelta)
+        else:
+            self._t_saltos = t_b
+
+    def _indice(self, t: np.ndarray) -> np.ndarray:
+        if self._uniforme:
+            k = np.floor((t - self.t_bordes[0]) / self._paso).astype(np.intp)
+            return np.minimum(k, self.t_bordes.size - 1)
+        return np.searchsorted(self.t_bordes, t, side="right") - 1
+
+    def evaluar(self, t) -> np.ndarray:
+        t = np.asarray(t, dtype=float)
+        if self.periodo is not None:
+            t = np.mod(t, self.periodo)
+        if self.interpolacion == "lineal":
+            if self.periodo is not None:
+                return np.interp(t, self.t_bordes, self.valores, period=self.periodo)
+            return np.interp(t, self.t_bordes, self.valores)
+        k = self._indice(t)
+        # k = -1: antes del primer quiebre → último valor (periódico) o el primero
+        k = np.where(k < 0, self.t_bordes.size - 1 if self.periodo is not None else 0, k)
+        return self.valores[k]
+
+    def bordes(self, t0: float, t1: float) -> np.ndarray:
+        s = self._t_saltos
+        if s.size == 0:
+            return np.empty(0)
+        if self.periodo is None:
+            return s[np.searchsorted(s, t0, side="right"):np.searchsorted(s, t1, side="left")]
+        k = np.arange(np.floor(t0 / self.periodo), np.floor(t1 / self.periodo) + 1.0)
+        t = (k[:, None] * self.periodo + s[None, :]).ravel()
+        return t[(t > t0) & (t < t1)]
+
+    def energia(self, t0: float, t1: float) -> float:
+        """Energía disipada [J] entre t0 y t1 (exacta para escalón y lineal)."""
+        t = np.concatenate([[t0], self.bordes(t0, t1), [t1]])
+        dt = np.diff(t)
+        if self.interpolacion == "escalon":
+            return float(np.sum(self.evaluar(0.5 * (t[1:] + t[:-1])) * dt))
+        p = self.evaluar(t)
+        return float(np.sum(0.5 * (p[1:] + p[:-1]) * dt))
+
+# ----------------------------
+# Construcción
+# ----------------------------
+def desde_arrays(t: Sequence[float], p: Sequence[float], periodo: float = None,
+                 interpolacion: str = "escalon", nombre: str = "potencia") -> PerfilPotencia:
+    return PerfilPotencia(t, p, periodo=periodo, interpolacion=interpolacion, nombre=nombre)
+
+def desde_csv(ruta: str, col_t: int = 0, col_p: int = 1, periodo: float = None,
+              interpolacion: str = "escalon", delimitador: str = ",") -> PerfilPotencia:
+    """Serie t[s], P[W] desde CSV (se saltea una fila de encabezado si no es numérica)."""
+    with open(ruta, newline="") as fh:
+        primera = fh.readline()
+    try:
+        [float(x) for x in primera.split(delimitador)]
+        saltear = 0
+    except ValueError:
+        saltear = 1
+    datos = np.loadtxt(ruta, delimiter=delimitador, skiprows=saltear,
+                       usecols=(col_t, col_p), ndmin=2)
+    return PerfilPotencia(datos[:, 0], datos[:, 1], periodo=periodo,
+                          interpolacion=interpolacion, nombre=f"csv:{ruta}")
+
+def desde_escalera(get_potencia: Callable[[float, int], float], nodo: int,
+                   theta_bordes: Sequence[float], periodo: float = ORBITAL_PERIOD) -> PerfilPotencia:
+    """
+    Compila una escalera get_potencia(theta, nodo) a un perfil periódico:
+    se evalúa una sola vez en el punto medio de cada intervalo entre bordes.
+    Las escaleras de constants.py usan desigualdades estrictas (0 < θ < θ_p1),
+    así que en el ángulo exacto de un borde devuelven el valor por defecto (0 W);
+    el perfil toma ahí el valor del intervalo [borde, borde siguiente). Sólo
+    difieren en esos instantes aislados: la energía por órbita es la misma.
+    """
+    th = np.unique(np.concatenate([[0.0], np.mod(np.asarray(theta_bordes, dtype=float), 360.0)]))
+    medio = 0.5 * (th + np.append(th[1:], 360.0))
+    valores = [float(get_potencia(x, nodo)) for x in medio]
+    return PerfilPotencia(th / 360.0 * periodo, valores, periodo=periodo,
+                          nombre=f"potencia_{nodo}")
+
+def desde_modos(linea_tiempo: Sequence[Tuple[float, str]],
+                tabla: Dict[str, Dict[int, float]] = None,
+                periodo: float = None) -> Dict[int, PerfilPotencia]:
+    """
+    Línea de tiempo [(t_inicio[s], modo), ...] + tabla modo → {nodo: P[W]}
+    → {nodo: PerfilPotencia}. Nodos ausentes en un modo disipan 0 W.
+    """
+    tabla = POTENCIA_MODOS if tabla is None else tabla
+    faltan = {m for _, m in linea_tiempo} - set(tabla)
+    if faltan:
+        raise ValueError(f"Modos sin potencia definida: {sorted(faltan)}")
+    t = np.array([ti for ti, _ in linea_tiempo], dtype=float)
+    modos = [m for _, m in linea_tiempo]
+    nodos = sorted({nodo for m in set(modos) for nodo in tabla[m]})
+    return {
+        nodo: PerfilPotencia(t, [tabla[m].get(nodo, 0.0) for m in modos],
+                             periodo=periodo, nombre=f"potencia_{nodo}")
+        for nodo in nodos
+    }
+
+def leer_linea_modos(ruta: str) -> List[Tuple[float, str]]:
+    """CSV con columnas t[s], modo → [(t, modo), ...] (encabezado opcional)."""
+    linea: List[Tuple[float, str]] = []
+    with open(ruta, newline="") as fh:
+        for fila in csv.reader(fh):
+            if not fila or fila[0].strip().startswith("#"):
+                continue
+            try:
+                linea.append((float(fila[0]), fila[1].strip()))
+            except ValueError:
+                continue   # encabezado
+    return linea
+
+def perfiles_caso(props: dict, nodos: Sequence[int] = (12, 13)) -> Dict[int, PerfilPotencia]:
+    """Perfiles compilados de la escalera de get_propiedades_caso(caso)."""
+    return {nodo: desde_escalera(props["get_potencia"], nodo, props["theta_potencia"])
+            for nodo in nodos}
+
+# ----------------------------
+# Integración con la red
+# ----------------------------
+def aplicar_perfiles(red: RedTermica, perfiles: Dict[int, PerfilPotencia]) -> RedTermica:
+    """
+    Nueva red donde cada nodo de `perfiles` (1..n) disipa según su perfil;
+    reemplaza la base 'potencia_<nodo>' previa si existía.
+    """
+    quitar = {f"potencia_{nodo}" for nodo in perfiles}
+    keep = [k for k, b in enumerate(red.bases) if b.nombre not in quitar]
+    bases: List[Base] = [red.bases[k] for k in keep]
+    columnas = [red.A[:, keep]]
+    for nodo, perfil in perfiles.items():
+        if not 1 <= nodo <= red.n:
+            raise ValueError(f"Nodo fuera de rango: {nodo}")
+        perfil = copy.copy(perfil)   # el mismo perfil puede usarse en varios nodos o redes
+        perfil.nombre = f"potencia_{nodo}"
+        col = np.zeros((red.n, 1))
+        col[nodo - 1, 0] = 1.0
+        bases.append(perfil)
+        columnas.append(col)
+    return replace(red, A=np.hstack(columnas), bases=bases)
@@ -0,0 +1,132 @@
+# By: Johanna Olivera y Ailin Ferrari
+
+"""
+- Propiedades dependientes de la temperatura: cp(T), k(T) y ε(T) por nodo.
+- Las curvas (funciones o tablas de puntos) se muestrean una sola vez en una
+  grilla uniforme; en cada paso se interpola linealmente con índice aritmético
+  para todos los nodos y propiedades a la vez (costo constante, sin llamados
+  de Python por nodo ni por término).
+- La red usa factores adimensionales respecto del valor nominal de constants.py:
+  C_i(T) = C_i·f_cp,i(T_i)
+  G_ij(T) = G_ij·½(f_k,i(T_i) + f_k,j(T_j))
+  R_ij(T) = R_ij·f_εAl,i(T_i) (radiación interna) y R_i,esp·f_ε,i(T_i) (al espacio);
+  el IR planetario absorbido (bases 'ir') también se escala con f_ε,i(T_i).
+"""
+
+from __future__ import annotations
+import numpy as np
+from dataclasses import replace
+from typing import Callable, Dict, Sequence, Tuple, Union
+from constants import (
+    CP_PANEL, CP_CARA_Y, CP_BANDEJA, CP_OBC, CP_BAT, EPS_AL
+)
+from red_termica import RedTermica, NODES_SOLVE, N_EXTERNOS, opticas_externas
+
+Curva = Union[float, Callable[[np.ndarray], np.ndarray], Tuple[Sequence[float], Sequence[float]]]
+
+# Orden de las propiedades en la tabla apilada
+PROPIEDADES: Tuple[str, ...] = ("cp", "k", "eps_int", "eps_ext")
+
+CP_NODOS = np.array([CP_PANEL] * 8 + [CP_CARA_Y] * 2 + [CP_BANDEJA, CP_OBC, CP_BAT])
+
+GRUPOS: Dict[str, Tuple[int, ...]] = {
+    "paneles": tuple(range(1, 9)),
+    "caras_y": (9, 10),
+    "bandeja": (11,),
+    "obc": (12,),
+    "bateria": (13,),
+}
+
+class TablaUniforme:
+    """
+    m curvas muestreadas en la misma grilla uniforme T_min..T_max (n puntos).
+    evaluar(T) con T (m,) interpola cada curva en su propia temperatura;
+    fuera de rango se mantiene el valor del borde.
+    """
+
+    def __init__(self, valores: np.ndarray, T_min: float, T_max: float):
+        self.valores = np.ascontiguousarray(valores, dtype=float)   # (m, n)
+        self.T_min = float(T_min)
+        self.dT = (float(T_max) - self.T_min) / (self.valores.shape[1] - 1)
+        self._n = self.valores.shape[1]
+        # Tablas planas de valor y pendiente por celda: un solo gather por consulta
+        self._v0 = self.valores[:, :-1].ravel()
+        self._dv = np.diff(self.valores, axis=1).ravel()
+        self._offset = np.arange(self.valores.shape[0]) * (self._n - 1)
+
+    def evaluar(self, T: np.ndarray) -> np.ndarray:
+        x = (np.asarray(T, dtype=float) - self.T_min) / self.dT
+        i = np.clip(x.astype(np.intp), 0, self._n - 2)   # x < 0 también cae en la celda 0
+        w = np.clip(x - i, 0.0, 1.0)
+        c = self._offset + i
+        return self._v0[c] + w * self._dv[c]
+
+def muestrear(curva: Curva, grilla: np.ndarray) -> np.ndarray:
+    """Valores de una curva (constante, función de T o (T_pts, valores)) en la grilla."""
+    if callable(curva):
+        return np.broadcast_to(np.asarray(curva(grilla), dtype=float), grilla.shape).copy()
+    if isinstance(curva, tuple):
+        T_pts, vals = (np.asarray(c, dtype=float) for c in curva)
+        return np.interp(grilla, T_pts, vals)
+    return np.full(grilla.shape, float(curva))
+
+class PropiedadesT:
+    """Factores f(T) de cp, k, ε_Al (interna) y ε (externa) de los n nodos libres."""
+
+    def __init__(self, factores: np.ndarray, T_min: float, T_max: float):
+        # factores: (4, n, n_puntos) en el orden de PROPIEDADES
+        self.n = factores.shape[1]
+        self.tabla = TablaUniforme(factores.reshape(-1, factores.shape[2]), T_min, T_max)
+
+    def evaluar(self, T: np.ndarray) -> np.ndarray:
+        """(4, n) factores en las temperaturas T (n,) de los nodos libres."""
+        return self.tabla.evaluar(np.tile(T, len(PROPIEDADES))).reshape(len(PROPIEDADES), self.n)
+
+def _nodos(clave: Union[int, str]) -> Tuple[int, ...]:
+    if isinstance(clave, str):
+        if clave not in GRUPOS:
+            raise ValueError(f"Grupo desconocido: {clave}")
+        return GRUPOS[clave]
+    return (int(clave),)
+
+def propiedades_T(caso: str = "caliente",
+                  cp: Dict[Union[int, str], Curva] = None,
+                  k: Dict[Union[int, str], Curva] = None,
+                  eps: Dict[Union[int, str], Curva] = None,
+                  eps_al: Curva = None,
+                  T_ref: float = 293.15,
+                  T_min: float = 173.15, T_max: float = 373.15,
+                  n_puntos: int = 401) -> PropiedadesT:
+    """
+    Compila curvas del modelo de 13 nodos (claves: nodo 1..13 o grupo de GRUPOS).
+
+    cp     : cp(T) [J/kgK] absoluto; se divide por el CP_* nominal del nodo.
+    k      : k(T) de cualquier unidad; se normaliza con k(T_ref) (escala los G del nodo).
+    eps    : ε(T) de la superficie externa (nodos 1..10); se divide por el ε del caso.
+    eps_al : ε(T) del aluminio para la radiación interna; se divide por EPS_AL.
+    """
+    grilla = np.linspace(T_min, T_max, n_puntos)
+    f = np.ones((len(PROPIEDADES), NODES_SOLVE, n_puntos))
+    eps_nom, _, _ = opticas_externas(caso)
+
+    for clave, curva in (cp or {}).items():
+        for nodo in _nodos(clave):
+            f[0, nodo - 1] = muestrear(curva, grilla) / CP_NODOS[nodo - 1]
+    for clave, curva in (k or {}).items():
+        ref = muestrear(curva, np.array([T_ref]))[0]
+        for nodo in _nodos(clave):
+            f[1, nodo - 1] = muestrear(curva, grilla) / ref
+    if eps_al is not None:
+        f[2, :] = muestrear(eps_al, grilla) / EPS_AL
+    for clave, curva in (eps or {}).items():
+        for nodo in _nodos(clave):
+            if nodo > N_EXTERNOS:
+                raise ValueError(f"El nodo {nodo} no tiene superficie externa")
+            f[3, nodo - 1] = muestrear(curva, grilla) / eps_nom[nodo - 1]
+    return PropiedadesT(f, T_min, T_max)
+
+def aplicar_propiedades(red: RedTermica, prop: PropiedadesT) -> RedTermica:
+    """Red con propiedades dependientes de T (mismas matrices nominales)."""
+    if prop.n != red.n:
+        raise ValueError("Las propiedades no corresponden al número de nodos de la red")
+    return replace(red, prop_T=prop)
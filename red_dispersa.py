@@ -0,0 +1,189 @@
+# By: Johanna Olivera y Ailin Ferrari
+
+"""
+- Red térmica dispersa para modelos de cientos a decenas de miles de nodos
+  (mallas refinadas, decks importados): enlaces dirigidos (i, j, valor) en vez
+  de matrices densas, igual convención que RedTermica (fila i = flujo hacia i).
+- Flujos con np.bincount sobre la lista de enlaces: costo O(enlaces) por paso.
+- Integrador Euler linealmente implícito (Rosenbrock de una etapa, L-estable):
+  (I - dt·J) ΔT = dt·f(T_n, t_{n+1}), resuelto sin armar J con BiCGSTAB y
+  precondicionador de Jacobi; el paso no queda atado a la celda más chica.
+"""
+
+from __future__ import annotations
+import numpy as np
+from dataclasses import dataclass, field
+from typing import List, Sequence, Tuple
+from red_termica import Base, RedTermica
+from integrador import Resultado
+
+@dataclass
+class RedDispersa:
+    """
+    C (n,); enlaces conductivos G_ij = (gi, gj, g) y radiativos R_ij = (ri, rj, r)
+    entre nodos libres; enlaces al contorno (gci, gcj, gc) y (rci, rcj, rc), con j
+    índice en T_contorno (nb,); A (n, K) amplitudes de las bases. padre (n,)
+    asocia cada nodo a uno de origen.
+    """
+    nombres: List[str]
+    C: np.ndarray
+    gi: np.ndarray
+    gj: np.ndarray
+    g: np.ndarray
+    ri: np.ndarray
+    rj: np.ndarray
+    r: np.ndarray
+    gci: np.ndarray
+    gcj: np.ndarray
+    gc: np.ndarray
+    rci: np.ndarray
+    rcj: np.ndarray
+    rc: np.ndarray
+    T_contorno: np.ndarray
+    A: np.ndarray
+    bases: List[Base]
+    padre: np.ndarray = None
+    _gs: np.ndarray = field(init=False, repr=False)
+    _rs: np.ndarray = field(init=False, repr=False)
+    _q_contorno: np.ndarray = field(init=False, repr=False)
+
+    def __post_init__(self):
+        n = self.C.size
+        if self.padre is None:
+            self.padre = np.arange(n)
+        # Sumas de fila (enlaces + contorno) y término constante del contorno
+        self._gs = np.bincount(self.gi, self.g, n) + np.bincount(self.gci, self.gc, n)
+        self._rs = np.bincount(self.ri, self.r, n) + np.bincount(self.rci, self.rc, n)
+        self._q_contorno = (np.bincount(self.gci, self.gc * self.T_contorno[self.gcj], n)
+                            + np.bincount(self.rci, self.rc * self.T_contorno[self.rcj] ** 4, n))
+
+    @property
+    def n(self) -> int:
+        return self.C.size
+
+    @property
+    def n_enlaces(self) -> int:
+        return self.g.size + self.r.size
+
+    def cargas(self, t) -> np.ndarray:
+        b = np.stack([np.broadcast_to(base.evaluar(t), np.shape(t)) for base in self.bases])
+        return self.A @ b
+
+    def flujo_interno(self, T: np.ndarray) -> np.ndarray:
+        """Σ G(T_j - T_i) + Σ R(T_j⁴ - T_i⁴) con el contorno incluido [W]."""
+        n = self.n
+        T4 = T ** 4
+        return (np.bincount(self.gi, self.g * T[self.gj], n) + np.bincount(self.ri, self.r * T4[self.rj], n)
+                + self._q_contorno - self._gs * T - self._rs * T4)
+
+    def derivada(self, t: float, T: np.ndarray, q_ext: np.ndarray = None) -> np.ndarray:
+        if q_ext is None:
+            q_ext = self.cargas(t)
+        return (self.flujo_interno(T) + q_ext) / self.C
+
+    def jacobiano_por(self, T: np.ndarray, v: np.ndarray) -> np.ndarray:
+        """J·v sin armar J (conducción + radiación linealizada en T)."""
+        n = self.n
+        T3 = 4.0 * T ** 3
+        w = T3 * v
+        Jv = (np.bincount(self.gi, self.g * v[self.gj], n) + np.bincount(self.ri, self.r * w[self.rj], n)
+              - self._gs * v - self._rs * w)
+        return Jv / self.C
+
+    def diagonal_jacobiano(self, T: np.ndarray) -> np.ndarray:
+        return -(self._gs + 4.0 * self._rs * T ** 3) / self.C
+
+    def bordes(self, t0: float, t1: float) -> np.ndarray:
+        if not self.bases:
+            return np.empty(0)
+        return np.unique(np.concatenate([b.bordes(t0, t1) for b in self.bases]))
+
+def enlaces(M: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(i, j, M_ij) de los elementos no nulos de una matriz densa."""
+    i, j = np.nonzero(M)
+    return i, j, M[i, j]
+
+def desde_red(red: RedTermica) -> RedDispersa:
+    """Misma red en formato disperso (sin propiedades dependientes de T)."""
+    if red.prop_T is not None:
+        raise ValueError("RedDispersa no soporta propiedades dependientes de T")
+    n = red.n
+    return RedDispersa(list(red.nombres), red.C.copy(), *enlaces(red.G[:, :n]), *enlaces(red.R[:, :n]),
+                       *enlaces(red.G[:, n:]), *enlaces(red.R[:, n:]), red.T_contorno.copy(),
+                       red.A.copy(), list(red.bases))
+
+# ----------------------------
+# Solver
+# ----------------------------
+def bicgstab(matvec, b: np.ndarray, x0: np.ndarray, M_inv: np.ndarray,
+             tol: float = 1e-10, max_iter: int = 200) -> Tuple[np.ndarray, int]:
+    """
+    BiCGSTAB con precondicionador diagonal (M⁻¹ como vector). Devuelve (x, iteraciones).
+    ValueError si no llega a |r| ≤ tol·|b| en max_iter iteraciones o si el
+    método se rompe (ρ o r̂·v nulos, residuo no finito).
+    """
+    x = x0.copy()
+    r = b - matvec(x)
+    nb = np.linalg.norm(b)
+    if nb == 0.0:
+        return np.zeros_like(b), 0
+    if np.linalg.norm(r) <= tol * nb:
+        return x, 0
+    r0 = r.copy()
+    rho = alpha = omega = 1.0
+    v = p = np.zeros_like(b)
+    for it in range(1, max_iter + 1):
+        rho_n = r0 @ r
+        if rho_n == 0.0:
+            break
+        p = r + (rho_n / rho) * (alpha / omega) * (p - omega * v) if it > 1 else r.copy()
+        rho = rho_n
+        y = M_inv * p
+        v = matvec(y)
+        r0v = r0 @ v
+        if r0v == 0.0:
+            break
+        alpha = rho / r0v
+        s = r - alpha * v
+        z = M_inv * s
+        t = matvec(z)
+        omega = (t @ s) / (t @ t) if t @ t > 0 else 0.0
+        x = x + alpha * y + omega * z
+        r = s - omega * t
+        res = np.linalg.norm(r)
+        if res <= tol * nb:
+            return x, it
+        if omega == 0.0 or not np.isfinite(res):
+            break
+    raise ValueError(f"BiCGSTAB no convergió en {it} de {max_iter} iteraciones "
+                     f"(residuo relativo {np.linalg.norm(r) / nb:.2e}, tol {tol:.0e})")
+
+def integrar_implicito(red: RedDispersa, T0: np.ndarray, dt: float, t_total: float,
+                       nodos: Sequence[int] = None, cada: int = 1,
+                       tol: float = 1e-8, max_iter: int = 200) -> Resultado:
+    """
+    Euler linealmente implícito: T_{n+1} = T_n + ΔT con (I - dt·J(T_n)) ΔT = dt·f(T_n, t_{n+1}).
+    Guarda los nodos `nodos` (índices 0..n-1; todos por defecto) cada `cada` pasos.
+    n_evals cuenta productos J·v (la unidad de costo del solver). ValueError
+    si BiCGSTAB no converge en max_iter iteraciones en algún paso.
+    """
+    steps = int(t_total // dt)
+    t_axis = np.arange(steps) * dt
+    T = np.asarray(T0, dtype=float).copy()
+    sel = np.arange(red.n) if nodos is None else np.asarray(nodos, dtype=int)
+    idx_salida = np.arange(0, steps, cada)
+    temps = np.empty((sel.size, idx_salida.size))
+    temps[:, 0] = T[sel]
+
+    dT = np.zeros(red.n)
+    n_evals = 0
+    for p in range(1, steps):
+        f = dt * red.derivada(t_axis[p], T)
+        M_inv = 1.0 / (1.0 - dt * red.diagonal_jacobiano(T))
+        Tp = T
+        dT, it = bicgstab(lambda v: v - dt * red.jacobiano_por(Tp, v), f, dT, M_inv, tol, max_iter)
+        n_evals += 2 * it + 1
+        T = T + dT
+        if p % cada == 0:
+            temps[:, p // cada] = T[sel]
+    return Resultado(temps, t_axis[idx_salida], n_pasos=steps - 1, n_evals=n_evals)
@@ -0,0 +1,259 @@
+# By: Johanna Olivera y Ailin Ferrari
+
+"""
+- Red térmica nodal en forma matricial: capacidades, conductancias y radiación.
+- Mismo modelo que ecNodales_Caliente/Frio, evaluado para los 13 nodos de una vez.
+- Las cargas externas son combinación lineal de funciones base de t; cada base
+  informa sus discontinuidades para que el integrador pueda caer justo en ellas.
+"""
+
+from __future__ import annotations
+import numpy as np
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+from constants import (
+    SIGMA, T_VENUS, T_SPACE, SCV, GAMMA,
+    C_COND, F_VIEW, EPS_AL, ETA_ELEC, F_AEFF,
+    MASA_PANEL, CP_PANEL, AREA_PANEL,
+    MASA_CARA_Y, CP_CARA_Y, AREA_CARA_Y,
+    MASA_BANDEJA, CP_BANDEJA, AREA_BANDEJA,
+    MASA_OBC, CP_OBC, AREA_OBC,
+    MASA_BAT, CP_BAT, AREA_BAT,
+    THETA_C1, THETA_C2, THETA_C3, THETA_C4,
+    get_propiedades_caso, get_factor_planeta
+)
+from bases import Base, BaseAngular, bordes_angulares, theta_de_t
+from perfiles_potencia import aplicar_perfiles, perfiles_caso
+
+NODES_SOLVE: int = 13   # nodos 1..13 (libres)
+NODES_TOTAL: int = 15   # + Venus (14) + espacio (15)
+
+# ----------------------------
+# Funciones base de carga
+# ----------------------------
+def _constante(theta: np.ndarray) -> np.ndarray:
+    return np.ones_like(theta)
+
+def _solar(theta: np.ndarray) -> np.ndarray:
+    # Misma ventana y cosφ = -cos(θ) que _theta_mask_sol/_cos_phi de ecNodales
+    mask = ((THETA_C1 < theta) & (theta < THETA_C2)) | ((THETA_C3 < theta) & (theta < THETA_C4))
+    return np.where(mask, -np.cos(np.radians(theta)), 0.0)
+
+def _albedo(theta: np.ndarray) -> np.ndarray:
+    mask = ((0 < theta) & (theta < THETA_C1)) | ((THETA_C4 < theta) & (theta < 360))
+    return np.where(mask, np.cos(np.radians(theta)), 0.0)
+
+BASE_CONSTANTE = BaseAngular("constante", _constante)
+BASE_IR = BaseAngular("ir", _constante)
+BASE_SOLAR = BaseAngular("solar", _solar, (THETA_C1, THETA_C2, THETA_C3, THETA_C4))
+BASE_ALBEDO = BaseAngular("albedo", _albedo, (0, THETA_C1, THETA_C4))
+
+def absorbe_ir(base: Base) -> bool:
+    """Bases de IR planetario absorbido ('ir', 'ir_<cara>'): escalan con ε como la emisión."""
+    return base.nombre == "ir" or base.nombre.startswith("ir_")
+
+# ----------------------------
+# Red
+# ----------------------------
+@dataclass
+class RedTermica:
+    """
+    dT_i/dt = [ Σ_j G_ij (T_j - T_i) + Σ_j R_ij (T_j⁴ - T_i⁴) + Σ_k A_ik b_k(t) ] / C_i
+
+    Los primeros n nodos son libres; los restantes son de contorno (T fija).
+    G [W/K] y R [W/K⁴] tienen forma (n, n_total); A [W] tiene forma (n, K).
+    Con prop_T (propiedades_T.PropiedadesT) C, G y R se escalan con factores f(T),
+    y las cargas de las bases IR (absorbe_ir) con el mismo factor de ε externa.
+    """
+    nombres: List[str]
+    C: np.ndarray
+    G: np.ndarray
+    R: np.ndarray
+    T_contorno: np.ndarray
+    A: np.ndarray
+    bases: List[Base] = field(default_factory=list)
+    prop_T: object = None
+
+    def __post_init__(self) -> None:
+        self.g_sum = self.G.sum(axis=1)
+        self.r_sum = self.R.sum(axis=1)
+        self.R4_contorno = self.R[:, self.n:] @ (self.T_contorno ** 4)
+        self.r_sum_int = self.R[:, :self.n].sum(axis=1)
+        self.r_sum_ext = self.r_sum - self.r_sum_int
+        self.k_ir = [k for k, base in enumerate(self.bases) if absorbe_ir(base)]
+
+    @property
+    def n(self) -> int:
+        return self.C.size
+
+    def T_total(self, T: np.ndarray) -> np.ndarray:
+        """Agrega los nodos de contorno al vector de nodos libres."""
+        return np.concatenate([T, self.T_contorno])
+
+    def cargas(self, t) -> np.ndarray:
+        """Cargas externas [W]: (n,) para t escalar o (n, m) para t array."""
+        t = np.asarray(t, dtype=float)
+        b = np.stack([np.broadcast_to(base.evaluar(t), t.shape) for base in self.bases])
+        return np.tensordot(self.A, b, axes=(1, 0))
+
+    def cargas_ir(self, t) -> np.ndarray:
+        """Parte de cargas(t) que es IR planetario absorbido [W], con la misma forma."""
+        t = np.asarray(t, dtype=float)
+        if not self.k_ir:
+            return np.zeros((self.n,) + t.shape)
+        b = np.stack([np.broadcast_to(self.bases[k].evaluar(t), t.shape) for k in self.k_ir])
+        return np.tensordot(self.A[:, self.k_ir], b, axes=(1, 0))
+
+    def efectivas(self, T: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(C, G, R) evaluadas en T: las nominales, o escaladas por prop_T."""
+        if self.prop_T is None:
+            return self.C, self.G, self.R
+        n = self.n
+        f_cp, f_k, f_int, f_ext = self.prop_T.evaluar(T)
+        f_k_tot = np.concatenate([f_k, np.ones(self.T_contorno.size)])
+        G = self.G * (0.5 * (f_k[:, None] + f_k_tot[None, :]))
+        R = np.concatenate([self.R[:, :n] * f_int[:, None], self.R[:, n:] * f_ext[:, None]], axis=1)
+        return self.C * f_cp, G, R
+
+    def flujo_interno(self, T: np.ndarray, f: np.ndarray = None) -> np.ndarray:
+        """Conducción + radiación [W] sobre los nodos libres (f: factores de prop_T en T)."""
+        n = self.n
+        T4 = T ** 4
+        q_cond = self.G[:, :n] @ T + self.G[:, n:] @ self.T_contorno - self.g_sum * T
+        if self.prop_T is None:
+            q_rad = self.R[:, :n] @ T4 + self.R4_contorno - self.r_sum * T4
+            return q_cond + q_rad
+        if f is None:
+            f = self.prop_T.evaluar(T)
+        _, f_k, f_int, f_ext = f
+        # Σ_j G_ij·½(f_i + f_j)(T_j - T_i) sin armar la matriz escalada
+        f_k_tot = np.concatenate([f_k, np.ones(self.T_contorno.size)])
+        Tt = self.T_total(T)
+        q_cond_f = self.G @ (f_k_tot * Tt) - (self.G @ f_k_tot) * T
+        q_int = self.R[:, :n] @ T4 - self.r_sum_int * T4
+        q_ext = self.R4_contorno - self.r_sum_ext * T4
+        return 0.5 * (f_k * q_cond + q_cond_f) + f_int * q_int + f_ext * q_ext
+
+    def derivada(self, t: float, T: np.ndarray, q_ext: np.ndarray = None) -> np.ndarray:
+        """dT/dt [K/s] de los nodos libres (q_ext: cargas(t) nominales)."""
+        if q_ext is None:
+            q_ext = self.cargas(t)
+        if self.prop_T is None:
+            return (self.flujo_interno(T) + q_ext) / self.C
+        f = self.prop_T.evaluar(T)
+        if self.k_ir:
+            # Kirchhoff: el IR absorbido sigue a ε(T) igual que la emisión al espacio
+            q_ext = q_ext + (f[3] - 1.0) * self.cargas_ir(t)
+        return (self.flujo_interno(T, f) + q_ext) / (self.C * f[0])
+
+    def jacobiano(self, T: np.ndarray) -> np.ndarray:
+        """
+        ∂(dT/dt)/∂T de los nodos libres (conducción + radiación linealizada).
+        Con prop_T los factores se toman congelados en T (ROS2 tolera un J aproximado).
+        """
+        n = self.n
+        C, G, R = self.efectivas(T)
+        T3 = 4.0 * T ** 3
+        J = G[:, :n] + R[:, :n] * T3[None, :]
+        J[np.diag_indices(n)] -= G.sum(axis=1) + R.sum(axis=1) * T3
+        return J / C[:, None]
+
+    def bordes(self, t0: float, t1: float) -> np.ndarray:
+        """Todas las discontinuidades de carga en (t0, t1), ordenadas y sin repetir."""
+        if not self.bases:
+            return np.empty(0)
+        return np.unique(np.concatenate([b.bordes(t0, t1) for b in self.bases]))
+
+# ----------------------------
+# Armado del modelo de 13 nodos
+# ----------------------------
+AREAS_NODOS = np.array([AREA_PANEL] * 8 + [AREA_CARA_Y] * 2 + [AREA_BANDEJA, AREA_OBC, AREA_BAT])
+N_EXTERNOS: int = 10    # nodos 1..10 ven el exterior (paneles + caras Y±)
+
+def opticas_externas(caso: str = "caliente") -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    (eps, k_ir, k_abs) de los nodos 1..10 según el caso:
+    paneles SA con F_AEFF en IR y α·ETA_ELEC·F_AEFF en solar/albedo; caras Y± con coating.
+    """
+    props = get_propiedades_caso(caso)
+    eps = np.array([props["eps_sa"]] * 8 + [props["eps_wc"]] * 2)
+    k_ir = np.array([F_AEFF] * 8 + [1.0] * 2)
+    k_abs = np.array([props["alpha_s"] * ETA_ELEC * F_AEFF] * 8 + [props["alpha_wc"]] * 2)
+    return eps, k_ir, k_abs
+
+C_NODOS = np.array([MASA_PANEL * CP_PANEL] * 8 + [MASA_CARA_Y * CP_CARA_Y] * 2
+                   + [MASA_BANDEJA * CP_BANDEJA, MASA_OBC * CP_OBC, MASA_BAT * CP_BAT])
+F_PLANETA_NODOS = np.array([get_factor_planeta(i + 1) for i in range(N_EXTERNOS)])
+
+def parametros_caso(caso: str = "caliente") -> Dict[str, float]:
+    """Parámetros escalares del modelo para el caso (punto de partida de barridos)."""
+    props = get_propiedades_caso(caso)
+    return {
+        "eps_sa": props["eps_sa"], "alpha_s": props["alpha_s"],
+        "eps_wc": props["eps_wc"], "alpha_wc": props["alpha_wc"],
+        "eps_al": EPS_AL, "gamma": GAMMA, "scv": SCV, "T_venus": T_VENUS,
+        "cobertura": 1.0,
+    }
+
+def coeficientes_externos(eps_sa, alpha_s, eps_wc, alpha_wc,
+                          gamma=GAMMA, scv=SCV, T_venus=T_VENUS, cobertura=1.0
+                          ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    (r_esp [W/K⁴], a_ir, a_sol, a_alb [W]) de los nodos 1..10.
+    Acepta escalares o arrays (...,) y devuelve (..., 10): sirve igual para una
+    red que para un ensamble de miembros con parámetros distintos.
+    cobertura: fracción del área de los paneles (nodos 1..8) con celdas; el
+    resto lleva el mismo coating blanco que las caras Y±.
+    """
+    col = lambda x: np.asarray(x, dtype=float)[..., None]
+    es_sa = np.arange(N_EXTERNOS) < 8
+    areas = AREAS_NODOS[:N_EXTERNOS]
+    f = np.where(es_sa, col(cobertura), 0.0)
+    eps = f * col(eps_sa) + (1 - f) * col(eps_wc)
+    k_ir = f * F_AEFF + (1 - f)
+    k_abs = f * col(alpha_s) * ETA_ELEC * F_AEFF + (1 - f) * col(alpha_wc)
+    r_esp = eps * areas * SIGMA                                  # q_esp
+    a_ir = F_PLANETA_NODOS * r_esp * col(T_venus) ** 4 * k_ir    # q_ir
+    a_sol = col(scv) * areas * k_abs                             # q_sol
+    a_alb = F_PLANETA_NODOS * a_sol * col(gamma)                 # q_alb
+    return r_esp, a_ir, a_sol, a_alb
+
+def construir_red(caso: str = "caliente", **cambios: float) -> RedTermica:
+    """
+    Red de 13 nodos + Venus + espacio equivalente a ecNodales_<caso>.
+    `cambios` reemplaza valores de parametros_caso (p.ej. alpha_wc=0.3).
+    """
+    props = get_propiedades_caso(caso)
+    p = parametros_caso(caso)
+    desconocidos = set(cambios) - set(p)
+    if desconocidos:
+        raise ValueError(f"Parámetros desconocidos: {sorted(desconocidos)}")
+    p.update(cambios)
+
+    n = NODES_SOLVE
+    G = np.zeros((n, NODES_TOTAL))
+    G[:, :n] = C_COND
+    R = np.zeros((n, NODES_TOTAL))
+    R[:, :n] = p["eps_al"] * SIGMA * F_VIEW * AREAS_NODOS[:, None]
+
+    # Sin BASE_CONSTANTE: ningún nodo tiene carga fija (la agregan quienes la usan)
+    bases: List[Base] = [BASE_SOLAR, BASE_ALBEDO, BASE_IR]
+    A = np.zeros((n, len(bases)))
+    r_esp, a_ir, a_sol, a_alb = coeficientes_externos(
+        p["eps_sa"], p["alpha_s"], p["eps_wc"], p["alpha_wc"], p["gamma"], p["scv"], p["T_venus"],
+        p["cobertura"])
+    R[:N_EXTERNOS, NODES_TOTAL - 1] += r_esp
+    A[:N_EXTERNOS, 0] = a_sol
+    A[:N_EXTERNOS, 1] = a_alb
+    A[:N_EXTERNOS, 2] = a_ir
+
+    nombres = [f"Nodo {i + 1}" for i in range(n)] + ["Venus", "Espacio"]
+    red = RedTermica(nombres, C_NODOS.copy(), G, R, np.array([T_VENUS, T_SPACE], dtype=float), A, bases)
+
+    # Potencia disipada en OBC/AOCS (12) y batería/tanque (13): la escalera
+    # get_potencia se compila una vez a perfiles de quiebres
+    return aplicar_perfiles(red, perfiles_caso(props))
+
+def estado_inicial(caso: str = "caliente") -> np.ndarray:
+    """Temperaturas iniciales [K] de los nodos libres para el caso."""
+    return np.asarray(get_propiedades_caso(caso)["T_inicial"], dtype=float)[:NODES_SOLVE]
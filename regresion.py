@@ -0,0 +1,290 @@
+# By: Johanna Olivera y Ailin Ferrari
+
+"""
+- Comparación de regresión contra corridas doradas de los casos frío y
+  caliente (en vez de mirar los gráficos de plot_all_nodes a ojo).
+- Dorada compacta: T - T_REF cuantizada a RESOLUCION [K], diferenciada en el
+  tiempo y comprimida (.npz), más los extremos exactos de cada nodo.
+- Métricas por nodo: desvío máximo y RMS sobre una grilla común, diferencia
+  de Tmin/Tmax y de margen AFT (nodos 12 y 13).
+- Corridas con otro DT o integrador se remuestrean (interpolación lineal) a
+  la grilla más gruesa de las dos en el intervalo común.
+- Las historias se recorren por bloques de columnas: un .npy grande, o un
+  .npz sin comprimir (np.savez), se abre con mmap y nunca se carga entero;
+  un .npz comprimido sí se descomprime entero en memoria.
+- Los extremos se toman en la grilla nativa de cada corrida (sin recortar
+  picos al remuestrear).
+- main() devuelve 1 (código de salida) si se pasa alguna tolerancia.
+"""
+
+from __future__ import annotations
+import argparse
+import os
+import struct
+import sys
+import zipfile
+import numpy as np
+from dataclasses import dataclass
+from typing import Iterator, List, Tuple
+from constants import AFT_NODOS
+from ensamble import T_REF, margen_aft
+
+RESOLUCION: float = 1e-5     # [K] cuantización de la dorada
+BLOQUE: int = 8192           # columnas (instantes) por pasada
+DIR_DORADAS: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), "doradas")
+N_NODOS: int = 13            # se comparan los nodos 1..13
+
+@dataclass
+class Dorada:
+    """Historia de referencia (n, m) [K] en t (m,) [s], con extremos nativos (n,)."""
+    caso: str
+    integrador: str
+    temps: np.ndarray
+    t: np.ndarray
+    T_min: np.ndarray
+    T_max: np.ndarray
+
+@dataclass
+class Tolerancias:
+    """Desvíos admitidos [K]."""
+    max_K: float = 0.2
+    rms_K: float = 0.05
+    extremos_K: float = 0.1
+    margen_K: float = 0.1
+
+@dataclass
+class Comparacion:
+    """Métricas (n,) por nodo [K] y fallas contra las tolerancias."""
+    desvio_max: np.ndarray
+    desvio_rms: np.ndarray
+    delta_T_min: np.ndarray
+    delta_T_max: np.ndarray
+    delta_margen: np.ndarray   # (len(AFT_NODOS),)
+    n_comun: int
+    fallas: List[str]
+
+    @property
+    def ok(self) -> bool:
+        return not self.fallas
+
+def ruta_dorada(caso: str, directorio: str = DIR_DORADAS) -> str:
+    return os.path.join(directorio, f"dorada_{caso}.npz")
+
+# ----------------------------
+# Almacenamiento
+# ----------------------------
+def guardar_dorada(ruta: str, temps: np.ndarray, t: np.ndarray, caso: str, integrador: str) -> None:
+    """Guarda temps[:N_NODOS] en forma compacta (error ≤ RESOLUCION/2)."""
+    temps = np.asarray(temps, dtype=float)[:N_NODOS]
+    q = np.rint((temps - T_REF) / RESOLUCION).astype(np.int64)
+    dq = np.diff(q, axis=1, prepend=0)
+    if np.abs(dq).max() >= 2 ** 31:
+        raise ValueError("Salto entre instantes demasiado grande para la cuantización")
+    directorio = os.path.dirname(ruta)
+    if directorio:
+        os.makedirs(directorio, exist_ok=True)
+    tmp = ruta + ".tmp.npz"
+    np.savez_compressed(tmp, caso=caso, integrador=integrador, resolucion=RESOLUCION,
+                        dq=dq.astype(np.int32), t=np.asarray(t, dtype=float),
+                        T_min=temps.min(axis=1), T_max=temps.max(axis=1))
+    os.replace(tmp, ruta)
+
+def cargar_dorada(ruta: str) -> Dorada:
+    with np.load(ruta, allow_pickle=False) as f:
+        temps = T_REF + float(f["resolucion"]) * np.cumsum(f["dq"].astype(np.int64), axis=1)
+        return Dorada(str(f["caso"]), str(f["integrador"]), temps, f["t"],
+                      f["T_min"], f["T_max"])
+
+def miembro_npz(ruta: str, nombre: str) -> np.ndarray:
+    """
+    Arreglo `nombre` de un .npz: con mmap si el miembro está guardado sin
+    comprimir (np.savez); uno comprimido (np.savez_compressed) se carga entero.
+    """
+    with zipfile.ZipFile(ruta) as z:
+        info = z.getinfo(f"{nombre}.npy")
+    if info.compress_type != zipfile.ZIP_STORED:
+        with np.load(ruta, allow_pickle=False) as f:
+            return f[nombre]
+    with open(ruta, "rb") as f:
+        # Cabecera local del zip: 30 bytes + nombre + extra, y después el .npy
+        f.seek(info.header_offset + 26)
+        n_nombre, n_extra = struct.unpack("<HH", f.read(4))
+        f.seek(info.header_offset + 30 + n_nombre + n_extra)
+        version = np.lib.format.read_magic(f)
+        leer = np.lib.format.read_array_header_1_0 if version == (1, 0) else np.lib.format.read_array_header_2_0
+        forma, fortran, dtype = leer(f)
+        inicio = f.tell()
+    if dtype.hasobject:
+        raise ValueError(f"{ruta}: '{nombre}' no es un arreglo numérico")
+    return np.memmap(ruta, dtype=dtype, mode="r", offset=inicio, shape=forma, order="F" if fortran else "C")
+
+def abrir_historia(ruta: str, t: np.ndarray = None, dt: float = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (temps (n, m), t (m,)) de una corrida en disco: .npz con 'temps' y 't'
+    (ver miembro_npz), o .npy abierto con mmap (con t o dt; t = p·dt).
+    """
+    if ruta.endswith(".npz"):
+        return miembro_npz(ruta, "temps"), np.asarray(miembro_npz(ruta, "t"), dtype=float)
+    temps = np.load(ruta, mmap_mode="r")
+    if t is None:
+        if dt is None:
+            raise ValueError("Para un .npy hace falta t o dt")
+        t = np.arange(temps.shape[1]) * dt
+    t = np.asarray(t, dtype=float)
+    if t.size != temps.shape[1]:
+        raise ValueError(f"t tiene {t.size} instantes y la historia {temps.shape[1]}")
+    return temps, t
+
+# ----------------------------
+# Pasadas por bloques
+# ----------------------------
+def extremos(temps: np.ndarray, n: int = N_NODOS, bloque: int = BLOQUE) -> Tuple[np.ndarray, np.ndarray]:
+    """(T_min, T_max) (n,) en la grilla nativa, por bloques de columnas."""
+    T_min = np.full(n, np.inf)
+    T_max = np.full(n, -np.inf)
+    for a in range(0, temps.shape[1], bloque):
+        X = np.asarray(temps[:n, a:a + bloque], dtype=float)
+        np.minimum(T_min, X.min(axis=1), out=T_min)
+        np.maximum(T_max, X.max(axis=1), out=T_max)
+    return T_min, T_max
+
+def remuestrear(temps: np.ndarray, t: np.ndarray, t_nuevo: np.ndarray,
+                n: int = N_NODOS, bloque: int = BLOQUE) -> Iterator[np.ndarray]:
+    """
+    Bloques (n, k) de temps interpolada linealmente en t_nuevo (dentro de
+    [t[0], t[-1]]); de la historia sólo se leen las columnas que hacen falta.
+    """
+    ult = t.size - 1
+    for a in range(0, t_nuevo.size, bloque):
+        tb = t_nuevo[a:a + bloque]
+        i = np.clip(np.searchsorted(t, tb, side="right") - 1, 0, max(ult - 1, 0))
+        i0, i1 = i[0], min(i[-1] + 2, t.size)
+        X = np.asarray(temps[:n, i0:i1], dtype=float)
+        j = i - i0
+        if ult == 0:
+            yield np.repeat(X[:, :1], tb.size, axis=1)
+            continue
+        w = (tb - t[i]) / (t[i + 1] - t[i])
+        A, B = X[:, j], X[:, j + 1]
+        yield A + w * (B - A)
+
+def grilla_comun(t_a: np.ndarray, t_b: np.ndarray) -> np.ndarray:
+    """Instantes de la grilla más gruesa de las dos dentro del intervalo común."""
+    t0, t1 = max(t_a[0], t_b[0]), min(t_a[-1], t_b[-1])
+    if t1 < t0:
+        raise ValueError("Las corridas no se superponen en el tiempo")
+    en_a = t_a[(t_a >= t0) & (t_a <= t1)]
+    en_b = t_b[(t_b >= t0) & (t_b <= t1)]
+    return en_a if en_a.size <= en_b.size else en_b
+
+# ----------------------------
+# Comparación
+# ----------------------------
+def comparar(dorada: Dorada, temps: np.ndarray, t: np.ndarray,
+             tol: Tolerancias = Tolerancias(), bloque: int = BLOQUE) -> Comparacion:
+    """Compara una corrida (n ≥ N_NODOS, m) en t (m,) contra la dorada."""
+    t = np.asarray(t, dtype=float)
+    if np.any(np.diff(t) <= 0):
+        raise ValueError("t debe ser estrictamente creciente")
+    n = dorada.temps.shape[0]
+    if temps.shape[0] < n:
+        raise ValueError(f"La corrida tiene {temps.shape[0]} nodos y la dorada {n}")
+    tc = grilla_comun(dorada.t, t)
+
+    d_max = np.zeros(n)
+    d_cuad = np.zeros(n)
+    for D, X in zip(remuestrear(dorada.temps, dorada.t, tc, n, bloque),
+                    remuestrear(temps, t, tc, n, bloque)):
+        d = X - D
+        np.maximum(d_max, np.abs(d).max(axis=1), out=d_max)
+        d_cuad += (d * d).sum(axis=1)
+    d_rms = np.sqrt(d_cuad / tc.size)
+
+    # Extremos en la grilla nativa de cada corrida, dentro del intervalo común
+    def en_comun(t_x):
+        return np.searchsorted(t_x, tc[0], "left"), np.searchsorted(t_x, tc[-1], "right")
+    a, b = en_comun(t)
+    T_min, T_max = extremos(temps[:, a:b], n, bloque)
+    a, b = en_comun(dorada.t)
+    if a == 0 and b == dorada.t.size:
+        D_min, D_max = dorada.T_min, dorada.T_max
+    else:
+        D_min, D_max = extremos(dorada.temps[:, a:b], n, bloque)
+    d_min, d_max_T = T_min - D_min, T_max - D_max
+    d_margen = margen_aft(T_min, T_max) - margen_aft(D_min, D_max)
+
+    fallas = []
+    for nombre, valores, lim in (("desvío máx", d_max, tol.max_K), ("desvío RMS", d_rms, tol.rms_K),
+                                 ("ΔTmin", d_min, tol.extremos_K), ("ΔTmax", d_max_T, tol.extremos_K)):
+        for i in np.flatnonzero(np.abs(valores) > lim):
+            fallas.append(f"Nodo {i + 1}: {nombre} {valores[i]:+.4f} K (tol {lim} K)")
+    for nodo, dm in zip(AFT_NODOS, d_margen):
+        if abs(dm) > tol.margen_K:
+            fallas.append(f"Nodo {nodo}: Δmargen AFT {dm:+.4f} K (tol {tol.margen_K} K)")
+    return Comparacion(d_max, d_rms, d_min, d_max_T, d_margen, tc.size, fallas)
+
+def imprimir(c: Comparacion, titulo: str) -> None:
+    print(f"\n==== {titulo} ({c.n_comun} instantes en común) ====")
+    for i in range(c.desvio_max.size):
+        print(f"> Nodo {i + 1}: máx {c.desvio_max[i]:.4f} K  RMS {c.desvio_rms[i]:.4f} K  "
+              f"ΔTmin {c.delta_T_min[i]:+.4f} K  ΔTmax {c.delta_T_max[i]:+.4f} K")
+    for nodo, dm in zip(AFT_NODOS, c.delta_margen):
+        print(f"> Nodo {nodo}: Δmargen AFT {dm:+.4f} K")
+    print("> OK" if c.ok else "\n".join(["> FALLA"] + [f"  {f}" for f in c.fallas]))
+
+# ----------------------------
+# Main
+# ----------------------------
+def _correr(caso: str, integrador: str) -> Tuple[np.ndarray, np.ndarray]:
+    import simOrbital
+    _, ecs_mod = simOrbital.pick_case(caso)
+    return simOrbital.run(caso, ecs_mod, integrador)
+
+def main() -> int:
+    import simOrbital
+    ap = argparse.ArgumentParser(description="Regresión contra corridas doradas")
+    sub = ap.add_subparsers(dest="orden", required=True)
+    g = sub.add_parser("grabar", help="genera las doradas")
+    g.add_argument("--caso", choices=("frio", "caliente"), action="append")
+    g.add_argument("--integrador", choices=simOrbital.INTEGRADORES, default="euler")
+    c = sub.add_parser("comparar", help="compara una corrida con la dorada")
+    c.add_argument("--caso", choices=("frio", "caliente"), action="append")
+    c.add_argument("--integrador", choices=simOrbital.INTEGRADORES, default=simOrbital.INTEGRADOR)
+    c.add_argument("--historia", default=None, help=".npy (n, m) o .npz con temps y t (un solo caso)")
+    c.add_argument("--t", default=None, help=".npy con los instantes de --historia")
+    c.add_argument("--dt", type=float, default=None, help="paso de --historia si no hay --t")
+    for nombre, valor in vars(Tolerancias()).items():
+        c.add_argument(f"--tol-{nombre.replace('_K', '').replace('_', '-')}", dest=nombre,
+                       type=float, default=valor)
+    for p in (g, c):
+        p.add_argument("--dir", default=DIR_DORADAS)
+    args = ap.parse_args()
+    casos = args.caso or ["caliente", "frio"]
+
+    if args.orden == "grabar":
+        for caso in casos:
+            temps, t = _correr(caso, args.integrador)
+            ruta = ruta_dorada(caso, args.dir)
+            guardar_dorada(ruta, temps, t, caso, args.integrador)
+            print(f"> Dorada {caso} ({args.integrador}) en {ruta}: {os.path.getsize(ruta) / 1024:.0f} KiB")
+        return 0
+
+    if args.historia is not None and len(casos) != 1:
+        ap.error("--historia requiere un único --caso")
+    tol = Tolerancias(**{k: getattr(args, k) for k in vars(Tolerancias())})
+    codigo = 0
+    for caso in casos:
+        dorada = cargar_dorada(ruta_dorada(caso, args.dir))
+        if args.historia is not None:
+            temps, t = abrir_historia(args.historia, None if args.t is None else np.load(args.t), args.dt)
+            titulo = f"{caso}: {args.historia} vs dorada ({dorada.integrador})"
+        else:
+            temps, t = _correr(caso, args.integrador)
+            titulo = f"{caso}: {args.integrador} vs dorada ({dorada.integrador})"
+        res = comparar(dorada, temps, t, tol)
+        imprimir(res, titulo)
+        codigo = codigo or int(not res.ok)
+    return codigo
+
+if __name__ == "__main__":
+    sys.exit(main())
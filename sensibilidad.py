@@ -0,0 +1,245 @@
+# By: Johanna Olivera y Ailin Ferrari
+
+"""
+- Sensibilidad global (índices de Sobol de primer orden y totales) de los
+  extremos de los nodos 12 y 13 a las incertidumbres del modelo: ópticas,
+  GAMMA, SCV, T_VENUS, conductancias (escala_G) y disipación (escala_P).
+- Muestreo cuasi Monte Carlo: secuencia de Sobol con números de dirección de
+  Joe y Kuo (new-joe-kuo-6.21201, primeras MAX_DIM dimensiones) y matrices de
+  Saltelli A, B y AB_i (columna i de B): N·(d + 2) evaluaciones.
+- Las evaluaciones van en lotes de un ensamble (ensamble.py): órbita
+  periódica y extremos de la órbita siguiente para todos los miembros juntos.
+- Estimadores de Saltelli (2010) para S_i y de Jansen para S_Ti, con
+  intervalos de confianza por bootstrap. N se duplica (reusando los puntos ya
+  evaluados: la secuencia sigue donde quedó) hasta que el ancho de todos los
+  intervalos baja de la tolerancia o se llega a N_max.
+"""
+
+from __future__ import annotations
+import time
+import numpy as np
+from dataclasses import dataclass, field
+from typing import Dict, List, Mapping, Tuple
+from constants import ORBITAL_PERIOD
+from ensamble import ensamble_parametrico, estado_periodico, integrar_ensamble, parametros_ensamble
+from red_termica import estado_inicial
+
+# ----------------------------
+# Secuencia de Sobol
+# ----------------------------
+# (grado s, coeficientes a, m_1..m_s) de las dimensiones 2..MAX_DIM (Joe y Kuo)
+DIRECCIONES: Tuple[Tuple[int, int, Tuple[int, ...]], ...] = (
+    (1, 0, (1,)), (2, 1, (1, 3)), (3, 1, (1, 3, 1)), (3, 2, (1, 1, 1)),
+    (4, 1, (1, 1, 3, 3)), (4, 4, (1, 3, 5, 13)), (5, 2, (1, 1, 5, 5, 17)),
+    (5, 4, (1, 1, 5, 5, 5)), (5, 7, (1, 1, 7, 11, 19)), (5, 11, (1, 1, 5, 1, 1)),
+    (5, 13, (1, 1, 1, 3, 11)), (5, 14, (1, 3, 5, 5, 31)), (6, 1, (1, 3, 3, 9, 7, 49)),
+    (6, 13, (1, 1, 1, 15, 21, 21)), (6, 16, (1, 3, 1, 13, 27, 49)), (6, 19, (1, 1, 1, 15, 7, 5)),
+    (6, 22, (1, 3, 1, 15, 13, 25)), (6, 25, (1, 1, 5, 5, 19, 61)),
+    (7, 1, (1, 3, 7, 11, 23, 15, 103)), (7, 4, (1, 3, 7, 13, 13, 15, 69)),
+    (7, 7, (1, 1, 3, 13, 7, 35, 63)), (7, 8, (1, 3, 5, 9, 1, 25, 53)),
+    (7, 14, (1, 3, 1, 13, 9, 35, 107)), (7, 19, (1, 3, 1, 5, 27, 61, 31)),
+    (7, 21, (1, 1, 5, 11, 19, 41, 61)), (7, 28, (1, 3, 5, 3, 3, 13, 69)),
+    (7, 31, (1, 1, 7, 13, 1, 19, 1)), (7, 32, (1, 3, 7, 5, 13, 19, 59)),
+    (7, 37, (1, 1, 3, 9, 25, 29, 41)), (7, 41, (1, 3, 5, 13, 23, 1, 55)),
+    (7, 42, (1, 3, 7, 3, 13, 59, 17)), (7, 50, (1, 3, 1, 3, 5, 53, 69)),
+    (7, 55, (1, 1, 5, 5, 23, 33, 13)), (7, 56, (1, 1, 7, 7, 1, 61, 123)),
+    (7, 59, (1, 1, 7, 9, 13, 61, 49)), (7, 62, (1, 3, 3, 5, 3, 55, 33)),
+    (8, 14, (1, 3, 1, 15, 31, 13, 49, 245)), (8, 21, (1, 3, 5, 15, 31, 59, 63, 97)),
+    (8, 22, (1, 3, 1, 11, 11, 11, 77, 249)),
+)
+MAX_DIM: int = len(DIRECCIONES) + 1
+BITS: int = 32
+
+def _numeros_direccion(d: int) -> np.ndarray:
+    """V (d, BITS) enteros de dirección ya corridos a BITS bits."""
+    if not 1 <= d <= MAX_DIM:
+        raise ValueError(f"La secuencia de Sobol soporta de 1 a {MAX_DIM} dimensiones")
+    V = np.zeros((d, BITS), dtype=np.uint64)
+    V[0] = [1 << (BITS - 1 - k) for k in range(BITS)]
+    for j in range(1, d):
+        s, a, m = DIRECCIONES[j - 1]
+        v = [m_k << (BITS - 1 - k) for k, m_k in enumerate(m)]
+        for k in range(s, BITS):
+            x = v[k - s] ^ (v[k - s] >> s)
+            for l in range(1, s):
+                if (a >> (s - 1 - l)) & 1:
+                    x ^= v[k - l]
+            v.append(x)
+        V[j] = v[:BITS]
+    return V
+
+def sobol(d: int, inicio: int, N: int) -> np.ndarray:
+    """Puntos inicio..inicio+N-1 (N, d) en [0, 1) de la secuencia de Sobol (sin aleatorizar)."""
+    if inicio < 0 or N < 0 or inicio + N > 2 ** BITS:
+        raise ValueError("Índices fuera del rango de la secuencia")
+    V = _numeros_direccion(d)
+    i = np.arange(inicio, inicio + N, dtype=np.uint64)
+    gray = i ^ (i >> np.uint64(1))
+    X = np.zeros((N, d), dtype=np.uint64)
+    for k in range(BITS):
+        bit = ((gray >> np.uint64(k)) & np.uint64(1)).astype(bool)
+        X[bit] ^= V[:, k]
+    return X.astype(float) / 2.0 ** BITS
+
+def matrices_saltelli(U: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """A, B (N, d) y AB (d, N, d) a partir de puntos U (N, 2d)."""
+    d = U.shape[1] // 2
+    A, B = U[:, :d], U[:, d:]
+    AB = np.repeat(A[None], d, axis=0)
+    for i in range(d):
+        AB[i, :, i] = B[:, i]
+    return A, B, AB
+
+# ----------------------------
+# Estimadores
+# ----------------------------
+def indices_sobol(fA: np.ndarray, fB: np.ndarray, fAB: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (S1, ST) (..., d, k) a partir de fA, fB (..., N, k) y fAB (d, ..., N, k).
+    Las salidas se centran antes (temperaturas ~300 K con dispersión de pocos
+    K: sin centrar, la varianza del estimador de S1 se dispara). Salidas con
+    varianza nula dan índices 0.
+    """
+    f = np.concatenate([fA, fB], axis=-2)
+    media = f.mean(axis=-2, keepdims=True)
+    V = f.var(axis=-2)
+    V_seguro = np.where(V > 0, V, 1.0)
+    S1 = np.mean((fB - media) * (fAB - fA), axis=-2) / V_seguro
+    ST = 0.5 * np.mean((fA - fAB) ** 2, axis=-2) / V_seguro
+    S1, ST = np.where(V > 0, S1, 0.0), np.where(V > 0, ST, 0.0)
+    return np.moveaxis(S1, 0, -2), np.moveaxis(ST, 0, -2)
+
+def bootstrap(fA: np.ndarray, fB: np.ndarray, fAB: np.ndarray, n_boot: int = 500,
+              confianza: float = 0.95, rng: np.random.Generator = None
+              ) -> Tuple[np.ndarray, np.ndarray]:
+    """Intervalos percentiles (2, d, k) de S1 y ST remuestreando filas de las matrices."""
+    rng = np.random.default_rng(0) if rng is None else rng
+    N = fA.shape[0]
+    d = fAB.shape[0]
+    S1 = np.empty((n_boot, d, fA.shape[1]))
+    ST = np.empty_like(S1)
+    for b0 in range(0, n_boot, 50):
+        idx = rng.integers(0, N, (min(50, n_boot - b0), N))
+        S1[b0:b0 + idx.shape[0]], ST[b0:b0 + idx.shape[0]] = indices_sobol(fA[idx], fB[idx], fAB[:, idx])
+    q = 50.0 * (1.0 - confianza)
+    return np.percentile(S1, [q, 100.0 - q], axis=0), np.percentile(ST, [q, 100.0 - q], axis=0)
+
+# ----------------------------
+# Modelo
+# ----------------------------
+# Semiancho relativo de la incertidumbre (uniforme alrededor del valor nominal del caso)
+INCERTIDUMBRES: Dict[str, float] = {
+    "eps_sa": 0.05, "alpha_s": 0.05, "eps_wc": 0.05, "alpha_wc": 0.10, "eps_al": 0.10,
+    "gamma": 0.10, "scv": 0.02, "T_venus": 0.02, "escala_G": 0.20, "escala_P": 0.10,
+}
+
+# (nodo, 'min'|'max') de las salidas
+SALIDAS: Tuple[Tuple[int, str], ...] = ((12, "min"), (12, "max"), (13, "min"), (13, "max"))
+
+def limites(caso: str, incertidumbres: Mapping[str, float] = INCERTIDUMBRES) -> Dict[str, Tuple[float, float]]:
+    """{nombre: (lo, hi)} alrededor de los valores nominales de parametros_ensamble(caso)."""
+    p = parametros_ensamble(caso)
+    desconocidos = set(incertidumbres) - set(p)
+    if desconocidos:
+        raise ValueError(f"Parámetros desconocidos: {sorted(desconocidos)}")
+    return {k: (p[k] * (1.0 - r), p[k] * (1.0 + r)) for k, r in incertidumbres.items()}
+
+def evaluar(caso: str, valores: Mapping[str, np.ndarray], dt: float = 1.0,
+            periodico: bool = True, tol_periodico: float = 0.05, lote: int = 1024) -> np.ndarray:
+    """
+    Extremos (m, len(SALIDAS)) [K] de cada juego de parámetros (arrays (m,)),
+    en lotes de hasta `lote` miembros. periodico=False usa la primera órbita
+    desde T_inicial, como simulate.
+    """
+    m = len(next(iter(valores.values())))
+    salida = np.empty((m, len(SALIDAS)))
+    idx = np.array([nodo - 1 for nodo, _ in SALIDAS])
+    es_max = np.array([tipo == "max" for _, tipo in SALIDAS])
+    for a in range(0, m, lote):
+        v = {k: np.asarray(x, dtype=float)[a:a + lote] for k, x in valores.items()}
+        N = len(next(iter(v.values())))
+        ens = ensamble_parametrico(caso, N, **v)
+        T0 = np.tile(estado_inicial(caso), (N, 1))
+        if periodico:
+            T0, _ = estado_periodico(ens, T0, dt, ORBITAL_PERIOD, tol_periodico)
+        r = integrar_ensamble(ens, T0, dt, ORBITAL_PERIOD)
+        salida[a:a + N] = np.where(es_max, r.T_max[:, idx], r.T_min[:, idx])
+    return salida
+
+@dataclass
+class ResultadoSobol:
+    """Índices (d, k) con intervalos (2, d, k); filas = parámetros, columnas = SALIDAS."""
+    nombres: List[str]
+    S1: np.ndarray
+    ST: np.ndarray
+    S1_ic: np.ndarray
+    ST_ic: np.ndarray
+    N: int
+    n_evals: int
+    convergio: bool
+    historial: List[Tuple[int, float]] = field(default_factory=list)   # (N, semiancho máx)
+
+def analizar(caso: str, incertidumbres: Mapping[str, float] = INCERTIDUMBRES,
+             N0: int = 64, N_max: int = 2048, tol: float = 0.05, n_boot: int = 500,
+             dt: float = 1.0, periodico: bool = True, lote: int = 1024,
+             semilla: int = 0, verbose: bool = False) -> ResultadoSobol:
+    """
+    Índices de Sobol de las SALIDAS del caso. N (potencia de 2) se duplica
+    desde N0 hasta que el semiancho de todos los intervalos es ≤ tol o N = N_max.
+
+    Costo: N·(d + 2) órbitas (~14 ms cada una con dt = 1 s y periodico=True;
+    duplicar N no reevalúa los puntos anteriores). El semiancho baja como
+    ~1.3/√N en caliente y ~1.7/√N en frío, así que con los valores por
+    defecto (d = 10, tol = 0.05) caliente converge en N = 1024 (12288
+    órbitas, ~3 min) y frío recién en N = 2048 (24576 órbitas, ~7 min). Con
+    N0 ≥ 512 se saltean los bootstraps intermedios, que no llegan a tol.
+    """
+    if N0 < 2 or N0 & (N0 - 1) or N_max < N0:
+        raise ValueError("N0 debe ser potencia de 2 (≥ 2) y N_max ≥ N0")
+    lim = limites(caso, incertidumbres)
+    nombres = list(lim)
+    d = len(nombres)
+    lo, hi = np.array([lim[k] for k in nombres]).T
+    rng = np.random.default_rng(semilla)
+
+    fA = fB = fAB = None
+    N, nuevos = 0, N0
+    historial: List[Tuple[int, float]] = []
+    while True:
+        # Desde el punto 1: el 0 (todo ceros) y el 1 (todo 0.5) dan filas A = B
+        A, B, AB = matrices_saltelli(sobol(2 * d, 1 + N, nuevos))
+        P = lo + (hi - lo) * np.concatenate([A, B, AB.reshape(-1, d)])
+        Y = evaluar(caso, {k: P[:, i] for i, k in enumerate(nombres)}, dt, periodico, lote=lote)
+        Y = Y.reshape(d + 2, nuevos, -1)
+        fA = Y[0] if fA is None else np.concatenate([fA, Y[0]])
+        fB = Y[1] if fB is None else np.concatenate([fB, Y[1]])
+        fAB = Y[2:] if fAB is None else np.concatenate([fAB, Y[2:]], axis=1)
+        N += nuevos
+
+        S1, ST = indices_sobol(fA, fB, fAB)
+        S1_ic, ST_ic = bootstrap(fA, fB, fAB, n_boot, rng=rng)
+        semiancho = 0.5 * max((S1_ic[1] - S1_ic[0]).max(), (ST_ic[1] - ST_ic[0]).max())
+        historial.append((N, float(semiancho)))
+        if verbose:
+            print(f"> N = {N:5d} ({N * (d + 2)} evaluaciones): semiancho máx {semiancho:.4f}")
+        if semiancho <= tol or N >= N_max:
+            break
+        nuevos = min(N, N_max - N)
+
+    return ResultadoSobol(nombres, S1, ST, S1_ic, ST_ic, N, N * (d + 2), semiancho <= tol, historial)
+
+def main() -> None:
+    for caso in ("caliente", "frio"):
+        print(f"\n==== Caso {caso} ====")
+        t0 = time.perf_counter()
+        r = analizar(caso, verbose=True)
+        print(f"> {r.n_evals} evaluaciones en {time.perf_counter() - t0:.1f} s"
+              f"{'' if r.convergio else ' (sin converger)'}")
+        for j, (nodo, tipo) in enumerate(SALIDAS):
+            print(f"\n  Nodo {nodo} T{tipo}:      S1                 ST")
+            for i in np.argsort(-r.ST[:, j]):
+                print(f"  {r.nombres[i]:9s} {r.S1[i, j]:6.3f} [{r.S1_ic[0, i, j]:6.3f}, {r.S1_ic[1, i, j]:6.3f}]"
+                      f"  {r.ST[i, j]:6.3f} [{r.ST_ic[0, i, j]:6.3f}, {r.ST_ic[1, i, j]:6.3f}]")
+
+if __name__ == "__main__":
+    main()
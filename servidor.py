@@ -0,0 +1,410 @@
+# By: Johanna Olivera y Ailin Ferrari
+
+"""
+- Servicio local de simulación (asyncio, HTTP/1.1 sobre TCP o socket Unix)
+  para que notebooks y tableros compartan un único proceso caliente.
+- POST /simular con el caso en JSON; la respuesta es NDJSON en streaming
+  mientras el ensamble integra: 'inicio', bloques 'temps' de la historia
+  intercalados con un 'evento' por cada salida de ventana AFT (nodos 12/13)
+  apenas termina, y 'fin' con extremos y márgenes AFT ('error' si falla).
+  Solicitudes mal formadas reciben 400.
+- Las solicitudes concurrentes con igual (caso, dt, t_total, dtype,
+  historia_cada) que llegan dentro de una ventana corta se juntan en un solo
+  ensamble (ensamble.integrar_ensamble) y se integran en un único paso por lote.
+- Resultados en caché LRU por solicitud normalizada; dos pedidos idénticos en
+  vuelo comparten el mismo cálculo.
+- GET /estado devuelve contadores (solicitudes, lotes, aciertos de caché).
+
+Solicitud:
+    {"caso": "caliente", "parametros": {"eps_wc": 0.1, "escala_P": 1.2},
+     "dt": 1.0, "t_total": 6000.0, "dtype": "float64", "historia_cada": 10}
+"""
+
+from __future__ import annotations
+import argparse
+import asyncio
+import http.client
+import json
+import socket
+import numpy as np
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Callable, Dict, Iterator, List, Tuple
+from constants import AFT_NODOS
+from red_termica import NODES_SOLVE, NODES_TOTAL, estado_inicial
+from ensamble import parametros_ensamble, ensamble_parametrico, integrar_ensamble, margen_aft
+
+HOST: str = "127.0.0.1"
+PUERTO: int = 8765
+VENTANA_S: float = 0.02       # espera para juntar solicitudes en un lote [s]
+MAX_MIEMBROS: int = 1024      # tamaño máximo de un lote
+TAM_CACHE: int = 256          # resultados guardados
+BLOQUE: int = 500             # muestras por bloque 'temps'
+MAX_CUERPO: int = 1 << 20     # tamaño máximo del cuerpo de una solicitud [bytes]
+
+DEFECTOS = {"dt": 1.0, "t_total": 6000.0, "dtype": "float64", "historia_cada": 10}
+
+# ----------------------------
+# Solicitudes y eventos AFT
+# ----------------------------
+def normalizar(solicitud: Dict) -> Tuple[Tuple, Dict[str, float], str]:
+    """
+    Valida la solicitud y devuelve (clave de lote, parámetros del miembro, clave de caché).
+    ValueError si el caso, los parámetros o las opciones no son válidos.
+    """
+    if not isinstance(solicitud, dict):
+        raise ValueError("La solicitud debe ser un objeto JSON")
+    desconocidas = set(solicitud) - {"caso", "parametros"} - set(DEFECTOS)
+    if desconocidas:
+        raise ValueError(f"Campos desconocidos: {sorted(desconocidas)}")
+    caso = solicitud.get("caso", "caliente")
+    if caso not in ("caliente", "frio"):
+        raise ValueError(f"Caso desconocido: {caso}")
+    opciones = {k: solicitud.get(k, v) for k, v in DEFECTOS.items()}
+    dt, t_total = float(opciones["dt"]), float(opciones["t_total"])
+    historia_cada = int(opciones["historia_cada"])
+    if opciones["dtype"] not in ("float64", "float32"):
+        raise ValueError(f"dtype debe ser float64 o float32, no {opciones['dtype']}")
+    if not (0 < dt <= t_total < np.inf and historia_cada >= 1):
+        raise ValueError("Se requiere 0 < dt ≤ t_total finito e historia_cada ≥ 1")
+
+    validos = set(parametros_ensamble(caso))
+    crudos = solicitud.get("parametros") or {}
+    if not isinstance(crudos, dict):
+        raise ValueError("'parametros' debe ser un objeto JSON")
+    parametros = {k: float(v) for k, v in crudos.items()}
+    if set(parametros) - validos:
+        raise ValueError(f"Parámetros desconocidos: {sorted(set(parametros) - validos)}")
+
+    clave_lote = (caso, dt, t_total, opciones["dtype"], historia_cada)
+    texto = json.dumps([clave_lote, sorted(parametros.items())])
+    return clave_lote, parametros, texto
+
+def eventos_aft(historia: np.ndarray, t: np.ndarray) -> List[Dict[str, object]]:
+    """Intervalos en que los nodos de AFT_NODOS salen de su ventana, ordenados por inicio."""
+    eventos = []
+    for nodo, (T_lo, T_hi) in AFT_NODOS.items():
+        T = historia[nodo - 1]
+        for tipo, fuera, limite in (("bajo_min", T < T_lo, T_lo), ("sobre_max", T > T_hi, T_hi)):
+            cambios = np.diff(np.concatenate([[0], fuera.astype(np.int8), [0]]))
+            for i0, i1 in zip(np.flatnonzero(cambios == 1), np.flatnonzero(cambios == -1)):
+                tramo = T[i0:i1]
+                eventos.append({
+                    "tipo": "evento", "nodo": nodo, "evento": tipo, "limite": limite,
+                    "t_inicio": float(t[i0]), "t_fin": float(t[i1 - 1]),
+                    "T_extremo": float(tramo.min() if tipo == "bajo_min" else tramo.max()),
+                })
+    return sorted(eventos, key=lambda e: e["t_inicio"])
+
+def margenes_aft(T_min: np.ndarray, T_max: np.ndarray) -> Dict[str, float]:
+    """Margen mínimo a la ventana AFT por nodo [K] (negativo = fuera)."""
+    return {str(nodo): float(m) for nodo, m in zip(AFT_NODOS, margen_aft(T_min, T_max))}
+
+def eje_historia(clave: Tuple) -> np.ndarray:
+    """Instantes [s] de las muestras de historia que produce un lote con esta clave."""
+    _, dt, t_total, _, historia_cada = clave
+    return np.arange(int(t_total // dt))[::historia_cada] * dt
+
+# ----------------------------
+# Corridas
+# ----------------------------
+class Corrida:
+    """
+    Mensajes NDJSON de una solicitud, agregados a medida que avanza su lote.
+    Varios lectores (pedidos en vuelo o desde la caché) recorren la misma lista.
+    """
+
+    def __init__(self, t: np.ndarray, n_total: int):
+        self.t = t
+        self.historia = np.empty((n_total, t.size))
+        self.mensajes: List[Dict[str, object]] = []
+        self.terminada = False
+        self.error: Exception = None
+        self._aviso = asyncio.get_running_loop().create_future()
+        self._desde = 0               # primera muestra de un evento AFT todavía abierto
+        self._emitidos = set()
+
+    def _avisar(self) -> None:
+        self._aviso.set_result(None)
+        self._aviso = asyncio.get_running_loop().create_future()
+
+    def _eventos(self, hasta: int, final: bool) -> None:
+        """Emite los eventos AFT cerrados en [_desde, hasta); los abiertos esperan al próximo bloque."""
+        siguiente = hasta
+        for e in eventos_aft(self.historia[:, self._desde:hasta], self.t[self._desde:hasta]):
+            clave = (e["nodo"], e["evento"], e["t_inicio"])
+            if not final and e["t_fin"] == self.t[hasta - 1]:
+                siguiente = min(siguiente, int(np.searchsorted(self.t, e["t_inicio"])))
+            elif clave not in self._emitidos:
+                self._emitidos.add(clave)
+                self.mensajes.append(e)
+        self._desde = siguiente
+
+    def agregar(self, i0: int, i1: int, bloque: np.ndarray) -> None:
+        """Muestras [i0, i1) de la historia (n_total, i1 - i0) [K]."""
+        self.historia[:, i0:i1] = bloque
+        self.mensajes.append({"tipo": "temps", "t": self.t[i0:i1].tolist(), "T": bloque.tolist()})
+        self._eventos(i1, final=False)
+        self._avisar()
+
+    def terminar(self, T_min: np.ndarray, T_max: np.ndarray) -> None:
+        self._eventos(self.t.size, final=True)
+        self.mensajes.append({"tipo": "fin", "T_min": T_min[:NODES_SOLVE].tolist(),
+                              "T_max": T_max[:NODES_SOLVE].tolist(),
+                              "margen_aft": margenes_aft(T_min, T_max)})
+        self.terminada = True
+        self._avisar()
+
+    def fallar(self, error: Exception) -> None:
+        self.error = error
+        self.mensajes.append({"tipo": "error", "error": str(error)})
+        self.terminada = True
+        self._avisar()
+
+    async def leer(self) -> AsyncIterator[Dict[str, object]]:
+        """Mensajes desde el primero; espera los que faltan hasta 'fin' o 'error'."""
+        i = 0
+        while True:
+            while i < len(self.mensajes):
+                yield self.mensajes[i]
+                i += 1
+            if self.terminada:
+                return
+            await asyncio.shield(self._aviso)
+
+# ----------------------------
+# Lotes
+# ----------------------------
+class Lotes:
+    """Junta miembros con la misma clave durante ventana_s y los integra como un ensamble."""
+
+    def __init__(self, ejecutor: ThreadPoolExecutor, ventana_s: float = VENTANA_S,
+                 max_miembros: int = MAX_MIEMBROS):
+        self.ejecutor = ejecutor
+        self.ventana_s = ventana_s
+        self.max_miembros = max_miembros
+        self._pendientes: Dict[Tuple, List[Tuple[Dict[str, float], Corrida]]] = {}
+        self._temporizadores: Dict[Tuple, asyncio.TimerHandle] = {}
+        self.n_lotes = 0
+        self.n_miembros = 0
+
+    def enviar(self, clave: Tuple, parametros: Dict[str, float], corrida: Corrida) -> None:
+        """Suma el miembro al lote de `clave`; sus resultados llegan a `corrida`."""
+        lote = self._pendientes.setdefault(clave, [])
+        lote.append((parametros, corrida))
+        if len(lote) == 1:
+            self._temporizadores[clave] = asyncio.get_running_loop().call_later(
+                self.ventana_s, self._despachar, clave)
+        elif len(lote) >= self.max_miembros:
+            self._despachar(clave)
+
+    def _despachar(self, clave: Tuple) -> None:
+        temporizador = self._temporizadores.pop(clave, None)
+        if temporizador is not None:
+            temporizador.cancel()
+        lote = self._pendientes.pop(clave, None)
+        if lote:
+            asyncio.ensure_future(self._correr(clave, lote))
+
+    def _repartir(self, lote: List[Tuple[Dict[str, float], Corrida]], i0: int, i1: int,
+                  bloque: np.ndarray) -> None:
+        for i, (_, corrida) in enumerate(lote):
+            corrida.agregar(i0, i1, bloque[i])
+
+    async def _correr(self, clave: Tuple, lote: List[Tuple[Dict[str, float], Corrida]]) -> None:
+        self.n_lotes += 1
+        self.n_miembros += len(lote)
+        loop = asyncio.get_running_loop()
+        enviadas = 0
+
+        def al_avanzar(historia: np.ndarray, columnas: int) -> None:
+            # Hilo del integrador: copia las columnas nuevas y las pasa al bucle por bloques
+            nonlocal enviadas
+            if columnas - enviadas >= BLOQUE or columnas == historia.shape[-1]:
+                bloque = historia[:, :, enviadas:columnas].astype(float)
+                loop.call_soon_threadsafe(self._repartir, lote, enviadas, columnas, bloque)
+                enviadas = columnas
+
+        try:
+            T_min, T_max = await loop.run_in_executor(
+                self.ejecutor, _integrar_lote, clave, [p for p, _ in lote], al_avanzar)
+        except Exception as e:
+            for _, corrida in lote:
+                corrida.fallar(e)
+            return
+        for i, (_, corrida) in enumerate(lote):
+            corrida.terminar(T_min[i], T_max[i])
+
+def _integrar_lote(clave: Tuple, miembros: List[Dict[str, float]],
+                   al_avanzar: Callable[[np.ndarray, int], None] = None
+                   ) -> Tuple[np.ndarray, np.ndarray]:
+    """(T_min, T_max) (N, n) [K] del ensamble; la historia se entrega por `al_avanzar`."""
+    caso, dt, t_total, dtype, historia_cada = clave
+    N = len(miembros)
+    nominal = parametros_ensamble(caso)
+    usados = set().union(*miembros)
+    valores = {k: np.array([m.get(k, nominal[k]) for m in miembros]) for k in usados}
+    ens = ensamble_parametrico(caso, N, **valores)
+    r = integrar_ensamble(ens, estado_inicial(caso), dt, t_total, np.dtype(dtype), historia_cada,
+                          al_avanzar=al_avanzar)
+    return r.T_min, r.T_max
+
+# ----------------------------
+# Servicio
+# ----------------------------
+class Servicio:
+    """Estado compartido del servidor: lotes, caché LRU y contadores."""
+
+    def __init__(self, ventana_s: float = VENTANA_S, tam_cache: int = TAM_CACHE, hilos: int = 1):
+        self.lotes = Lotes(ThreadPoolExecutor(max_workers=hilos), ventana_s)
+        self.tam_cache = tam_cache
+        self._cache: "OrderedDict[str, Corrida]" = OrderedDict()
+        self.n_solicitudes = 0
+        self.n_aciertos = 0
+
+    def calentar(self) -> None:
+        """Importa y corre un ensamble mínimo de cada caso (BLAS, bases y perfiles listos)."""
+        for caso in ("caliente", "frio"):
+            _integrar_lote((caso, DEFECTOS["dt"], 10 * DEFECTOS["dt"], "float64", 1), [{}])
+
+    def simular(self, solicitud: Dict) -> Tuple[Corrida, bool]:
+        """(corrida, vino_de_cache) para una solicitud JSON ya decodificada."""
+        clave_lote, parametros, texto = normalizar(solicitud)
+        self.n_solicitudes += 1
+        corrida = self._cache.get(texto)
+        en_cache = corrida is not None and corrida.error is None
+        if en_cache:
+            self.n_aciertos += 1
+            self._cache.move_to_end(texto)
+        else:
+            corrida = Corrida(eje_historia(clave_lote), NODES_TOTAL)
+            self.lotes.enviar(clave_lote, parametros, corrida)
+            self._cache[texto] = corrida
+            self._cache.move_to_end(texto)
+            while len(self._cache) > self.tam_cache:
+                self._cache.popitem(last=False)
+        return corrida, en_cache
+
+    def estado(self) -> Dict[str, object]:
+        lotes = self.lotes
+        return {
+            "solicitudes": self.n_solicitudes, "aciertos_cache": self.n_aciertos,
+            "en_cache": len(self._cache), "lotes": lotes.n_lotes,
+            "miembros_por_lote": lotes.n_miembros / lotes.n_lotes if lotes.n_lotes else 0.0,
+        }
+
+    async def lineas(self, corrida: Corrida, en_cache: bool) -> AsyncIterator[Dict[str, object]]:
+        """Mensajes NDJSON de una corrida, en el orden en que se transmiten."""
+        yield {"tipo": "inicio", "n_muestras": int(corrida.t.size), "cache": en_cache}
+        async for msg in corrida.leer():
+            yield msg
+
+    # ----------------------------
+    # HTTP
+    # ----------------------------
+    async def atender(self, lector: asyncio.StreamReader, escritor: asyncio.StreamWriter) -> None:
+        try:
+            linea = (await lector.readline()).decode("latin-1").split()
+            cabeceras = {}
+            while True:
+                h = (await lector.readline()).decode("latin-1").strip()
+                if not h:
+                    break
+                nombre, _, valor = h.partition(":")
+                cabeceras[nombre.strip().lower()] = valor.strip()
+            if len(linea) < 2:
+                return
+            metodo, ruta = linea[0], linea[1]
+            if metodo == "GET" and ruta == "/estado":
+                await _responder(escritor, 200, self.estado())
+            elif metodo == "POST" and ruta == "/simular":
+                try:
+                    largo = int(cabeceras.get("content-length", 0))
+                    if not 0 <= largo <= MAX_CUERPO:
+                        raise ValueError(f"Content-Length fuera de rango: {largo}")
+                    cuerpo = await lector.readexactly(largo)
+                    corrida, en_cache = self.simular(json.loads(cuerpo or b"{}"))
+                except (ValueError, TypeError) as e:
+                    await _responder(escritor, 400, {"error": str(e)})
+                    return
+                escritor.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/x-ndjson\r\n"
+                               b"Transfer-Encoding: chunked\r\nConnection: close\r\n\r\n")
+                async for msg in self.lineas(corrida, en_cache):
+                    datos = (json.dumps(msg) + "\n").encode()
+                    escritor.write(b"%x\r\n%s\r\n" % (len(datos), datos))
+                    await escritor.drain()
+                escritor.write(b"0\r\n\r\n")
+            else:
+                await _responder(escritor, 404, {"error": f"{metodo} {ruta} no existe"})
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            try:
+                await escritor.drain()
+                escritor.close()
+            except ConnectionError:
+                pass
+
+async def _responder(escritor: asyncio.StreamWriter, codigo: int, cuerpo: Dict) -> None:
+    datos = json.dumps(cuerpo).encode()
+    razon = {200: "OK", 400: "Bad Request", 404: "Not Found"}[codigo]
+    escritor.write(f"HTTP/1.1 {codigo} {razon}\r\nContent-Type: application/json\r\n"
+                   f"Content-Length: {len(datos)}\r\nConnection: close\r\n\r\n".encode() + datos)
+
+async def servir(host: str = HOST, puerto: int = PUERTO, unix: str = None,
+                 ventana_s: float = VENTANA_S) -> None:
+    servicio = Servicio(ventana_s)
+    servicio.calentar()
+    if unix:
+        servidor = await asyncio.start_unix_server(servicio.atender, path=unix)
+        print(f"> Sirviendo en unix:{unix}")
+    else:
+        servidor = await asyncio.start_server(servicio.atender, host, puerto)
+        print(f"> Sirviendo en http://{host}:{puerto}")
+    async with servidor:
+        await servidor.serve_forever()
+
+# ----------------------------
+# Cliente
+# ----------------------------
+class _ConexionUnix(http.client.HTTPConnection):
+    def __init__(self, ruta: str, timeout: float = None):
+        super().__init__("localhost", timeout=timeout)
+        self._ruta = ruta
+
+    def connect(self) -> None:
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(self._ruta)
+
+def simular_remoto(solicitud: Dict, host: str = HOST, puerto: int = PUERTO,
+                   unix: str = None, timeout: float = None) -> Iterator[Dict[str, object]]:
+    """Envía una solicitud al servidor y va entregando los mensajes a medida que llegan."""
+    con = _ConexionUnix(unix, timeout) if unix else http.client.HTTPConnection(host, puerto, timeout=timeout)
+    try:
+        con.request("POST", "/simular", body=json.dumps(solicitud),
+                    headers={"Content-Type": "application/json"})
+        resp = con.getresponse()
+        if resp.status != 200:
+            raise ValueError(json.loads(resp.read()).get("error", resp.reason))
+        for linea in resp:
+            msg = json.loads(linea)
+            if msg["tipo"] == "error":
+                raise ValueError(msg["error"])
+            yield msg
+    finally:
+        con.close()
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Servicio local de simulación térmica")
+    ap.add_argument("--host", default=HOST)
+    ap.add_argument("--puerto", type=int, default=PUERTO)
+    ap.add_argument("--unix", default=None, help="ruta de socket Unix (en vez de TCP)")
+    ap.add_argument("--ventana-ms", type=float, default=1e3 * VENTANA_S)
+    args = ap.parse_args()
+    try:
+        asyncio.run(servir(args.host, args.puerto, args.unix, args.ventana_ms / 1e3))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -4,9 +4,12 @@
 - Elige caso (frío/caliente), simula 1 órbita y grafica resultados.
 - Menos repetición: lista de ecuaciones por nodo y lazo compacto.
 - AFT tomadas desde constants.py (en °C).
+- --profile [RUTA]: tiempo por etapa, pasos/s y asignaciones de la corrida
+  (perfil.py), exportado a JSON; --integrador elige el backend a comparar.
 """
 
 from __future__ import annotations
+import argparse
 import numpy as np
 import matplotlib.pyplot as plt
 from typing import Callable, List, Tuple
@@ -15,6 +18,10 @@ from constants import (
     get_propiedades_caso,
     AFT_OBC_MIN, AFT_OBC_MAX, AFT_BAT_MIN, AFT_BAT_MAX
 )
+from red_termica import construir_red
+from integrador import integrar_euler, integrar_multirate, integrar_tramos
+from checkpoint import Checkpoint, huella, verificar_firma
+from perfil import Perfil, etapas
 
 # ----------------------------
 # Configuración de simulación
@@ -24,6 +31,13 @@ DT: float = 1.0            # [s]
 NODES_TOTAL: int = 15      # 13 nodos físicos + Venus (14) + espacio (15)
 NODES_SOLVE: int = 13      # resolvemos 1..13
 
+# 'nodal'     = ecNodoX a paso fijo DT (original)
+# 'tramos'    = paso adaptativo que cae en cada borde de eclipse/potencia
+# 'euler'     = Euler sobre la red (mismo resultado que 'nodal')
+# 'multirate' = Euler multirate sobre la red
+INTEGRADOR: str = "nodal"
+INTEGRADORES: Tuple[str, ...] = ("nodal", "tramos", "euler", "multirate")
+
 # Paleta
 COLORS = [
     "#d35e60", "#d35e60", "#7293cb", "#7293cb", "#84ba5b", "#84ba5b",
@@ -38,9 +52,9 @@ def theta_deg(step: int, dt: float, period: float) -> float:
     theta = (360.0 / period) * step * dt
     return theta % 360.0
 
-def pick_case() -> Tuple[str, object]:
-    """Pregunta por consola y retorna ('frio'|'caliente', módulo de ecuaciones)."""
-    op = -1
+def pick_case(caso: str = None) -> Tuple[str, object]:
+    """Pregunta por consola (si no se da `caso`) y retorna ('frio'|'caliente', módulo de ecuaciones)."""
+    op = {"frio": 1, "caliente": 2}.get(caso, -1)
     while op not in (1, 2):
         print("\n==== Menú ====\n< 1 > Caso frío\n< 2 > Caso caliente")
         try:
@@ -63,8 +77,12 @@ def build_node_funcs(ecs_mod) -> List[Callable]:
         ecs_mod.ecNodo13
     ]
 
-def simulate(caso: str, ecs_mod) -> Tuple[np.ndarray, np.ndarray]:
-    """Corre la simulación y devuelve (temps[K], t[s])."""
+def simulate(caso: str, ecs_mod, checkpoint: Checkpoint = None,
+             perfil: Perfil = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Corre la simulación y devuelve (temps[K], t[s]); con checkpoint reanuda si hay uno.
+    Con perfil se mide por etapa: órbita, ecuaciones nodales, salida y checkpoint.
+    """
     props = get_propiedades_caso(caso)
     T0 = np.asarray(props["T_inicial"], dtype=float)  # [K]
 
@@ -78,19 +96,67 @@ def simulate(caso: str, ecs_mod) -> Tuple[np.ndarray, np.ndarray]:
     cond_rows = [list(C_COND[i]) for i in range(NODES_SOLVE)]
     fv_rows   = [list(F_VIEW[i])  for i in range(NODES_SOLVE)]
 
-    for p in range(1, steps):
+    p0 = guardado = 1
+    firma = np.array([steps, DT])
+    if checkpoint is not None:
+        huella_ = huella(T0, np.asarray(C_COND, dtype=float), np.asarray(F_VIEW, dtype=float),
+                         np.array(ecs_mod.__name__))
+        historia = checkpoint.historia("temps", (steps, NODES_TOTAL))
+        guardado = 0    # columnas ya escritas en la historia del checkpoint
+        previo = checkpoint.cargar()
+        if previo is not None:
+            verificar_firma(previo, f"nodal_{caso}", firma, huella_)
+            p0 = guardado = int(previo["p"])
+            temps[:, :p0] = historia[:p0].T
+
+    if perfil is not None:
+        perfil.n_nodos = NODES_SOLVE
+    m = etapas(perfil, ("orbita", "ecuaciones", "salida", "checkpoint"))
+    for p in range(p0, steps):
         prev = temps[:, p - 1]
         theta = theta_deg(p, DT, ORBITAL_PERIOD)
+        m(0)
         # Avance explícito de nodos 1..13
         for i in range(NODES_SOLVE):
             temps[i, p] = node_funcs[i](prev, DT, cond_rows[i], fv_rows[i], theta)
+        m(1)
         # Nodos "fuente": Venus y espacio
         temps[13, p] = T_VENUS
         temps[14, p] = T_SPACE
+        m(2)
+        if checkpoint is not None and checkpoint.toca():
+            checkpoint.escribir("temps", guardado, temps[:, guardado:p + 1].T)
+            guardado = p + 1
+            checkpoint.guardar(metodo=f"nodal_{caso}", firma=firma, huella=huella_, p=p + 1)
+        m(3)
+        m.paso()
+    m.volcar()
+    if checkpoint is not None:
+        checkpoint.terminar()
 
     t_axis = np.arange(0.0, T_TOTAL, DT)
     return temps, t_axis
 
+def simulate_tramos(caso: str, perfil: Perfil = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Igual que simulate pero integrando por tramos entre discontinuidades; salida cada DT."""
+    props = get_propiedades_caso(caso)
+    t_axis = np.arange(0.0, T_TOTAL, DT)
+    res = integrar_tramos(construir_red(caso), np.asarray(props["T_inicial"], dtype=float), t_axis,
+                          perfil=perfil)
+    return res.temps, t_axis
+
+def simulate_red(caso: str, integrador: str = "euler", perfil: Perfil = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Igual que simulate pero sobre la red ('euler' o 'multirate'), paso DT."""
+    props = get_propiedades_caso(caso)
+    T0 = np.asarray(props["T_inicial"], dtype=float)
+    if integrador == "euler":
+        res = integrar_euler(construir_red(caso), T0, DT, T_TOTAL, perfil=perfil)
+    elif integrador == "multirate":
+        res = integrar_multirate(construir_red(caso), T0, DT, T_TOTAL, perfil=perfil)
+    else:
+        raise ValueError(f"Integrador de red desconocido: {integrador!r}")
+    return res.temps, res.t
+
 # ----------------------------
 # Gráficos
 # ----------------------------
@@ -148,18 +214,54 @@ def print_extremes(temps_K: np.ndarray) -> None:
 # ----------------------------
 # Main
 # ----------------------------
+def run(caso: str, ecs_mod, integrador: str = INTEGRADOR,
+        perfil: Perfil = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Simula con el backend elegido (ver INTEGRADORES)."""
+    if integrador == "tramos":
+        return simulate_tramos(caso, perfil)
+    if integrador == "nodal":
+        return simulate(caso, ecs_mod, perfil=perfil)
+    return simulate_red(caso, integrador, perfil)
+
 def main() -> None:
-    caso, ecs_mod = pick_case()
-    temps_K, t_axis = simulate(caso, ecs_mod)
+    parser = argparse.ArgumentParser(description="Simulación de una órbita (caso frío/caliente)")
+    parser.add_argument("--caso", choices=("frio", "caliente"), help="caso a simular (sin menú)")
+    parser.add_argument("--integrador", choices=INTEGRADORES, default=INTEGRADOR)
+    parser.add_argument("--profile", nargs="?", const="perfil.json", default=None, metavar="RUTA",
+                        help="mide la corrida por etapa y exporta el reporte JSON (perfil.json)")
+    parser.add_argument("--profile-memoria", action="store_true",
+                        help="con --profile, también el pico de memoria (tracemalloc, más lento)")
+    parser.add_argument("--sin-graficos", action="store_true")
+    args = parser.parse_args()
+
+    caso, ecs_mod = pick_case(args.caso)
+    perfil = None
+    if args.profile is not None:
+        perfil = Perfil(f"{args.integrador}_{caso}", memoria=args.profile_memoria).iniciar()
+    temps_K, t_axis = run(caso, ecs_mod, args.integrador, perfil)
 
     # Gráficos
-    plot_all_nodes(temps_K, t_axis)
-    plot_aft_windows(temps_K, t_axis)
-    plt.show()
+    if not args.sin_graficos:
+        if perfil is not None:
+            with perfil.medir("graficos"):
+                plot_all_nodes(temps_K, t_axis)
+                plot_aft_windows(temps_K, t_axis)
+        else:
+            plot_all_nodes(temps_K, t_axis)
+            plot_aft_windows(temps_K, t_axis)
+            plt.show()
 
     # Logs
     print("\nTemperaturas iniciales de una órbita (K):\n", temps_K[:, 0], "\n")
     print_extremes(temps_K)
 
+    if perfil is not None:
+        perfil.terminar()
+        perfil.imprimir()
+        perfil.exportar(args.profile)
+        print(f"> Perfil exportado a {args.profile}")
+        if not args.sin_graficos:
+            plt.show()   # después del reporte: la ventana abierta no entra en el tiempo medido
+
 if __name__ == "__main__":
     main()
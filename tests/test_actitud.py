@@ -0,0 +1,59 @@
+# By: Johanna Olivera y Ailin Ferrari
+
+"""
+- Una actitud sin cuaterniones() falla al construirse, no al evaluar cargas.
+- La actitud nominal reproduce las leyes de flujos.py por cara (incidencia
+  solar, factor de vista con Venus) y las cargas de construir_red salvo la
+  convención documentada: ecNodales aplica cosφ = -cos θ (la ley de Z+) al Sol
+  de todos los paneles, la actitud da a cada cara su propia incidencia.
+"""
+
+import numpy as np
+import pytest
+import flujos
+from actitud import Actitud, ActitudNominal, CARAS, NODO_CARA, aplicar_actitud, factor_planeta
+from constants import ORBITAL_PERIOD
+from red_termica import AREAS_NODOS, N_EXTERNOS, construir_red, opticas_externas
+
+# θ fuera de los bordes de eclipse/albedo
+T = (np.arange(720) + 0.37) / 720 * ORBITAL_PERIOD
+THETA = 2 * np.pi * T / ORBITAL_PERIOD
+
+def test_actitud_incompleta():
+    class SinCuaterniones(Actitud):
+        pass
+
+    with pytest.raises(TypeError):
+        SinCuaterniones()
+
+def test_incidencias_nominales():
+    assert CARAS == flujos.CARAS
+    inc = ActitudNominal().incidencias(T)
+    a, b = flujos.COS_SOLAR.T
+    np.testing.assert_allclose(inc["sol"], a[:, None] * np.cos(THETA) + b[:, None] * np.sin(THETA), atol=1e-12)
+    np.testing.assert_allclose(factor_planeta(inc["nadir"][:, 0]), flujos.F_PLANETA, rtol=1e-12)
+
+def _parte(red, tipo):
+    k = [j for j, b in enumerate(red.bases) if b.nombre == tipo or b.nombre.startswith(tipo + "_")]
+    return red.A[:, k] @ np.stack([red.bases[j].evaluar(T) for j in k])
+
+@pytest.mark.parametrize("caso", ["caliente", "frio"])
+def test_cargas_nominales(caso):
+    red = construir_red(caso)
+    red_a = aplicar_actitud(red, ActitudNominal(), caso)
+    # Albedo e IR planetario: iguales en todos los nodos
+    for tipo in ("albedo", "ir"):
+        np.testing.assert_allclose(_parte(red_a, tipo), _parte(red, tipo), rtol=1e-12, atol=1e-12)
+    # Sol: cada cara con la ley de flujos_caras; en Z+ coincide con ecNodales
+    _, _, k_abs = opticas_externas(caso)
+    f_sol = flujos.flujos_caras(THETA, ("INC",)).solar[:, 0]
+    sol_a, sol = _parte(red_a, "solar"), _parte(red, "solar")
+    for nodo, cara in NODO_CARA.items():
+        i = nodo - 1
+        esperado = AREAS_NODOS[i] * k_abs[i] * f_sol[flujos.CARAS.index(cara)]
+        np.testing.assert_allclose(sol_a[i], esperado, rtol=1e-12, atol=1e-9)
+        if cara == "Z+":
+            np.testing.assert_allclose(sol_a[i], sol[i], rtol=1e-12, atol=1e-9)
+    # Cargas totales: iguales fuera del Sol de los paneles que no son Z+
+    otros = [i for i in range(red.n) if i >= N_EXTERNOS or NODO_CARA[i + 1] == "Z+"]
+    np.testing.assert_allclose(red_a.cargas(T)[otros], red.cargas(T)[otros], rtol=1e-12, atol=1e-9)
@@ -0,0 +1,15 @@
+# By: Johanna Olivera y Ailin Ferrari
+
+"""
+- Una base de carga sin evaluar() falla al construirse, no en medio de una integración.
+"""
+
+import pytest
+from bases import Base
+
+def test_base_incompleta():
+    class SinEvaluar(Base):
+        nombre = "x"
+
+    with pytest.raises(TypeError):
+        SinEvaluar()
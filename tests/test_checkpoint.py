@@ -0,0 +1,90 @@
+# By: Johanna Olivera y Ailin Ferrari
+
+"""
+- Corte y reanudación de corridas con checkpoint: el resultado reanudado es
+  idéntico bit a bit al de una corrida sin cortes.
+- Un checkpoint de otro caso (misma ruta) se rechaza en vez de reanudar.
+- Un barrido reanudado da los mismos resultados, también para salidas que
+  aparecen recién después del corte.
+"""
+
+import os
+import numpy as np
+import pytest
+from barrido import ejecutar_barrido
+from checkpoint import Checkpoint
+from ensamble import ensamble_parametrico, integrar_ensamble
+from integrador import integrar_euler, integrar_tramos
+from red_termica import construir_red, estado_inicial
+
+class Corte(Exception):
+    pass
+
+class CheckpointCortado(Checkpoint):
+    """Checkpoint que simula un corte después de `guardados` guardados."""
+
+    def __init__(self, ruta: str, cada_pasos: int, guardados: int):
+        super().__init__(ruta, cada_pasos=cada_pasos)
+        self.restantes = guardados
+
+    def guardar(self, **datos) -> None:
+        super().guardar(**datos)
+        self.restantes -= 1
+        if self.restantes == 0:
+            raise Corte()
+
+def _euler(caso, checkpoint=None):
+    return integrar_euler(construir_red(caso), estado_inicial(caso), 1.0, 1200.0, checkpoint).temps
+
+def _tramos(caso, checkpoint=None):
+    t = np.arange(0.0, 1200.0, 1.0)
+    return integrar_tramos(construir_red(caso), estado_inicial(caso), t, checkpoint=checkpoint).temps
+
+def _ensamble(caso, checkpoint=None):
+    ens = ensamble_parametrico(caso, 3, escala_G=np.array([0.9, 1.0, 1.1]))
+    r = integrar_ensamble(ens, estado_inicial(caso), 1.0, 1200.0, historia_cada=7, checkpoint=checkpoint)
+    return np.concatenate([r.historia.ravel(), r.T_min.ravel(), r.T_max.ravel(), r.T_final.ravel()])
+
+CORRIDAS = {"euler": (_euler, 100), "tramos": (_tramos, 20), "ensamble": (_ensamble, 100)}
+
+@pytest.mark.parametrize("nombre", sorted(CORRIDAS))
+def test_reanudar_es_identico(tmp_path, nombre):
+    correr, cada = CORRIDAS[nombre]
+    ruta = str(tmp_path / "corrida")
+    limpio = correr("caliente")
+    with pytest.raises(Corte):
+        correr("caliente", CheckpointCortado(ruta, cada, guardados=3))
+    assert os.path.exists(ruta + ".npz")
+    reanudado = correr("caliente", Checkpoint(ruta, cada_pasos=cada))
+    np.testing.assert_array_equal(reanudado, limpio)
+    assert not os.listdir(tmp_path)   # terminar() borra checkpoint e historias
+
+@pytest.mark.parametrize("nombre", sorted(CORRIDAS))
+def test_rechaza_checkpoint_de_otro_caso(tmp_path, nombre):
+    correr, cada = CORRIDAS[nombre]
+    ruta = str(tmp_path / "corrida")
+    with pytest.raises(Corte):
+        correr("caliente", CheckpointCortado(ruta, cada, guardados=2))
+    with pytest.raises(ValueError, match="otro caso"):
+        correr("frio", Checkpoint(ruta, cada_pasos=cada))
+
+def _barrido(caso, checkpoint=None):
+    def funcion(c, rng):
+        salida = {"x": rng.normal(size=3) * c["escala"]}
+        if c["escala"] > 5:
+            salida["tardio"] = rng.random()
+        return salida
+    casos = [{"caso": caso, "escala": e} for e in range(10)]
+    r = ejecutar_barrido(casos, funcion, checkpoint, semilla=3)
+    assert np.isnan(r["tardio"][:6]).all()
+    return np.concatenate([r["x"].ravel(), r["tardio"]])
+
+@pytest.mark.parametrize("guardados", [3, 4])
+def test_reanudar_barrido(tmp_path, guardados):
+    ruta = str(tmp_path / "barrido")
+    limpio = _barrido("caliente")
+    with pytest.raises(Corte):
+        _barrido("caliente", CheckpointCortado(ruta, 2, guardados))
+    reanudado = _barrido("caliente", Checkpoint(ruta, cada_pasos=2))
+    np.testing.assert_array_equal(reanudado, limpio)
+    assert not os.listdir(tmp_path)
@@ -0,0 +1,99 @@
+# By: Johanna Olivera y Ailin Ferrari
+
+"""
+- Un deck chico escrito a mano: referencias entre submodelos ('SUB.n'), ids
+  negativos de nodo (contorno) y de conductor (radiativo), ABSZRO y SIGMA del
+  bloque CONTROL y fuentes que se acumulan. La derivada coincide con la
+  ecuación nodal armada a mano.
+- La cache .npz se reusa mientras el deck no cambia y se descarta si cambia.
+- El deck sintético de escala deja los enlaces al contorno en formato disperso.
+"""
+
+import os
+import numpy as np
+import pytest
+import deck
+from deck import cargar_deck, deck_sintetico, leer_deck
+
+DECK = """\
+$ Deck de prueba
+HEADER CONTROL DATA, GLOBAL
+    SIGMA = 1.0E-8
+    ABSZRO = -273.0           $ temperaturas en °C
+header node data, sat
+    1, 27.0, 10.0
+    2, 7.0, 20.0
+   -3, 20.0, 0.0              $ contorno: C se ignora
+HEADER NODE DATA, ESPACIO
+   -1, -270.0, 0.0
+HEADER CONDUCTOR DATA, SAT
+    1, 1, 2, 0.5
+   -2, 1, ESPACIO.1, 0.01     $ radiativo al espacio
+    3, 2, 3, 0.2
+   -4, 1, 2, 0.02
+HEADER SOURCE DATA, SAT
+    2, 3.0
+    2, 1.0
+HEADER OPTIONS DATA           $ bloque no soportado: se saltea
+    OUTPUT = salida.txt
+"""
+
+def _escribir(tmp_path, texto=DECK):
+    ruta = tmp_path / "modelo.inp"
+    ruta.write_text(texto, encoding="utf-8")
+    return str(ruta)
+
+def test_deck_en_linea(tmp_path):
+    red, T0 = leer_deck(_escribir(tmp_path))
+    assert red.nombres == ["SAT.1", "SAT.2"]
+    np.testing.assert_allclose(T0, [300.0, 280.0])
+    np.testing.assert_allclose(red.T_contorno, [293.0, 3.0])
+    np.testing.assert_allclose(red.A[:, 0], [0.0, 4.0])
+
+    s = 1.0e-8
+    T1, T2 = 310.0, 275.0
+    d1 = (0.5 * (T2 - T1) + 0.02 * s * (T2 ** 4 - T1 ** 4) + 0.01 * s * (3.0 ** 4 - T1 ** 4)) / 10.0
+    d2 = (0.5 * (T1 - T2) + 0.02 * s * (T1 ** 4 - T2 ** 4) + 0.2 * (293.0 - T2) + 4.0) / 20.0
+    np.testing.assert_allclose(red.derivada(0.0, np.array([T1, T2])), [d1, d2], rtol=1e-12)
+
+def test_deck_invalido(tmp_path):
+    with pytest.raises(ValueError, match="no definidos"):
+        leer_deck(_escribir(tmp_path, DECK.replace("ESPACIO.1", "ESPACIO.2")))
+    with pytest.raises(ValueError, match="definido dos veces"):
+        leer_deck(_escribir(tmp_path, DECK.replace("    2, 7.0", "    1, 7.0")))
+
+def test_cache(tmp_path, monkeypatch):
+    ruta = _escribir(tmp_path)
+    red, T0 = cargar_deck(ruta)
+    assert os.path.exists(ruta + ".red.npz")
+
+    # Acierto: no se vuelve a leer el texto
+    def sin_texto(_):
+        raise AssertionError("se leyó el texto con la cache vigente")
+    with monkeypatch.context() as m:
+        m.setattr(deck, "leer_deck", sin_texto)
+        red_c, T0_c = cargar_deck(ruta)
+    T = np.array([310.0, 275.0])
+    np.testing.assert_array_equal(red_c.derivada(0.0, T), red.derivada(0.0, T))
+    np.testing.assert_array_equal(T0_c, T0)
+    assert red_c.nombres == red.nombres
+
+    # El deck cambia: la cache se descarta y se regenera
+    with open(ruta, "a", encoding="utf-8") as f:
+        f.write("HEADER SOURCE DATA, SAT\n    1, 2.5\n")
+    red_n, _ = cargar_deck(ruta)
+    np.testing.assert_allclose(red_n.A[:, 0], [2.5, 4.0])
+    with monkeypatch.context() as m:
+        m.setattr(deck, "leer_deck", sin_texto)
+        np.testing.assert_allclose(cargar_deck(ruta)[0].A[:, 0], [2.5, 4.0])
+
+def test_deck_sintetico_disperso(tmp_path):
+    ruta = str(tmp_path / "placa.inp")
+    k = 20
+    deck_sintetico(ruta, k, potencia=5.0)
+    red, T0 = leer_deck(ruta)
+    assert red.n == k * k and red.T_contorno.size == 1
+    assert red.rc.size == k * k and red.gc.size == 0
+    assert red.g.size == 2 * 2 * k * (k - 1)
+    np.testing.assert_allclose(red.A[:, 0].sum(), 5.0)
+    np.testing.assert_allclose(T0, 293.15)
@@ -0,0 +1,47 @@
+# By: Johanna Olivera y Ailin Ferrari
+
+"""
+- La red nominal no arrastra la base constante; el ensamble la agrega sólo
+  si algún miembro tiene calefactor, con la potencia en NODO_CALEFACTOR.
+- estado_periodico avanza exactamente un período aunque t_periodo/dt no sea
+  entero: el estado devuelto se repite tras una órbita.
+- float32 con Kahan queda a < 1e-4 K de float64 en toda la historia
+  (medido: 3.9e-5 K caliente, 5.8e-5 K frío con N = 16).
+"""
+
+import numpy as np
+import pytest
+from constants import ORBITAL_PERIOD
+from ensamble import (
+    NODO_CALEFACTOR, desde_red, ensamble_parametrico, estado_periodico,
+    integrar_ensamble, validar_precision
+)
+from red_termica import construir_red, estado_inicial
+
+def test_base_constante_solo_con_calefactor():
+    red = construir_red("frio")
+    assert "constante" not in [b.nombre for b in red.bases]
+    assert [b.nombre for b in ensamble_parametrico("frio", 2).bases] == [b.nombre for b in red.bases]
+
+    ens = ensamble_parametrico("frio", 2, calefactor=np.array([0.0, 3.0]))
+    k = [b.nombre for b in ens.bases].index("constante")
+    esperado = np.zeros((2, red.n))
+    esperado[1, NODO_CALEFACTOR - 1] = 3.0
+    np.testing.assert_array_equal(ens.A[:, :, k], esperado)
+    np.testing.assert_array_equal(np.delete(ens.A, k, axis=2), desde_red(red, 2).A)
+
+def test_estado_periodico_sin_corrimiento():
+    ens = desde_red(construir_red("caliente"), 1)
+    T, _ = estado_periodico(ens, estado_inicial("caliente"), 1.0, ORBITAL_PERIOD, tol=0.001)
+    pasos = int(np.ceil(ORBITAL_PERIOD))
+    dt = ORBITAL_PERIOD / pasos
+    assert pasos * 1.0 != ORBITAL_PERIOD
+    T_sig = integrar_ensamble(ens, T, dt, (pasos + 1.5) * dt).T_final
+    assert np.abs(T_sig - T).max() < 0.001
+
+@pytest.mark.parametrize("caso", ["caliente", "frio"])
+def test_float32_kahan(caso):
+    rep = validar_precision(N=16, casos=(caso,))[caso]
+    assert rep["error_max"] < 1e-4
+    assert rep["error_extremos"] < 1e-4
+    assert rep["error_ref"] < 1e-9
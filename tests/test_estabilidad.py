@@ -0,0 +1,36 @@
+# By: Johanna Olivera y Ailin Ferrari
+
+"""
+- El límite de Euler de la órbita (≈ 2.147 s, nodo 11) es la cota 2/|λ| del
+  autovalor más grande: un poco por encima Euler diverge, un poco por debajo no.
+- El DT recomendado queda por debajo del límite y cumple la tolerancia en él
+  y en todos los pasos más finos.
+"""
+
+import numpy as np
+import pytest
+from estabilidad import autovalores, estudio_dt
+from integrador import integrar_euler
+from red_termica import construir_red, estado_inicial
+
+@pytest.fixture(scope="module")
+def estudio():
+    return estudio_dt("caliente", tol=0.1)
+
+def test_limite_es_cota_del_autovalor(estudio):
+    red = construir_red("caliente")
+    T0 = estado_inicial("caliente")
+    dt_lim = estudio["dt_limite"]
+    assert dt_lim == pytest.approx(2.147, abs=1e-3)
+    assert dt_lim == pytest.approx(2.0 / np.abs(autovalores(red, T0)).max(), rel=1e-3)
+    with np.errstate(all="ignore"):
+        inestable = integrar_euler(red, T0, 1.05 * dt_lim, 600.0).temps
+    estable = integrar_euler(red, T0, 0.95 * dt_lim, 600.0).temps
+    assert not (np.abs(inestable - T0[0]) < 100.0).all()
+    assert np.abs(np.diff(estable[10], axis=-1)).max() < 1.0
+
+def test_dt_recomendado(estudio):
+    dt = estudio["dt_recomendado"]
+    assert dt is not None and dt < estudio["dt_limite"]
+    k = list(estudio["dts"]).index(dt)
+    assert (estudio["error"][k:] <= 0.1).all()
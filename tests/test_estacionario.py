@@ -0,0 +1,34 @@
+# By: Johanna Olivera y Ailin Ferrari
+
+"""
+- La envolvente estacionaria acota la órbita periódica integrada con el error
+  documentado (≤ 1 K por encima en los nodos AFT).
+- tamizar(): el diseño caliente nominal cumple sin transitorio y el frío
+  nominal (≈ -40 °C en OBC y batería) falla.
+"""
+
+import numpy as np
+from constants import ORBITAL_PERIOD, AFT_NODOS
+from red_termica import construir_red, estado_inicial
+from ensamble import desde_red, estado_periodico, integrar_ensamble
+from estacionario import cargas_orbita, cotas_estacionarias, tamizar
+
+def test_cargas_por_tramo_promedian_la_media():
+    q_media, cortes, q_tramos = cargas_orbita(construir_red("caliente"))
+    assert cortes[0] == 0.0 and cortes[-1] == ORBITAL_PERIOD
+    np.testing.assert_allclose(q_tramos @ np.diff(cortes) / ORBITAL_PERIOD, q_media, rtol=1e-12)
+
+def test_envolvente_acota_orbita_periodica():
+    red = construir_red("caliente")
+    cotas = cotas_estacionarias(red)
+    ens = desde_red(red, 1)
+    T0, _ = estado_periodico(ens, estado_inicial("caliente"), 1.0, ORBITAL_PERIOD, tol=0.005)
+    r = integrar_ensamble(ens, T0, 1.0, ORBITAL_PERIOD)
+    for nodo in AFT_NODOS:
+        i = nodo - 1
+        assert 0.0 <= cotas["sup"][i] - r.T_max[0, i] < 1.0
+        assert 0.0 <= cotas["inf"][i] - r.T_min[0, i] < 1.0
+
+def test_tamizar_cumple_y_falla():
+    assert tamizar("caliente", [{}])[0]["estado"] == "cumple"
+    assert tamizar("frio", [{}])[0]["estado"] == "falla"
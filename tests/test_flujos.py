@@ -0,0 +1,94 @@
+# By: Johanna Olivera y Ailin Ferrari
+
+"""
+- flujos_caras reproduce las leyes escalares por cara de los scripts carga_*
+  originales (solar en W salvo INC, albedo e IR por unidad de área) en varios ángulos.
+- Cambio documentado: en BOL/EOL las caras Y± absorben el albedo con α del
+  coating (ALPHA_WTC_*) y no con α_s·f_Aeff·η como el grupo X±/Y± original.
+- totales_orbita coincide con la integral numérica de flujos_caras.
+- El IR (constante en θ) es una vista broadcast, no una copia.
+"""
+
+import numpy as np
+import pytest
+from constants import (
+    SIGMA, SCV, GAMMA, T_VENUS, ORBITAL_PERIOD, F_PLANET_ZPLUS, F_PLANET_LATERAL,
+    F_AEFF, ETA_ELEC, AREA_PANEL, ALPHA_S_BOL, ALPHA_S_EOL, EPS_SA_BOL, EPS_SA_EOL,
+    ALPHA_WTC_BOL, ALPHA_WTC_EOL, EPS_WTC_BOL, EPS_WTC_EOL,
+    THETA_C1, THETA_C2, THETA_C3, THETA_C4
+)
+from flujos import CARAS, ESTADOS, flujos_caras, totales_orbita
+
+# Ángulos fuera de los bordes de ventana
+THETA = np.radians([10.0, 60.0, 100.0, 150.0, 200.0, 250.0, 280.0, 330.0])
+c1, c2, c3, c4 = np.radians([THETA_C1, THETA_C2, THETA_C3, THETA_C4])
+
+# (α_s, ε_sa, α_wtc, ε_wtc, f_Aeff·η) por estado
+MATERIALES = {
+    "INC": (1.0, 1.0, 1.0, 1.0, 1.0),
+    "BOL": (ALPHA_S_BOL, EPS_SA_BOL, ALPHA_WTC_BOL, EPS_WTC_BOL, F_AEFF * ETA_ELEC),
+    "EOL": (ALPHA_S_EOL, EPS_SA_EOL, ALPHA_WTC_EOL, EPS_WTC_EOL, F_AEFF * ETA_ELEC),
+}
+
+def _solar(cara, estado, t):
+    """carga_solar original: α_s·S_V·A_i·f_Aeff·η·cos φ en la ventana (A_i = 2 paneles salvo INC)."""
+    cos_fn, cond = {
+        "Z+": (-np.cos(t), (c1 <= t <= c2) or (c3 <= t <= c4)),
+        "Z-": (np.cos(t), t <= c1 or t >= c4),
+        "X+": (-np.sin(t), t >= c3),
+        "X-": (np.sin(t), t <= c2),
+        "Y+": (0.0, False),
+        "Y-": (0.0, False),
+    }[cara]
+    alpha, _, _, _, ef = MATERIALES[estado]
+    area = 1.0 if estado == "INC" else 2 * AREA_PANEL
+    return alpha * SCV * area * ef * cos_fn if cond else 0.0
+
+def _f_planeta(cara):
+    return {"Z+": F_PLANET_ZPLUS, "Z-": 0.0}.get(cara, F_PLANET_LATERAL)
+
+def _albedo(cara, estado, t):
+    """carga_albedo original (por área) con α del coating en Y±."""
+    alpha_s, _, alpha_wtc, _, ef = MATERIALES[estado]
+    alpha = alpha_wtc if cara[0] == "Y" else alpha_s * ef
+    return alpha * GAMMA * SCV * _f_planeta(cara) * np.cos(t) if (t <= c1 or t >= c4) else 0.0
+
+def _ir(cara, estado):
+    """carga_infrarroja original (por área): ε·F_i·σ·T_V⁴."""
+    _, eps_sa, _, eps_wtc, _ = MATERIALES[estado]
+    return (eps_wtc if cara[0] == "Y" else eps_sa) * _f_planeta(cara) * SIGMA * T_VENUS ** 4
+
+def test_leyes_escalares():
+    f_w = flujos_caras(THETA, ESTADOS, por_area=False)
+    f_a = flujos_caras(THETA, ESTADOS, por_area=True)
+    for cara in CARAS:
+        for estado in ESTADOS:
+            f_sol = f_a if estado == "INC" else f_w   # como get_params de carga_solar
+            np.testing.assert_allclose(f_sol.sel("solar", cara, estado),
+                                       [_solar(cara, estado, t) for t in THETA], rtol=1e-12, atol=1e-12)
+            np.testing.assert_allclose(f_a.sel("albedo", cara, estado),
+                                       [_albedo(cara, estado, t) for t in THETA], rtol=1e-12, atol=1e-12)
+            np.testing.assert_allclose(f_a.sel("ir", cara, estado), _ir(cara, estado), rtol=1e-12)
+
+@pytest.mark.parametrize("estado,alpha_wtc", [("BOL", ALPHA_WTC_BOL), ("EOL", ALPHA_WTC_EOL)])
+def test_albedo_caras_y_con_coating(estado, alpha_wtc):
+    f = flujos_caras(THETA, (estado,))
+    alpha_s, *_, ef = MATERIALES[estado]
+    y, x = f.sel("albedo", "Y+", estado), f.sel("albedo", "X+", estado)
+    lit = x != 0
+    np.testing.assert_allclose(y[lit] / x[lit], alpha_wtc / (alpha_s * ef), rtol=1e-12)
+
+@pytest.mark.parametrize("por_area", [True, False])
+def test_totales_orbita(por_area):
+    m = 400_000
+    theta = (np.arange(m) + 0.5) * (2 * np.pi / m)
+    f = flujos_caras(theta, ESTADOS, por_area=por_area)
+    tot = totales_orbita(ESTADOS, por_area=por_area)
+    for tipo in ("solar", "albedo", "ir", "total"):
+        numerico = getattr(f, tipo).sum(axis=-1) * ORBITAL_PERIOD / m
+        np.testing.assert_allclose(tot[tipo], numerico, rtol=1e-4, atol=1e-6)
+
+def test_ir_es_vista():
+    f = flujos_caras(np.linspace(0.0, 2 * np.pi, 1000))
+    assert f.ir.shape == f.solar.shape
+    assert f.ir.strides[-1] == 0 and not f.ir.flags.writeable
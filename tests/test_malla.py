@@ -0,0 +1,47 @@
+# By: Johanna Olivera y Ailin Ferrari
+
+"""
+- Refinar con k = 1 reproduce la red de 13 nodos (misma derivada y misma
+  integración implícita).
+- Con k > 1 se conservan C, cargas, contorno y los G/R entre nodos de origen.
+- BiCGSTAB que no converge en max_iter levanta ValueError en vez de devolver
+  una solución a medias.
+"""
+
+import numpy as np
+import pytest
+from malla import estado_inicial_refinado, refinar, totales
+from red_dispersa import bicgstab, desde_red, integrar_implicito
+from red_termica import construir_red, estado_inicial
+
+def test_k1_reproduce_la_red():
+    red = construir_red("caliente")
+    fina = refinar(red, 1)
+    assert fina.n == red.n and np.array_equal(fina.padre, np.arange(red.n))
+    T = estado_inicial("caliente") + np.linspace(-20.0, 20.0, red.n)
+    for t in (0.0, 1500.0, 4000.0):
+        np.testing.assert_allclose(fina.derivada(t, T), red.derivada(t, T), rtol=1e-12, atol=1e-15)
+    T0 = estado_inicial_refinado(fina)
+    a = integrar_implicito(fina, T0, 10.0, 600.0).temps
+    b = integrar_implicito(desde_red(red), T0, 10.0, 600.0).temps
+    np.testing.assert_allclose(a, b, rtol=1e-12)
+
+@pytest.mark.parametrize("k", [3, {1: 2, 3: 5, 11: 4}])
+def test_refinar_conserva_totales(k):
+    red = construir_red("caliente")
+    fina = refinar(red, k)
+    tot = totales(fina, red.n)
+    n = red.n
+    for nombre, esperado in (("C", red.C), ("G", red.G[:, :n]), ("R", red.R[:, :n]), ("A", red.A),
+                             ("g_contorno", red.G[:, n:]), ("r_contorno", red.R[:, n:])):
+        np.testing.assert_allclose(tot[nombre], esperado, rtol=1e-12, atol=1e-15, err_msg=nombre)
+
+def test_bicgstab_sin_convergencia():
+    rng = np.random.default_rng(0)
+    M = rng.normal(size=(200, 200)) + 0.1 * np.eye(200)
+    b = rng.normal(size=200)
+    with pytest.raises(ValueError, match="no convergió"):
+        bicgstab(lambda v: M @ v, b, np.zeros(200), np.ones(200), tol=1e-10, max_iter=5)
+    x, it = bicgstab(lambda v: v * np.arange(1.0, 201.0), b, np.zeros(200), np.ones(200))
+    np.testing.assert_allclose(x * np.arange(1.0, 201.0), b, rtol=1e-8)
+    assert it > 0
@@ -0,0 +1,35 @@
+# By: Johanna Olivera y Ailin Ferrari
+
+"""
+- integrar_multirate rechaza grupos donde un nodo lento no es estable con m·dt.
+- Con la selección por defecto los nodos quedan cerca de Euler a paso fino.
+- Con el m por defecto pasa la regresión contra las doradas de Euler.
+"""
+
+import numpy as np
+import pytest
+from integrador import integrar_euler, integrar_multirate
+from red_termica import construir_red, estado_inicial
+from regresion import cargar_dorada, comparar, ruta_dorada
+from simOrbital import simulate_red
+
+T_TOTAL = 600.0
+
+@pytest.mark.parametrize("m", [5, 10])
+def test_lento_inestable(m):
+    red = construir_red("caliente")
+    with pytest.raises(ValueError, match=r"\[11\]"):
+        integrar_multirate(red, estado_inicial("caliente"), 1.0, T_TOTAL, m=m, rapidos=np.arange(10))
+
+def test_seleccion_por_defecto():
+    red = construir_red("caliente")
+    T0 = estado_inicial("caliente")
+    r = integrar_multirate(red, T0, 1.0, T_TOTAL, m=2)
+    ref = integrar_euler(red, T0, 1.0, T_TOTAL)
+    assert np.abs(r.temps - ref.temps).max() < 0.1
+
+@pytest.mark.parametrize("caso", ["caliente", "frio"])
+def test_dorada_con_m_por_defecto(caso):
+    temps, t = simulate_red(caso, "multirate")
+    res = comparar(cargar_dorada(ruta_dorada(caso)), temps, t)
+    assert res.ok, res.fallas
@@ -0,0 +1,27 @@
+# By: Johanna Olivera y Ailin Ferrari
+
+"""
+- Los límites pasados a optimizar/Archivo definen la caja de búsqueda y la
+  normalización de los IndiceCalido, también para variables fuera de LIMITES.
+"""
+
+import pytest
+from optimizador import Archivo, optimizar
+
+LIM = {"eps_sa": (0.7, 0.95)}
+
+def test_limites_propios():
+    archivo = Archivo(("eps_sa",), limites=LIM)
+    for indice in archivo.indices.values():
+        assert (indice.lo[0], indice.hi[0]) == LIM["eps_sa"]
+    r = optimizar(variables=("eps_sa",), poblacion=4, generaciones=1, archivo=archivo)
+    assert LIM["eps_sa"][0] <= r.diseno["eps_sa"] <= LIM["eps_sa"][1]
+
+def test_limites_distintos_al_archivo():
+    archivo = Archivo(("eps_sa",), limites=LIM, calido=False)
+    with pytest.raises(ValueError, match="otros límites"):
+        optimizar(variables=("eps_sa",), limites={"eps_sa": (0.7, 0.9)}, archivo=archivo)
+
+def test_variable_sin_limites():
+    with pytest.raises(ValueError, match="desconocidas"):
+        optimizar(variables=("eps_sa",))
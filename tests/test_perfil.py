@@ -0,0 +1,65 @@
+# By: Johanna Olivera y Ailin Ferrari
+
+"""
+- Etapas acumula el tiempo entre marcas en la etapa marcada y vuelca al
+  Perfil cada `bloque` pasos (reloj simulado: tiempos exactos).
+- Sin Perfil se usa el marcador nulo, que no altera la corrida.
+- Una corrida corta de Euler perfilada trae las etapas del integrador, un
+  paso por iteración del lazo, y tiempos que suman el total; el JSON
+  exportado es el mismo resumen.
+"""
+
+import itertools
+import json
+import numpy as np
+import perfil
+from integrador import integrar_euler
+from perfil import ETAPAS_NULAS, Etapas, Perfil, etapas
+from red_termica import construir_red, estado_inicial
+
+def test_etapas_reloj_simulado(monkeypatch):
+    reloj = itertools.count(0, 10)
+    monkeypatch.setattr(perfil.time, "perf_counter_ns", lambda: next(reloj))
+    p = Perfil()
+    m = Etapas(p, ("a", "b"), bloque=2)     # t = 0
+    for _ in range(3):
+        m(0)                                # +10 → a
+        m.reiniciar()                       # descarta 10
+        m(1)                                # +10 → b
+        m.paso()
+        if m.pasos == 0:
+            assert p.n_pasos == 2 and p.ns == {"a": 20, "b": 20}
+    assert p.n_pasos == 2
+    m.volcar()
+    assert p.n_pasos == 3
+    assert p.ns == {"a": 30, "b": 30} and p.llamadas == {"a": 3, "b": 3}
+
+def test_etapas_nulas():
+    assert etapas(None, ("a",)) is ETAPAS_NULAS
+    red = construir_red("caliente")
+    T0 = estado_inicial("caliente")
+    a = integrar_euler(red, T0, 1.0, 300.0).temps
+    b = integrar_euler(red, T0, 1.0, 300.0, perfil=Perfil("euler")).temps
+    np.testing.assert_array_equal(a, b)
+
+def test_corrida_perfilada(tmp_path):
+    red = construir_red("caliente")
+    with Perfil("euler", memoria=True) as p:
+        r = integrar_euler(red, estado_inicial("caliente"), 1.0, 600.0, perfil=p)
+    res = p.resumen()
+
+    lazo = ("conduccion", "radiacion", "actualizacion", "salida", "checkpoint")
+    assert set(res["etapas"]) == {"cargas", "potencia", *lazo}
+    assert res["backend"] == "euler" and res["n_nodos"] == red.n
+    assert res["n_pasos"] == r.n_pasos == 599
+    for nombre in lazo:
+        assert res["etapas"][nombre]["llamadas"] == r.n_pasos
+    medido = sum(e["ns"] for e in res["etapas"].values())
+    assert medido <= p.wall_ns
+    np.testing.assert_allclose(medido / 1e9 + res["no_medido_s"], res["wall_s"], rtol=1e-12)
+    np.testing.assert_allclose(sum(e["fraccion"] for e in res["etapas"].values()), medido / p.wall_ns)
+    assert res["asignaciones"]["pico_bytes"] > 0
+
+    ruta = tmp_path / "perfil.json"
+    p.exportar(str(ruta))
+    assert json.loads(ruta.read_text(encoding="utf-8")) == json.loads(json.dumps(res))
@@ -0,0 +1,68 @@
+# By: Johanna Olivera y Ailin Ferrari
+
+"""
+- aplicar_perfiles no modifica el perfil recibido: uno solo puede usarse en
+  varios nodos y en varias redes.
+- desde_escalera reproduce get_potencia fuera de los bordes; en el borde mismo
+  la escalera (desigualdades estrictas) da 0 W y el perfil el valor del intervalo.
+- desde_modos, desde_csv y leer_linea_modos (con encabezado y comentarios).
+"""
+
+import numpy as np
+import pytest
+from constants import ORBITAL_PERIOD, THETA_P1, get_propiedades_caso
+from perfiles_potencia import (
+    PerfilPotencia, aplicar_perfiles, desde_csv, desde_modos, leer_linea_modos, perfiles_caso
+)
+from red_termica import construir_red
+
+def test_perfil_compartido():
+    perfil = PerfilPotencia([0.0, 100.0], [1.0, 2.0], periodo=200.0)
+    red_a = aplicar_perfiles(construir_red("frio"), {12: perfil, 13: perfil})
+    red_b = aplicar_perfiles(construir_red("frio"), {13: perfil})
+    assert perfil.nombre == "potencia"
+    assert [b.nombre for b in red_a.bases][-2:] == ["potencia_12", "potencia_13"]
+    assert [b.nombre for b in red_b.bases][-1] == "potencia_13"
+    t = np.arange(0.0, 400.0, 10.0)
+    np.testing.assert_array_equal(red_a.cargas(t)[11], red_a.cargas(t)[12])
+
+def test_escalera_compilada():
+    props = get_propiedades_caso("caliente")
+    theta = (np.arange(3600) + 0.5) / 10.0
+    for nodo, perfil in perfiles_caso(props).items():
+        esperado = [props["get_potencia"](x, nodo) for x in theta]
+        np.testing.assert_array_equal(perfil.evaluar(theta / 360.0 * ORBITAL_PERIOD), esperado)
+    perfil = perfiles_caso(props)[12]
+    assert props["get_potencia"](0.0, 12) == 0 and perfil.evaluar(0.0) == 50
+    assert perfil.evaluar(THETA_P1 / 360.0 * ORBITAL_PERIOD) == 0
+
+def test_desde_modos():
+    perfiles = desde_modos([(0.0, "seguro"), (100.0, "nominal"), (250.0, "downlink")], periodo=400.0)
+    assert sorted(perfiles) == [12, 13]
+    t = np.array([0.0, 99.0, 100.0, 249.0, 250.0, 399.0, 400.0, 450.0])
+    np.testing.assert_array_equal(perfiles[12].evaluar(t), [0, 0, 50, 50, 15, 15, 0, 0])
+    np.testing.assert_array_equal(perfiles[13].evaluar(t), 15.0)
+    assert perfiles[13].bordes(0.0, 1000.0).size == 0
+    assert perfiles[12].energia(0.0, 400.0) == pytest.approx(150 * 50 + 150 * 15)
+    parcial = desde_modos([(0.0, "a"), (10.0, "b")], {"a": {12: 3.0}, "b": {13: 4.0}})
+    np.testing.assert_array_equal(parcial[12].evaluar([5.0, 15.0]), [3.0, 0.0])
+    np.testing.assert_array_equal(parcial[13].evaluar([5.0, 15.0]), [0.0, 4.0])
+    with pytest.raises(ValueError, match="eclipse"):
+        desde_modos([(0.0, "eclipse")])
+
+@pytest.mark.parametrize("encabezado", ["", "t,P\n"])
+def test_desde_csv(tmp_path, encabezado):
+    ruta = tmp_path / "p.csv"
+    ruta.write_text(encabezado + "0,1.5\n60,2.5\n30,4\n")
+    perfil = desde_csv(str(ruta))
+    np.testing.assert_array_equal(perfil.t_bordes, [0.0, 30.0, 60.0])
+    np.testing.assert_array_equal(perfil.evaluar([-1.0, 10.0, 45.0, 90.0]), [1.5, 1.5, 4.0, 2.5])
+    lineal = desde_csv(str(ruta), periodo=90.0, interpolacion="lineal")
+    np.testing.assert_allclose(lineal.evaluar([15.0, 75.0, 105.0]), [2.75, 2.0, 2.75])
+
+def test_leer_linea_modos(tmp_path):
+    ruta = tmp_path / "modos.csv"
+    ruta.write_text("t,modo\n# arranque\n0, seguro\n\n120,nominal\n300 ,downlink\n")
+    linea = leer_linea_modos(str(ruta))
+    assert linea == [(0.0, "seguro"), (120.0, "nominal"), (300.0, "downlink")]
+    assert desde_modos(linea)[12].evaluar(200.0) == 50
@@ -0,0 +1,22 @@
+# By: Johanna Olivera y Ailin Ferrari
+
+"""
+- ε(T) externa escala por igual la emisión al espacio y el IR planetario
+  absorbido (Kirchhoff); la potencia de la base constante no cambia.
+"""
+
+import numpy as np
+from constants import get_propiedades_caso
+from propiedades_T import aplicar_propiedades, propiedades_T
+from red_termica import construir_red, estado_inicial
+
+def test_eps_escala_ir_absorbido():
+    red = construir_red("caliente")
+    T = estado_inicial("caliente")
+    eps = get_propiedades_caso("caliente")["eps_sa"]
+    red_T = aplicar_propiedades(red, propiedades_T("caliente", eps={"paneles": 0.5 * eps}))
+    dq = red_T.derivada(0.0, T) * red_T.C - red.derivada(0.0, T) * red.C
+    n = red.n
+    externo = red.cargas_ir(0.0) + red.R[:, n:] @ red.T_contorno ** 4 - red.r_sum_ext * T ** 4
+    np.testing.assert_allclose(dq[:8], -0.5 * externo[:8], rtol=1e-10)
+    np.testing.assert_allclose(dq[8:], 0.0, atol=1e-9)
@@ -0,0 +1,22 @@
+# By: Johanna Olivera y Ailin Ferrari
+
+"""
+- Las historias .npz sin comprimir se abren con mmap; las comprimidas se
+  cargan enteras. Ambas dan los mismos valores.
+"""
+
+import numpy as np
+import pytest
+from regresion import abrir_historia
+
+@pytest.mark.parametrize("guardar,mmap", [(np.savez, True), (np.savez_compressed, False)])
+@pytest.mark.parametrize("orden", ["C", "F"])
+def test_abrir_historia_npz(tmp_path, guardar, mmap, orden):
+    temps = np.asarray(np.random.default_rng(0).random((13, 500)), order=orden)
+    t = np.arange(500) * 2.0
+    ruta = str(tmp_path / "h.npz")
+    guardar(ruta, temps=temps, t=t)
+    X, tt = abrir_historia(ruta)
+    assert isinstance(X, np.memmap) == mmap
+    np.testing.assert_array_equal(X, temps)
+    np.testing.assert_array_equal(tt, t)
@@ -0,0 +1,51 @@
+# By: Johanna Olivera y Ailin Ferrari
+
+"""
+- La secuencia de Sobol está estratificada: cada bloque de 2^m puntos
+  alineado pone exactamente un punto en cada intervalo de ancho 2^-m de cada
+  dimensión, y las dos primeras dimensiones forman una red (0, m, 2): un
+  punto en cada caja elemental de área 2^-m.
+- Los estimadores recuperan los índices analíticos de la función de Ishigami
+  (a = 7, b = 0.1): S1 ≈ (0.314, 0.443, 0), ST ≈ (0.558, 0.443, 0.244), y los
+  intervalos bootstrap los contienen.
+"""
+
+import numpy as np
+import pytest
+from sensibilidad import MAX_DIM, bootstrap, indices_sobol, matrices_saltelli, sobol
+
+@pytest.mark.parametrize("inicio", [0, 256, 768])
+def test_sobol_estratificado(inicio):
+    m = 8
+    N = 2 ** m
+    X = sobol(MAX_DIM, inicio, N)
+    assert np.all((X >= 0.0) & (X < 1.0))
+    celdas = np.floor(X * N).astype(int)
+    for j in range(MAX_DIM):
+        assert np.array_equal(np.sort(celdas[:, j]), np.arange(N)), f"dimensión {j}"
+    for k in range(m + 1):
+        caja = np.floor(X[:, 0] * 2 ** k).astype(int) * 2 ** (m - k) + np.floor(X[:, 1] * 2 ** (m - k)).astype(int)
+        assert np.array_equal(np.sort(caja), np.arange(N)), f"cajas 2^{k} × 2^{m - k}"
+
+def _ishigami(X: np.ndarray, a: float = 7.0, b: float = 0.1) -> np.ndarray:
+    x = -np.pi + 2.0 * np.pi * X
+    return (np.sin(x[:, 0]) + a * np.sin(x[:, 1]) ** 2 + b * x[:, 2] ** 4 * np.sin(x[:, 0]))[:, None]
+
+def test_ishigami():
+    a, b = 7.0, 0.1
+    V1 = 0.5 * (1.0 + b * np.pi ** 4 / 5.0) ** 2
+    V2 = a ** 2 / 8.0
+    V13 = 8.0 * b ** 2 * np.pi ** 8 / 225.0
+    V = V1 + V2 + V13
+    S1_exacto = np.array([V1, V2, 0.0]) / V
+    ST_exacto = np.array([V1 + V13, V2, V13]) / V
+
+    A, B, AB = matrices_saltelli(sobol(6, 1, 4096))
+    fA, fB, fAB = _ishigami(A), _ishigami(B), np.stack([_ishigami(x) for x in AB])
+    S1, ST = indices_sobol(fA, fB, fAB)
+    np.testing.assert_allclose(S1[:, 0], S1_exacto, atol=0.01)
+    np.testing.assert_allclose(ST[:, 0], ST_exacto, atol=0.01)
+
+    S1_ic, ST_ic = bootstrap(fA, fB, fAB, n_boot=200)
+    assert np.all((S1_ic[0, :, 0] <= S1_exacto) & (S1_exacto <= S1_ic[1, :, 0]))
+    assert np.all((ST_ic[0, :, 0] <= ST_exacto) & (ST_exacto <= ST_ic[1, :, 0]))
@@ -0,0 +1,102 @@
+# By: Johanna Olivera y Ailin Ferrari
+
+"""
+- Solicitudes mal formadas reciben 400 en vez de cerrar la conexión.
+- La historia llega por bloques mientras el lote integra y coincide con la
+  integración directa; los eventos AFT son los de la historia completa.
+- Un lote despachado por tamaño cancela su temporizador.
+"""
+
+import asyncio
+import json
+import numpy as np
+import pytest
+import servidor
+from servidor import Servicio, eventos_aft
+
+T_TOTAL = 1200.0
+
+async def _pedir(puerto: int, cuerpo: bytes, cabeceras: str = None):
+    lector, escritor = await asyncio.open_connection("127.0.0.1", puerto)
+    if cabeceras is None:
+        cabeceras = f"Content-Length: {len(cuerpo)}\r\n"
+    escritor.write(f"POST /simular HTTP/1.1\r\nHost: x\r\n{cabeceras}\r\n".encode() + cuerpo)
+    await escritor.drain()
+    respuesta = await lector.read()
+    escritor.close()
+    estado = int(respuesta.split(b" ", 2)[1])
+    return estado, respuesta.split(b"\r\n\r\n", 1)[1]
+
+def _mensajes(cuerpo: bytes):
+    mensajes, resto = [], cuerpo
+    while True:
+        largo, _, resto = resto.partition(b"\r\n")
+        largo = int(largo, 16)
+        if largo == 0:
+            return mensajes
+        mensajes.append(json.loads(resto[:largo]))
+        resto = resto[largo + 2:]
+
+def _con_servidor(prueba):
+    async def correr():
+        servicio = Servicio(ventana_s=0.01)
+        srv = await asyncio.start_server(servicio.atender, "127.0.0.1", 0)
+        async with srv:
+            return await prueba(servicio, srv.sockets[0].getsockname()[1])
+    return asyncio.run(correr())
+
+@pytest.mark.parametrize("cuerpo,cabeceras", [
+    (b"[1, 2]", None),
+    (b'{"parametros": [1, 2]}', None),
+    (b'{"parametros": {"eps_wc": "x"}}', None),
+    (b'{"dt": "nan"}', None),
+    (b"{", None),
+    (b"{}", "Content-Length: abc\r\n"),
+    (b"{}", "Content-Length: -1\r\n"),
+])
+def test_solicitud_mal_formada_da_400(cuerpo, cabeceras):
+    async def prueba(servicio, puerto):
+        estado, resp = await _pedir(puerto, cuerpo, cabeceras)
+        assert estado == 400
+        assert "error" in json.loads(resp)
+    _con_servidor(prueba)
+
+def test_historia_por_bloques_y_eventos(monkeypatch):
+    monkeypatch.setattr(servidor, "BLOQUE", 7)
+    pedido = {"caso": "frio", "t_total": T_TOTAL, "historia_cada": 10, "parametros": {"escala_P": 0.5}}
+
+    async def prueba(servicio, puerto):
+        return await asyncio.gather(*(_pedir(puerto, json.dumps(pedido).encode()) for _ in range(2)))
+
+    (e1, r1), (e2, r2) = _con_servidor(prueba)
+    assert e1 == e2 == 200
+    assert _mensajes(r1)[1:] == _mensajes(r2)[1:]
+    msgs = _mensajes(r1)
+    assert msgs[0]["tipo"] == "inicio" and msgs[-1]["tipo"] == "fin"
+    temps = [m for m in msgs if m["tipo"] == "temps"]
+    assert len(temps) == -(-msgs[0]["n_muestras"] // 7)
+
+    clave, parametros, _ = servidor.normalizar(pedido)
+    salidas = []
+    servidor._integrar_lote(clave, [parametros], lambda h, c: salidas.append(h) if c == h.shape[-1] else None)
+    historia = salidas[0][0]
+    t = servidor.eje_historia(clave)
+    np.testing.assert_array_equal(np.concatenate([m["T"] for m in temps], axis=1), historia)
+    eventos = [m for m in msgs if m["tipo"] == "evento"]
+    assert sorted(eventos, key=lambda e: (e["t_inicio"], e["nodo"], e["evento"])) == \
+        sorted(eventos_aft(historia, t), key=lambda e: (e["t_inicio"], e["nodo"], e["evento"]))
+    assert eventos
+
+def test_lote_lleno_cancela_temporizador():
+    async def prueba():
+        lotes = servidor.Lotes(None, ventana_s=60.0, max_miembros=2)
+        despachos = []
+        lotes._correr = lambda clave, lote: despachos.append(len(lote)) or asyncio.sleep(0)
+        clave = ("frio", 1.0, 10.0, "float64", 1)
+        lotes.enviar(clave, {}, None)
+        temporizador = lotes._temporizadores[clave]
+        lotes.enviar(clave, {}, None)
+        await asyncio.sleep(0)
+        assert temporizador.cancelled() and not lotes._temporizadores
+        assert despachos == [2]
+    asyncio.run(prueba())
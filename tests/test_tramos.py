@@ -0,0 +1,42 @@
+# By: Johanna Olivera y Ailin Ferrari
+
+"""
+- integrar_tramos termina un paso aceptado exactamente en cada borde de la red
+  (escalones de potencia y entrada/salida de eclipse).
+- Una órbita completa queda a < 0.02 K de Euler con dt = 0.05 s (medido 0.010 K).
+"""
+
+import numpy as np
+from checkpoint import Checkpoint
+from constants import ORBITAL_PERIOD
+from integrador import integrar_euler, integrar_tramos
+from red_termica import construir_red, estado_inicial
+
+class CheckpointEspia(Checkpoint):
+    """Guarda en cada paso aceptado y registra su t final, sin escribir el .npz."""
+
+    def __init__(self, ruta: str):
+        super().__init__(ruta, cada_pasos=1)
+        self.t_pasos = []
+
+    def guardar(self, **datos) -> None:
+        self.t_pasos.append(float(datos["t"]))
+
+def test_pasos_caen_en_los_bordes(tmp_path):
+    red = construir_red("caliente")
+    t = np.arange(0.0, ORBITAL_PERIOD, 10.0)
+    espia = CheckpointEspia(str(tmp_path / "tramos"))
+    integrar_tramos(red, estado_inicial("caliente"), t, checkpoint=espia)
+    bordes = red.bordes(t[0], t[-1])
+    nombres = {b.nombre for b in red.bases if b.bordes(t[0], t[-1]).size}
+    assert {"solar", "potencia_12"} <= nombres
+    assert np.isin(bordes, espia.t_pasos).all()
+    assert espia.t_pasos[-1] == t[-1]
+
+def test_orbita_contra_euler_fino():
+    red = construir_red("caliente")
+    T0 = estado_inicial("caliente")
+    t = np.arange(0.0, ORBITAL_PERIOD, 10.0)
+    r = integrar_tramos(red, T0, t)
+    ref = integrar_euler(red, T0, 0.05, ORBITAL_PERIOD)
+    assert np.abs(r.temps - ref.temps[:, ::200]).max() < 0.02